@@ -10,6 +10,9 @@ import threading
 import queue
 
 from flask import Flask
+from flask import Response
+from flask import abort
+from flask import jsonify
 from flask import request
 from flask import render_template
 from flask import session
@@ -26,10 +29,14 @@ from mud_backend.core import db
 from mud_backend.core import scripting
 from mud_backend.core import combat_system
 from mud_backend.core.game_loop import monster_ai
+from mud_backend.core.game_loop import crafting
 from mud_backend import config
 from mud_backend.core.room_handler import _handle_npc_idle_dialogue
 from mud_backend.core.worker import WorkerManager
 from mud_backend.core import quest_handler
+from mud_backend.core import metrics
+from mud_backend.core import log
+from mud_backend.core import tracing
 
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mud_frontend', 'templates'))
 static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'mud_frontend', 'static'))
@@ -37,9 +44,20 @@ app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
 app.config['SECRET_KEY'] = 'your-very-secret-key-please-change-me!'
 
 # Use eventlet for asynchronous networking
-socketio = SocketIO(app, async_mode='eventlet')
+# Websocket permessage-deflate is negotiated by eventlet's websocket server
+# when the browser offers it; this covers the long-polling fallback.
+socketio = SocketIO(
+    app, async_mode='eventlet',
+    http_compression=config.WIRE_HTTP_COMPRESSION, compression_threshold=config.WIRE_COMPRESSION_THRESHOLD
+)
 game_event_queue = queue.Queue()
 
+server_logger = log.get_logger("server")
+loop_logger = log.get_logger("loop")
+connection_logger = log.get_logger("connection")
+login_logger = log.get_logger("login")
+persistence_logger = log.get_logger("persistence")
+
 # --- GLOBAL DEFINITIONS ---
 # These define the structure, but do not START anything yet.
 print("[SERVER INIT] Defining World...")
@@ -47,15 +65,36 @@ world = World()
 world.socketio = socketio
 world.app = app
 # Initialize the manager but DO NOT start it here
-world.worker_manager = WorkerManager()
+world.worker_manager = WorkerManager(num_workers=config.WORKER_POOL_SIZE)
+metrics.register_world_gauges(world, game_event_queue)
 
 @app.route("/")
 def index():
     return render_template("index.html")
 
+@app.route("/admin/tick_profile")
+def tick_profile():
+    """Tick profiler dump (same data as the TICKPROF admin verb)."""
+    if config.TICK_PROFILER_HTTP_LOCAL_ONLY and request.remote_addr not in ("127.0.0.1", "::1"):
+        abort(403)
+    return jsonify(world.tick_profiler.snapshot())
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of core/metrics.py's registry."""
+    if config.METRICS_HTTP_LOCAL_ONLY and request.remote_addr not in ("127.0.0.1", "::1"):
+        abort(403)
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+def prepare_world(world_instance: World):
+    """Loads all data through the db module and wires the persistence events."""
+    world_instance.load_all_data(db)
+    world_instance.event_bus.subscribe("save_room", lambda room: db.save_room_state(room))
+    world_instance.event_bus.subscribe("update_band_xp", lambda player_name, amount: db.update_player_band_xp_bank(player_name, amount))
+
 def persistence_task(world_instance: World):
     """Saves dirty players to DB every 60 seconds."""
-    print("[SERVER] Persistence task started.")
+    persistence_logger.info("Persistence task started.")
     while True:
         socketio.sleep(60)
         count = 0
@@ -66,91 +105,127 @@ def persistence_task(world_instance: World):
                 db.save_game_state(player)
                 player._is_dirty = False
                 count += 1
+        if metrics.ENABLED:
+            metrics.PERSISTENCE_SAVED.inc(amount=count)
+            metrics.PERSISTENCE_LAST_RUN.set(time.time())
         if count > 0:
-            print(f"[PERSISTENCE] Saved {count} players to database.")
+            persistence_logger.info("Saved %d players to database.", count)
+
+def game_loop_iteration(world_instance: World):
+    """One pass of the game loop. Must run inside an app context."""
+    profiler = world_instance.tick_profiler
+    profiler.begin_iteration()
+
+    # 1. Process Event Queue
+    with profiler.phase("events"):
+        events_processed = 0
+        while not game_event_queue.empty() and events_processed < 50:
+            try:
+                func, args = game_event_queue.get_nowait()
+                func(**args)
+                events_processed += 1
+            except queue.Empty:
+                break
+            except Exception as e:
+                loop_logger.exception("Event failed: %s", e)
+
+    # Yield to allow heartbeats (time spent in other greenthreads lands here)
+    with profiler.phase("yield"):
+        socketio.sleep(0)
+
+    # 1b. Collect Background Worker Results
+    with profiler.phase("workers"):
+        world_instance.worker_manager.check_results()
+
+    current_time = time.time()
+    log_time = datetime.datetime.now(datetime.timezone.utc).strftime('%H:%M:%S')
+
+    def broadcast_to_room(room_id, message, msg_type, skip_sid=None):
+        world_instance.broadcast_to_room(room_id, message, msg_type, skip_sid)
+
+    def send_to_player(player_name, message, msg_type):
+        world_instance.send_message_to_player(player_name.lower(), message, msg_type)
+
+    def send_vitals_to_player(player_name, vitals_data):
+        p_info = world_instance.get_player_info(player_name.lower())
+        if p_info and p_info.get("sid"):
+            world_instance.connection_manager.emit_to_sid("update_vitals", vitals_data, p_info["sid"])
+
+    # 2. Process Player Queues
+    with profiler.phase("player_queues"):
+        active_players = world_instance.get_all_players_info()
+        for player_key, p_info in active_players:
+            player_obj = p_info.get("player_obj")
+            sid = p_info.get("sid")
+            if player_obj and player_obj.command_queue:
+                combat_state = world_instance.get_combat_state(player_key)
+                in_rt = False
+                if combat_state and current_time < combat_state.get("next_action_time", 0):
+                    in_rt = True
+                if not in_rt:
+                    cmd_to_run = player_obj.command_queue.pop(0)
+                    result_data = execute_command(world_instance, player_obj.name, cmd_to_run, sid)
+                    world_instance.connection_manager.emit_to_sid("command_response", result_data, sid)
+
+    # 2b. Event-Driven Aggro (pairs queued by room entries since last pass)
+    with profiler.phase("aggro"):
+        monster_ai.process_aggro_queue(world_instance)
+
+    # 3. Combat Tick
+    with profiler.phase("combat"):
+        combat_system.process_combat_tick(world_instance, broadcast_to_room, send_to_player, send_vitals_to_player)
+
+    # 4. Monster Tick
+    if current_time - world_instance.last_monster_tick_time >= config.MONSTER_TICK_INTERVAL_SECONDS:
+        world_instance.last_monster_tick_time = current_time
+        monster_log_prefix = f"{log_time} - MONSTER_TICK"
+        with profiler.phase("monsters"):
+            monster_ai.process_monster_ai(world_instance, monster_log_prefix, broadcast_to_room)
+            monster_ai.process_monster_ambient_messages(world_instance, monster_log_prefix, broadcast_to_room)
+
+    # 4b. Crafting Stations
+    if current_time - world_instance.last_crafting_tick_time >= config.CRAFTING_TICK_INTERVAL_SECONDS:
+        world_instance.last_crafting_tick_time = current_time
+        with profiler.phase("crafting"):
+            crafting.process_crafting_stations(world_instance, broadcast_to_room)
+
+    # 5. Global Tick (times its own sub-phases as "tick.*")
+    with profiler.phase("global_tick"):
+        did_global_tick = check_and_run_game_tick(
+            world_instance, broadcast_to_room, send_to_player, send_vitals_to_player
+        )
+    if did_global_tick:
+        world_instance.connection_manager.emit_to_room('tick', None)
+
+    profiler.end_iteration()
 
 def game_loop_task(world_instance: World):
-    print("[SERVER START] Game Loop task started.")
+    server_logger.info("Game Loop task started.")
 
     quest_handler.initialize_quest_listeners(world_instance)
 
     with app.app_context():
         while True:
-            # 1. Process Event Queue
-            events_processed = 0
-            while not game_event_queue.empty() and events_processed < 50:
-                try:
-                    func, args = game_event_queue.get_nowait()
-                    func(**args)
-                    events_processed += 1
-                except queue.Empty:
-                    break
-                except Exception as e:
-                    print(f"[GAME LOOP ERROR] {e}")
-                    import traceback
-                    traceback.print_exc()
-
-            # Yield to allow heartbeats
-            socketio.sleep(0)
-
-            current_time = time.time()
-            log_time = datetime.datetime.now(datetime.timezone.utc).strftime('%H:%M:%S')
-
-            def broadcast_to_room(room_id, message, msg_type, skip_sid=None):
-                world_instance.broadcast_to_room(room_id, message, msg_type, skip_sid)
-
-            def send_to_player(player_name, message, msg_type):
-                world_instance.send_message_to_player(player_name.lower(), message, msg_type)
-
-            def send_vitals_to_player(player_name, vitals_data):
-                p_info = world_instance.get_player_info(player_name.lower())
-                if p_info and p_info.get("sid"):
-                    socketio.emit("update_vitals", vitals_data, to=p_info["sid"])
-
-            # 2. Process Player Queues
-            active_players = world_instance.get_all_players_info()
-            for player_key, p_info in active_players:
-                player_obj = p_info.get("player_obj")
-                sid = p_info.get("sid")
-                if player_obj and player_obj.command_queue:
-                    combat_state = world_instance.get_combat_state(player_key)
-                    in_rt = False
-                    if combat_state and current_time < combat_state.get("next_action_time", 0):
-                        in_rt = True
-                    if not in_rt:
-                        cmd_to_run = player_obj.command_queue.pop(0)
-                        result_data = execute_command(world_instance, player_obj.name, cmd_to_run, sid)
-                        socketio.emit("command_response", result_data, to=sid)
-
-            # 3. Combat Tick
-            combat_system.process_combat_tick(world_instance, broadcast_to_room, send_to_player, send_vitals_to_player)
-
-            # 4. Monster Tick
-            if current_time - world_instance.last_monster_tick_time >= config.MONSTER_TICK_INTERVAL_SECONDS:
-                world_instance.last_monster_tick_time = current_time
-                monster_log_prefix = f"{log_time} - MONSTER_TICK"
-                monster_ai.process_monster_ai(world_instance, monster_log_prefix, broadcast_to_room)
-                monster_ai.process_monster_ambient_messages(world_instance, monster_log_prefix, broadcast_to_room)
-
-            # 5. Global Tick
-            did_global_tick = check_and_run_game_tick(
-                world_instance, broadcast_to_room, send_to_player, send_vitals_to_player
-            )
-            if did_global_tick:
-                socketio.emit('tick')
-
+            game_loop_iteration(world_instance)
             socketio.sleep(0.05)
 
 @socketio.on('connect')
 def handle_connect():
     sid = request.sid
-    print(f"[CONNECTION] Client connected: {sid}")
+    connection_logger.info("Client connected: %s", sid)
     session['state'] = 'auth_user'
     emit("prompt_username", to=sid)
 
+@socketio.on('negotiate_protocol')
+def handle_negotiate_protocol(data):
+    sid = request.sid
+    reply = world.connection_manager.negotiate_protocol(sid, data if isinstance(data, dict) else {})
+    emit("protocol", reply, to=sid)
+
 @socketio.on('disconnect')
 def handle_disconnect():
     sid = request.sid
+    world.connection_manager.drop_wire_session(sid)
     player_name = session.get('player_name')
     player_info = None
     if player_name:
@@ -158,16 +233,21 @@ def handle_disconnect():
     if player_name and player_info:
         room_id = player_info.get("current_room_id")
         if room_id:
-            emit("message", f'<span class="keyword" data-name="{player_name}">{player_name}</span> disappears.', to=room_id)
+            world.connection_manager.emit_to_room("message", f'<span class="keyword" data-name="{player_name}">{player_name}</span> disappears.', room_id)
         player_obj = player_info.get("player_obj")
         if player_obj:
-            db.save_game_state(player_obj)
+            db.save_game_state(player_obj, flush_history=True)
     else:
-        print(f"[CONNECTION] Unauthenticated client disconnected: {sid}")
+        connection_logger.info("Unauthenticated client disconnected: %s", sid)
 
-def process_command_worker(player_name, command, sid, old_room_id=None):
+def process_command_worker(player_name, command, sid, old_room_id=None, trace=None):
+    if trace is not None:
+        # Socket receipt -> picked up by the game loop
+        trace.add_span("queue", trace.started_ns, time.perf_counter_ns())
+    trace_token = tracing.activate(trace)
     try:
-        result_data = execute_command(world, player_name, command, sid)
+        with tracing.span("execute"):
+            result_data = execute_command(world, player_name, command, sid)
         new_player_info = world.get_player_info(player_name.lower())
         new_room_id = new_player_info.get("current_room_id") if new_player_info else None
         player_obj = new_player_info.get("player_obj") if new_player_info else None
@@ -182,9 +262,12 @@ def process_command_worker(player_name, command, sid, old_room_id=None):
             if real_active_room and real_active_room.triggers:
                 on_enter_script = real_active_room.triggers.get("on_enter")
                 if on_enter_script:
-                    scripting.execute_script(world, player_obj, real_active_room, on_enter_script)
+                    with tracing.span("on_enter"):
+                        scripting.execute_script(world, player_obj, real_active_room, on_enter_script)
 
-        socketio.emit("command_response", result_data, to=sid)
+        with tracing.span("emit"):
+            world.connection_manager.emit_to_sid("command_response", result_data, sid)
+        tracing.finish(trace)
 
         if player_obj and new_room_id:
             room_data = world.get_room(new_room_id)
@@ -194,9 +277,28 @@ def process_command_worker(player_name, command, sid, old_room_id=None):
                         monster_ai._check_and_start_npc_combat(world, obj, new_room_id)
 
     except Exception as e:
-        print(f"Error in worker: {e}")
-        import traceback
-        traceback.print_exc()
+        loop_logger.exception("Error in command worker: %s", e)
+    finally:
+        tracing.deactivate(trace_token)
+
+@socketio.on('request_history')
+def handle_request_history():
+    """Streams the stored message history in chunks, once per login."""
+    sid = request.sid
+    player_name = session.get('player_name')
+    history_upto = session.pop('history_upto', None)
+    if not player_name or not history_upto or session.get('state') != 'in_game':
+        return
+    player_obj = world.get_player_obj(player_name.lower())
+    if not player_obj:
+        return
+
+    history = list(player_obj.message_history)[:history_upto]
+    chunk_size = config.MESSAGE_HISTORY_CHUNK_SIZE
+    for start in range(0, len(history), chunk_size):
+        end = start + chunk_size
+        world.connection_manager.emit_to_sid("message_history", {"messages": history[start:end], "done": end >= len(history)}, sid)
+        socketio.sleep(0)
 
 @socketio.on('command')
 def handle_command_event(data):
@@ -253,7 +355,7 @@ def handle_command_event(data):
         session['player_name'] = new_char_name
         session['state'] = 'in_game'
         result_data = execute_command(world, new_char_name, "look", sid, account_username=username)
-        emit("command_response", result_data, to=sid)
+        world.connection_manager.emit_to_sid("command_response", result_data, sid)
 
     elif state == 'char_select':
         char_name = command.capitalize()
@@ -277,16 +379,16 @@ def handle_command_event(data):
             player_obj = player_info.get("player_obj")
             room_id = player_info.get("current_room_id")
 
-            # 3. Send History (Inject into result_data or send separately)
-            # Prepend history to the look output for seamlessness
+            # 3. Offer History; the client pulls it with 'request_history'
+            # Lines produced by the login 'look' are already in result_data
             if player_obj and player_obj.message_history:
-                # We prepend history, excluding the last few if they duplicate the 'look' output
-                # Just dumping it is usually fine
-                result_data["messages"] = player_obj.message_history + result_data["messages"]
+                history_upto = max(0, len(player_obj.message_history) - len(result_data.get("messages", [])))
+                if history_upto:
+                    session['history_upto'] = history_upto
+                    result_data["history_available"] = history_upto
 
             if room_id:
-                # --- FIXED & DEBUGGED ---
-                print(f"[DEBUG LOGIN] {char_name} joining room {room_id} (SID: {sid})")
+                login_logger.debug("%s joining room %s (SID: %s)", char_name, room_id, sid)
                 join_room(room_id, sid=sid)
                 
                 # CRITICAL: Manually add to room index so broadcast finds them
@@ -294,7 +396,7 @@ def handle_command_event(data):
                 
                 world.broadcast_to_room(room_id, f"{char_name} arrives.", "message", skip_sid=sid)
 
-        emit("command_response", result_data, to=sid)
+        world.connection_manager.emit_to_sid("command_response", result_data, sid)
 
     elif state == 'in_game':
         player_name = session.get('player_name')
@@ -304,26 +406,26 @@ def handle_command_event(data):
             return
         old_player_info = world.get_player_info(player_name.lower())
         old_room_id = old_player_info.get("current_room_id") if old_player_info else None
-        game_event_queue.put((process_command_worker, {"player_name": player_name, "command": command, "sid": sid, "old_room_id": old_room_id}))
+        trace = tracing.start_trace(command, player_name)
+        game_event_queue.put((process_command_worker, {"player_name": player_name, "command": command, "sid": sid, "old_room_id": old_room_id, "trace": trace}))
 
 if __name__ == "__main__":
+    log.configure()
+
     # 1. Start Workers (Only in main process)
-    print("[SERVER START] Starting Workers...")
+    server_logger.info("Starting Workers...")
     world.worker_manager.start()
 
-    # 2. Load Data (Only in main process)
-    print("[SERVER START] Loading Data...")
-    world.load_all_data(db)
-
-    # 3. Wire Events (Only in main process)
-    world.event_bus.subscribe("save_room", lambda room: db.save_room_state(room))
-    world.event_bus.subscribe("update_band_xp", lambda player_name, amount: db.update_player_band_xp_bank(player_name, amount))
+    # 2. Load Data & Wire Events (Only in main process)
+    server_logger.info("Loading Data...")
+    prepare_world(world)
+    world.worker_manager.prime_from_world(world)
 
-    # 4. Start Background Tasks (Only in main process)
-    print("[SERVER START] Starting Background Tasks...")
+    # 3. Start Background Tasks (Only in main process)
+    server_logger.info("Starting Background Tasks...")
     socketio.start_background_task(game_loop_task, world)
     socketio.start_background_task(persistence_task, world)
 
-    # 5. Run Server
-    print("[SERVER START] Running SocketIO server on http://127.0.0.1:8024")
+    # 4. Run Server
+    server_logger.info("Running SocketIO server on http://127.0.0.1:8024")
     socketio.run(app, host='0.0.0.0', port=8024, debug=True, use_reloader=False)
\ No newline at end of file
@@ -10,11 +10,6 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_PATH = os.path.join(BASE_DIR, "data")
 ASSETS_PATH = os.path.join(BASE_DIR, "data", "assets")
 
-# --- System & Debug ---
-DEBUG_MODE = True
-DEBUG_COMBAT_ROLLS = True
-DEBUG_GAME_TICK_RESPAWN_PHASE = True
-
 # --- Access Control ---
 # Usernames (lowercase) that automatically get admin privileges on all their characters
 ADMIN_ACCOUNTS = ["sevax"] 
@@ -26,13 +21,63 @@ DATABASE_NAME = "MUD_Dev"
 # --- Game Loop & State ---
 TICK_INTERVAL_SECONDS = 30    
 MONSTER_TICK_INTERVAL_SECONDS = 10 
-PLAYER_TIMEOUT_SECONDS = 600 
+CRAFTING_TICK_INTERVAL_SECONDS = 6       # Furnace physics step (awake furnaces only)
+CRAFTING_VECTOR_MIN = 32                 # Awake furnaces before the step switches to NumPy columns
+PLAYER_TIMEOUT_SECONDS = 600
+
+# --- Tick Profiler ---
+TICK_PROFILER_ENABLED = True
+TICK_PROFILER_WINDOW = 1200              # Samples kept per phase (~1 min of loop passes)
+TICK_PROFILER_SLOW_MS = 50               # A loop pass over this goes to the slow-tick log
+TICK_PROFILER_SLOW_LOG_SIZE = 50         # Slow ticks kept
+TICK_PROFILER_SAMPLE_INTERVAL_MS = 5     # Stack sampler period (0 disables sampling)
+TICK_PROFILER_SAMPLE_AFTER_MS = 20       # Only sample passes already running this long
+TICK_PROFILER_STACK_DEPTH = 12           # Innermost frames kept per sample
+TICK_PROFILER_SLOW_STACKS = 5            # Distinct stacks kept per slow tick
+TICK_PROFILER_HTTP_LOCAL_ONLY = True     # /admin/tick_profile only answers 127.0.0.1
+
+# --- Logging (core/log.py) ---
+LOG_LEVEL = "INFO"                       # Default for every subsystem
+LOG_LEVELS = {}                          # Per-subsystem overrides, e.g. {"broadcast": "DEBUG"}
+LOG_FILE = os.path.join(BASE_DIR, "logs", "server.log")  # JSON lines; None disables
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+LOG_CONSOLE_LEVEL = "INFO"               # None disables console output
+
+# --- Command Tracing (core/tracing.py) ---
+TRACE_SAMPLE_RATE = 0.05                 # Fraction of commands traced (0 disables)
+TRACE_SLOWEST_PER_VERB = 5               # Slowest traces kept per verb for TRACES
+TRACE_WINDOW_SECONDS = 900               # ...among commands from this far back
+TRACE_FILE = os.path.join(BASE_DIR, "logs", "traces.jsonl")  # None disables export
+
+# --- Metrics ---
+METRICS_ENABLED = True                   # Read at import; False leaves every hook a no-op
+METRICS_HTTP_LOCAL_ONLY = True           # /metrics only answers 127.0.0.1
+
+# --- Wire Protocol (core/wire.py) ---
+WIRE_COMPACT_ENABLED = True              # Clients may negotiate the compact protocol
+WIRE_MAX_TEMPLATES = 2048                # Message templates numbered per connection
+WIRE_HTTP_COMPRESSION = True             # Compress long-polling responses
+WIRE_COMPRESSION_THRESHOLD = 1024        # ...over this many bytes
+
+# --- Background Workers ---
+# Number of worker processes for CPU-heavy jobs (pathfinding, room graph compilation)
+WORKER_POOL_SIZE = max(1, min(4, (os.cpu_count() or 2) - 1))
+# Max finished jobs whose callbacks run per game loop iteration
+WORKER_RESULTS_PER_POLL = 50
+# A callback with no reply after this long runs with status "timeout" (dead or stuck worker)
+WORKER_TASK_TIMEOUT_SECONDS = 10
 
 # --- Player & Chargen ---
 CHARGEN_START_ROOM = "inn_room"
 CHARGEN_COMPLETE_ROOM = "town_square"
 PLAYER_DEATH_ROOM_ID = "temple_of_light"
 
+# --- Message History ---
+MESSAGE_HISTORY_SIZE = 100                  # Lines kept per character (ring buffer)
+MESSAGE_HISTORY_SAVE_INTERVAL_SECONDS = 300 # Periodic saves only write history this often
+MESSAGE_HISTORY_CHUNK_SIZE = 50             # Lines per 'message_history' emit on login
+
 # --- Healing & Regeneration ---
 WOUND_HEAL_TIME_SECONDS = 60      # Time for bandaged Rank 1 wound to scar (Non-Trolls)
 TROLL_REGEN_INTERVAL_SECONDS = 60 # Time for Troll natural regeneration tick
@@ -56,6 +101,9 @@ SHIELD_SKILL_DS_BONUS_DIVISOR = 10
 COMBAT_ADVANTAGE_FACTOR = 40      
 COMBAT_HIT_THRESHOLD = 100        
 COMBAT_DAMAGE_MODIFIER_DIVISOR = 10 
+# Monster swings due in one tick are rolled together; at or above this many
+# the end-rolls go through NumPy (when installed) instead of a Python loop.
+COMBAT_BATCH_VECTOR_MIN = 32
 
 # Roundtime
 ROUNDTIME_DEFAULTS = {
@@ -126,6 +174,7 @@ TOWN_ROOM_IDS = [
     "library_archives", "theatre"
 ]
 NODE_ROOM_IDS = ["town_square"] 
+MAP_DELTA_PAYLOADS = True                # map_data only carries rooms new/changed for that client
 
 # --- Factions ---
 FACTION_LEVELS = {
@@ -1,5 +1,10 @@
 # mud_backend/core/asset_manager.py
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, FrozenSet
+from mud_backend.core.game_loop.behavior_tree import compile_ai_scripts
+from mud_backend.core.faction_handler import build_faction_kos_sets
+from mud_backend.core.critical_tables import CriticalTables
+from mud_backend.core.critical_tables import compile_critical_tables
+from mud_backend.core.room_index import RoomIndex
 
 class AssetManager:
     """
@@ -9,14 +14,20 @@ class AssetManager:
     def __init__(self):
         # --- Global Data Caches ---
         self.monster_templates: Dict[str, Dict] = {}
+        self.compiled_ai_scripts: Dict[str, tuple] = {}
         self.loot_tables: Dict[str, List] = {}
         self.items: Dict[str, Dict] = {}
         self.level_table: List[int] = []
         self.skills: Dict[str, Dict] = {}
         self.criticals: Dict[str, Any] = {}
+        self.critical_tables: CriticalTables = compile_critical_tables({})
         self.quests: Dict[str, Any] = {}
         self.nodes: Dict[str, Any] = {} 
         self.factions: Dict[str, Any] = {}
+        # faction_id -> frozenset of faction_ids it is KOS with (symmetric)
+        self.faction_kos_sets: Dict[str, FrozenSet[str]] = {}
+        # faction value -> con level name (filled lazily by faction_handler.get_con_level)
+        self.con_level_cache: Dict[int, str] = {}
         self.spells: Dict[str, Any] = {}
         self.combat_rules: Dict[str, Any] = {} 
         self.races: Dict[str, Any] = {} 
@@ -27,6 +38,8 @@ class AssetManager:
         
         # Room templates
         self.room_templates: Dict[str, Dict[str, Any]] = {}
+        # room_id <-> permanent int, for per-player room bitmaps
+        self.room_index: RoomIndex = RoomIndex()
         
         # Dependency Injection for lazy loading
         self.room_loader: Optional[Callable[[str], dict]] = None
@@ -42,9 +55,14 @@ class AssetManager:
         """
         print("[ASSETS] Loading all room templates...")
         self.room_templates = data_source.fetch_all_rooms()
+        self.room_index = RoomIndex(data_source.fetch_room_index())
+        new_room_entries = self.room_index.intern_all(sorted(self.room_templates))
+        if new_room_entries:
+            data_source.save_room_index_entries(new_room_entries)
         
         print("[ASSETS] Loading all monster templates...")
         self.monster_templates = data_source.fetch_all_monsters()
+        self.compiled_ai_scripts = compile_ai_scripts(self.monster_templates)
         
         print("[ASSETS] Loading all loot tables...")
         self.loot_tables = data_source.fetch_all_loot_tables()
@@ -60,6 +78,7 @@ class AssetManager:
         
         print("[ASSETS] Loading all criticals...")
         self.criticals = data_source.fetch_all_criticals()
+        self.critical_tables = compile_critical_tables(self.criticals)
         
         print("[ASSETS] Loading all quests...")
         self.quests = data_source.fetch_all_quests()
@@ -69,6 +88,8 @@ class AssetManager:
         
         print("[ASSETS] Loading all factions...")
         self.factions = data_source.fetch_all_factions()
+        self.faction_kos_sets = build_faction_kos_sets(self.factions)
+        self.con_level_cache = {}
         
         print("[ASSETS] Loading all spells...")
         self.spells = data_source.fetch_all_spells()
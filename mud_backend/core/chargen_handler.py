@@ -389,6 +389,8 @@ def _handle_appearance_input(player: Player, text_input: str):
             return 
             
     player.appearance[question_key] = answer
+    if question_key == "race":
+        player.invalidate_faction_cache()
     player.send_message(f"> {answer}")
 
     player.chargen_step += 1
@@ -7,6 +7,7 @@ from typing import Any
 from typing import Optional
 from typing import TYPE_CHECKING
 from typing import List
+from typing import Tuple
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
@@ -18,6 +19,16 @@ from mud_backend import config
 # NEW IMPORTS FOR DEATH HANDLER
 from mud_backend.core import loot_system
 from mud_backend.core import faction_handler
+from mud_backend.core.critical_tables import CriticalResult
+from mud_backend.core.critical_tables import randomize_crit_rank
+from mud_backend.core.log import get_logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = get_logger("combat")
 
 class CombatLogBuilder:
     PLAYER_MISS_MESSAGES = [
@@ -135,27 +146,6 @@ def _get_entity_critical_divisor(entity: Any, armor_data: Optional[Dict]) -> int
         return entity.get("critical_divisor", 5)
     return 5
 
-def _get_randomized_crit_rank(base_rank: int) -> int:
-    if base_rank <= 0:
-        return 0
-    if base_rank == 1:
-        return 1
-    if base_rank == 2:
-        return random.choice([1, 2])
-    if base_rank == 3:
-        return random.choice([2, 3])
-    if base_rank == 4:
-        return random.choice([2, 3, 4])
-    if base_rank == 5:
-        return random.choice([3, 4, 5])
-    if base_rank == 6:
-        return random.choice([3, 4, 5, 6])
-    if base_rank == 7:
-        return random.choice([4, 5, 6, 7])
-    if base_rank == 8:
-        return random.choice([4, 5, 6, 7, 8])
-    return random.choice([5, 6, 7, 8, 9])
-
 def _find_combatant(world: 'World', entity_id: str) -> Optional[Any]:
     player_info = world.get_player_info(entity_id.lower())
     if player_info:
@@ -170,20 +160,9 @@ def _find_combatant(world: 'World', entity_id: str) -> Optional[Any]:
                         return obj
     return None
 
-def _get_critical_result(world: 'World', damage_type: str, location: str, rank: int) -> Dict[str, Any]:
-    if rank <= 0:
-        return {"message": "", "extra_damage": 0, "wound_rank": 0}
-    if damage_type not in world.game_criticals:
-        damage_type = "slash"
-    crit_table = world.game_criticals[damage_type]
-    if location not in crit_table:
-        location = list(crit_table.keys())[0] if crit_table else "chest"
-    location_table = crit_table.get(location, {})
-    rank_str = str(min(rank, max([int(k) for k in location_table.keys()] or [1])))
-    result = location_table.get(rank_str, {"message": "A solid hit!", "extra_damage": 1, "wound_rank": 1})
-    result.setdefault("stun", False)
-    result.setdefault("fatal", False)
-    return result
+def _get_critical_result(world: 'World', damage_type: str, location: str, rank: int) -> CriticalResult:
+    """Read-only record from the tables compiled at asset load. Never mutate it."""
+    return world.assets.critical_tables.lookup(damage_type, location, rank)
 
 def _get_stat_modifiers(entity: Any) -> Dict[str, int]:
     return entity.stat_modifiers if isinstance(entity, Player) else {}
@@ -653,10 +632,14 @@ def calculate_defense_strength(defender: Any,
 
 # --- MAIN RESOLVE FUNCTION ---
 
-def resolve_attack(world: 'World', attacker: Any, defender: Any, game_items_global: dict, is_offhand: bool = False) -> dict:
+def _prepare_swing(world: 'World', attacker: Any, defender: Any, game_items_global: dict, is_offhand: bool = False) -> Dict[str, Any]:
+    """
+    Gathers everything a swing needs before the dice are rolled: names,
+    selected attack, AS, DS, AvD, damage factor and critical divisor.
+    """
     combat_rules = getattr(world, 'game_rules', {})
     if not combat_rules:
-        print("[COMBAT ERROR] Combat Rules missing! Using defaults.")
+        logger.error("Combat Rules missing! Using defaults.")
 
     is_attacker_player = isinstance(attacker, Player)
     attacker_name = attacker.name if is_attacker_player else attacker.get("name", "Creature")
@@ -760,40 +743,100 @@ def resolve_attack(world: 'World', attacker: Any, defender: Any, game_items_glob
         combat_rules
     )
 
-    d100_roll = random.randint(1, 100)
-    combat_roll_result = (attacker_as + avd_bonus) - defender_ds + d100_roll
-
-    as_str = f"+{attacker_as}" if attacker_as >= 0 else str(attacker_as)
-    avd_str = f"+{avd_bonus}" if avd_bonus >= 0 else str(avd_bonus)
-    roll_string = (f"  AS: {as_str} + AvD: {avd_str} + d100: +{d100_roll} - DS: {defender_ds} = {combat_roll_result}")
+    return {
+        "defender": defender,
+        "combat_rules": combat_rules,
+        "is_attacker_player": is_attacker_player,
+        "is_defender_player": is_defender_player,
+        "attacker_name": attacker_name,
+        "defender_name": defender_name,
+        "weapon_display": broadcast_weapon_display,
+        "verb": attack_verb,
+        "damage_type": weapon_damage_type,
+        "damage_factor": weapon_damage_factor,
+        "critical_divisor": _get_entity_critical_divisor(defender, defender_armor_data),
+        "as": attacker_as,
+        "avd": avd_bonus,
+        "ds": defender_ds,
+    }
 
-    log_builder = CombatLogBuilder(attacker_name, defender_name, broadcast_weapon_display, attack_verb)
-    results = {'hit': False, 'damage': 0, 'attempt_msg': "", 'broadcast_attempt_msg': "", 'roll_string': roll_string, 'result_msg': "", 'broadcast_result_msg': "", 'critical_msg': "", 'is_fatal': False}
+def _roll_swings(swings: List[Dict[str, Any]]) -> List[Tuple[int, int, float, int]]:
+    """
+    Rolls every prepared swing at once.
+    Returns one (d100, end_roll, raw_damage, base_crit_rank) per swing;
+    raw_damage and base_crit_rank are 0 for misses.
+    Large batches use NumPy column arrays when it is installed.
+    """
+    threshold = config.COMBAT_HIT_THRESHOLD
+    count = len(swings)
+
+    if np is not None and count >= config.COMBAT_BATCH_VECTOR_MIN:
+        attack = np.fromiter((sw["as"] + sw["avd"] for sw in swings), dtype=np.int64, count=count)
+        defense = np.fromiter((sw["ds"] for sw in swings), dtype=np.int64, count=count)
+        factors = np.fromiter((sw["damage_factor"] for sw in swings), dtype=np.float64, count=count)
+        divisors = np.fromiter((sw["critical_divisor"] for sw in swings), dtype=np.float64, count=count)
+
+        d100 = np.array([random.randint(1, 100) for _ in range(count)], dtype=np.int64)
+        end_roll = attack - defense + d100
+        hit = end_roll > threshold
+        raw_damage = np.where(hit, np.maximum(1.0, (end_roll - threshold) * factors), 0.0)
+        base_crit = np.where(hit, np.trunc(raw_damage / divisors), 0).astype(np.int64)
+        return list(zip(d100.tolist(), end_roll.tolist(), raw_damage.tolist(), base_crit.tolist()))
+
+    rolled = []
+    for sw in swings:
+        d100_roll = random.randint(1, 100)
+        end_roll = (sw["as"] + sw["avd"]) - sw["ds"] + d100_roll
+        if end_roll > threshold:
+            raw_damage = max(1, (end_roll - threshold) * sw["damage_factor"])
+            rolled.append((d100_roll, end_roll, raw_damage, math.trunc(raw_damage / sw["critical_divisor"])))
+        else:
+            rolled.append((d100_roll, end_roll, 0, 0))
+    return rolled
 
-    if is_attacker_player:
-        results['attempt_msg'] = log_builder.get_attempt_message('attacker')
-        results['broadcast_attempt_msg'] = log_builder.get_attempt_message('room')
-    else:
-        results['attempt_msg'] = log_builder.get_attempt_message('defender')
-        results['broadcast_attempt_msg'] = log_builder.get_attempt_message('room')
+def _finish_swing(world: 'World', swing: Dict[str, Any], roll: Tuple[int, int, float, int], render: bool = True) -> dict:
+    """
+    Applies a rolled swing: critical lookup, wounds, damage.
+    Message strings are only built when render is True (someone will see them).
+    """
+    d100_roll, combat_roll_result, raw_damage, base_crit_rank = roll
+    defender = swing["defender"]
+    defender_name = swing["defender_name"]
+    is_attacker_player = swing["is_attacker_player"]
+    is_defender_player = swing["is_defender_player"]
+
+    results = {'hit': False, 'damage': 0, 'attempt_msg': "", 'broadcast_attempt_msg': "", 'roll_string': "", 'result_msg': "", 'broadcast_result_msg': "", 'critical_msg': "", 'is_fatal': False}
+
+    log_builder = None
+    if render:
+        attacker_as = swing["as"]
+        avd_bonus = swing["avd"]
+        as_str = f"+{attacker_as}" if attacker_as >= 0 else str(attacker_as)
+        avd_str = f"+{avd_bonus}" if avd_bonus >= 0 else str(avd_bonus)
+        results['roll_string'] = (f"  AS: {as_str} + AvD: {avd_str} + d100: +{d100_roll} - DS: {swing['ds']} = {combat_roll_result}")
+
+        log_builder = CombatLogBuilder(swing["attacker_name"], defender_name, swing["weapon_display"], swing["verb"])
+        if is_attacker_player:
+            results['attempt_msg'] = log_builder.get_attempt_message('attacker')
+            results['broadcast_attempt_msg'] = log_builder.get_attempt_message('room')
+        else:
+            results['attempt_msg'] = log_builder.get_attempt_message('defender')
+            results['broadcast_attempt_msg'] = log_builder.get_attempt_message('room')
 
     if combat_roll_result > config.COMBAT_HIT_THRESHOLD:
         results['hit'] = True
-        endroll_success_margin = combat_roll_result - config.COMBAT_HIT_THRESHOLD
-        raw_damage = max(1, endroll_success_margin * weapon_damage_factor)
-        critical_divisor = _get_entity_critical_divisor(defender, defender_armor_data)
-        base_crit_rank = math.trunc(raw_damage / critical_divisor)
-        final_crit_rank = _get_randomized_crit_rank(base_crit_rank)
+        final_crit_rank = randomize_crit_rank(base_crit_rank)
 
-        hit_location = _get_random_hit_location(combat_rules)
-        crit_result = _get_critical_result(world, weapon_damage_type, hit_location, final_crit_rank)
+        hit_location = _get_random_hit_location(swing["combat_rules"])
+        crit_result = _get_critical_result(world, swing["damage_type"], hit_location, final_crit_rank)
 
-        extra_damage = crit_result["extra_damage"]
+        extra_damage = crit_result.extra_damage
         total_damage = math.trunc(raw_damage) + extra_damage
         results['damage'] = total_damage
-        results['is_fatal'] = crit_result.get("fatal", False)
+        results['is_fatal'] = crit_result.fatal
 
-        wound_rank = crit_result.get("wound_rank", 0)
+        wound_rank = crit_result.wound_rank
+        crit_message = crit_result.message
 
         # --- WOUND AGGRAVATION LOGIC START ---
         if is_defender_player:
@@ -811,47 +854,56 @@ def resolve_attack(world: 'World', attacker: Any, defender: Any, game_items_glob
                 if new_rank == 3:
                     severity = "is mangled badly"
 
-                # Append to existing critical message or create new one
-                aggravation_msg = f"\nThe wound on {defender_name}'s {hit_location} {severity}!"
-                if "message" in crit_result:
-                    crit_result["message"] += aggravation_msg
-                else:
-                    crit_result["message"] = aggravation_msg
+                # Append to the critical message (a local copy; the table record is shared)
+                crit_message += f"\nThe wound on {defender_name}'s {hit_location} {severity}!"
 
                 # TEAR OFF BANDAGES
                 if hasattr(defender, "bandages") and hit_location in defender.bandages:
                     del defender.bandages[hit_location]
-                    crit_result["message"] += f"\nThe bandages on {defender_name}'s {hit_location} are torn away!"
+                    crit_message += f"\nThe bandages on {defender_name}'s {hit_location} are torn away!"
 
             elif wound_rank > 0:
                 # Fresh wound
                 defender.wounds[hit_location] = wound_rank
         # --- WOUND AGGRAVATION LOGIC END ---
 
-        results['result_msg'] = log_builder.get_hit_result_message(total_damage)
-        if is_attacker_player:
-            results['broadcast_result_msg'] = log_builder.get_broadcast_hit_message('attacker', total_damage)
-        else:
-            results['broadcast_result_msg'] = log_builder.get_broadcast_hit_message('room', total_damage)
+        if log_builder:
+            results['result_msg'] = log_builder.get_hit_result_message(total_damage)
+            if is_attacker_player:
+                results['broadcast_result_msg'] = log_builder.get_broadcast_hit_message('attacker', total_damage)
+            else:
+                results['broadcast_result_msg'] = log_builder.get_broadcast_hit_message('room', total_damage)
 
-        crit_msg = crit_result.get("message", "").format(defender=defender_name)
-        if crit_msg:
-            results['critical_msg'] = f"   {crit_msg}"
+            crit_msg = crit_message.format(defender=defender_name)
+            if crit_msg:
+                results['critical_msg'] = f"   {crit_msg}"
     else:
         results['hit'] = False
-        if is_attacker_player:
-            results['result_msg'] = log_builder.get_miss_message('attacker')
-            results['broadcast_result_msg'] = log_builder.get_broadcast_miss_message('attacker')
-        else:
-            results['result_msg'] = log_builder.get_miss_message('defender')
-            results['broadcast_result_msg'] = log_builder.get_broadcast_miss_message('room')
+        if log_builder:
+            if is_attacker_player:
+                results['result_msg'] = log_builder.get_miss_message('attacker')
+                results['broadcast_result_msg'] = log_builder.get_broadcast_miss_message('attacker')
+            else:
+                results['result_msg'] = log_builder.get_miss_message('defender')
+                results['broadcast_result_msg'] = log_builder.get_broadcast_miss_message('room')
 
     return results
 
+def resolve_attack(world: 'World', attacker: Any, defender: Any, game_items_global: dict, is_offhand: bool = False) -> dict:
+    swing = _prepare_swing(world, attacker, defender, game_items_global, is_offhand)
+    return _finish_swing(world, swing, _roll_swings([swing])[0])
+
+def _get_combatant_location(world: 'World', entity: Any) -> Optional[str]:
+    if isinstance(entity, Player):
+        return entity.current_room_id
+    return world.mob_locations.get(entity.get("uid"))
+
 def process_combat_tick(world: 'World', broadcast_callback, send_to_player_callback, send_vitals_callback):
     current_time = time.time()
     combatant_list = world.get_all_combat_states()
 
+    # 1. Gather every monster swing due this tick
+    due_swings = []
     for combatant_id, state in combatant_list:
         if state.get("state_type") != "combat":
             continue
@@ -869,19 +921,7 @@ def process_combat_tick(world: 'World', broadcast_callback, send_to_player_callb
             continue
 
         # [FIX] Check for Room/Distance integrity
-        attacker_loc = None
-        if isinstance(attacker, Player):
-            attacker_loc = attacker.current_room_id
-        else:
-            attacker_loc = world.mob_locations.get(attacker.get("uid"))
-
-        defender_loc = None
-        if isinstance(defender, Player):
-            defender_loc = defender.current_room_id
-        else:
-            defender_loc = world.mob_locations.get(defender.get("uid"))
-
-        if attacker_loc != defender_loc:
+        if _get_combatant_location(world, attacker) != _get_combatant_location(world, defender):
             world.stop_combat_for_all(combatant_id, state["target_id"])
             continue
 
@@ -889,17 +929,38 @@ def process_combat_tick(world: 'World', broadcast_callback, send_to_player_callb
             continue
 
         # [FIX] Check if Monster Attacker is Dead
-        if not isinstance(attacker, Player):
-            att_uid = attacker.get("uid")
-            att_hp = world.get_monster_hp(att_uid)
-            if att_hp is not None and att_hp <= 0:
-                world.remove_combat_state(combatant_id)
-                continue
+        att_hp = world.get_monster_hp(attacker.get("uid"))
+        if att_hp is not None and att_hp <= 0:
+            world.remove_combat_state(combatant_id)
+            continue
+
+        due_swings.append((combatant_id, state, attacker, defender, attacker_room_id))
+
+    if not due_swings:
+        return
+
+    # 2. Roll them together
+    prepared = [_prepare_swing(world, attacker, defender, world.game_items) for _, _, attacker, defender, _ in due_swings]
+    rolls = _roll_swings(prepared)
+
+    # 3. Apply in order; earlier swings this tick may have ended later fights
+    for (combatant_id, state, attacker, defender, attacker_room_id), swing, roll in zip(due_swings, prepared, rolls):
+        if not world.get_combat_state(combatant_id):
+            continue
+        att_hp = world.get_monster_hp(attacker.get("uid"))
+        if att_hp is not None and att_hp <= 0:
+            world.remove_combat_state(combatant_id)
+            continue
+        if _get_combatant_location(world, attacker) != _get_combatant_location(world, defender):
+            world.stop_combat_for_all(combatant_id, state["target_id"])
+            continue
 
         is_defender_player = isinstance(defender, Player)
 
-        # Monster Attack
-        attack_results = resolve_attack(world, attacker, defender, world.game_items, is_offhand=False)
+        # Only build message strings if a player is there to read them
+        watchers = world.entity_manager.get_players_in_room(attacker_room_id)
+        render = bool(watchers)
+        attack_results = _finish_swing(world, swing, roll, render=render)
 
         sid_to_skip = None
         if is_defender_player:
@@ -912,15 +973,16 @@ def process_combat_tick(world: 'World', broadcast_callback, send_to_player_callb
             if defender_info:
                 sid_to_skip = defender_info.get("sid")
 
-        broadcast_msg = attack_results['broadcast_attempt_msg']
-        if attack_results['hit']:
-            broadcast_msg = attack_results['broadcast_result_msg']
-            if attack_results['critical_msg']:
-                broadcast_msg += f"\n{attack_results['critical_msg']}"
-        else:
-            broadcast_msg += f"\n{attack_results['broadcast_result_msg']}"
+        if render:
+            broadcast_msg = attack_results['broadcast_attempt_msg']
+            if attack_results['hit']:
+                broadcast_msg = attack_results['broadcast_result_msg']
+                if attack_results['critical_msg']:
+                    broadcast_msg += f"\n{attack_results['critical_msg']}"
+            else:
+                broadcast_msg += f"\n{attack_results['broadcast_result_msg']}"
 
-        broadcast_callback(attacker_room_id, broadcast_msg, "combat_broadcast", skip_sid=sid_to_skip)
+            broadcast_callback(attacker_room_id, broadcast_msg, "combat_broadcast", skip_sid=sid_to_skip)
 
         if attack_results['hit']:
             damage = attack_results['damage']
@@ -960,7 +1022,8 @@ def process_combat_tick(world: 'World', broadcast_callback, send_to_player_callb
                 new_hp = world.modify_monster_hp(defender_uid, defender.get("max_hp", 1), damage)
                 if new_hp <= 0 or is_fatal:
                     consequence_msg = f"**The {defender['name']} has been DEFEATED!**"
-                    broadcast_callback(attacker_room_id, consequence_msg, "combat_death", skip_sid=sid_to_skip)
+                    if render:
+                        broadcast_callback(attacker_room_id, consequence_msg, "combat_death", skip_sid=sid_to_skip)
                     
                     # Monster vs Monster cleanup
                     world.set_defeated_monster(defender_uid, {
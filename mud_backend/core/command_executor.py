@@ -3,8 +3,8 @@ import time
 import pkgutil
 import importlib
 import os
-import traceback
 from typing import List
+from typing import Tuple
 from typing import Dict
 from typing import Any
 from typing import Optional
@@ -18,14 +18,19 @@ from mud_backend.core.game_objects import Room
 from mud_backend.core.db import fetch_player_data
 from mud_backend.core.db import save_game_state
 from mud_backend.core.registry import VerbRegistry
+from mud_backend.core import metrics
+from mud_backend.core import tracing
+from mud_backend.core.log import get_logger
 from mud_backend.core.chargen_handler import handle_chargen_input
 from mud_backend.core.chargen_handler import do_initial_stat_roll
 from mud_backend.core.chargen_handler import send_stat_roll_prompt
 from mud_backend.core.chargen_handler import send_assignment_prompt
 from mud_backend.core.chargen_handler import get_chargen_prompt
-from mud_backend.core.room_handler import _get_map_data
+from mud_backend.core.room_handler import get_map_update
 from mud_backend import config
 
+logger = get_logger("command")
+
 # Define critical commands that trigger a save
 CRITICAL_COMMANDS = {
     'quit', 'logout', 'save',
@@ -52,12 +57,26 @@ def _load_verbs():
             try:
                 importlib.import_module(full_module_name)
             except Exception as e:
-                print(f"[ERROR] Failed to load verb module '{name}': {e}")
-                traceback.print_exc()
+                logger.exception("Failed to load verb module '%s': %s", name, e)
 
 # Load verbs at module level
 _load_verbs()
 
+def tokenize_command_line(command_line: str) -> List[Tuple[str, List[str]]]:
+    """
+    Splits a raw input line exactly once into stacked segments (';') and their words.
+    Returns [(segment_text, words), ...]; blank segments are dropped.
+    """
+    if ";" not in command_line:
+        words = command_line.split()
+        return [(command_line.strip(), words)] if words else []
+    segments = []
+    for segment in command_line.split(";"):
+        words = segment.split()
+        if words:
+            segments.append((segment.strip(), words))
+    return segments
+
 def execute_command(world: 'World', player_name: str, command_line: str, sid: str, account_username: Optional[str] = None) -> Dict[str, Any]:
     """The main function to parse and execute a game command."""
 
@@ -68,11 +87,12 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
         player = player_info["player_obj"]
         player.messages.clear()
     else:
-        player_db_data = fetch_player_data(player_name)
+        with tracing.span("load_player"):
+            player_db_data = fetch_player_data(player_name)
         if not player_db_data:
             # New Character Logic
             if not account_username:
-                print(f"[EXEC-ERROR] New player {player_name} has no account_username!")
+                logger.error("New player %s has no account_username!", player_name)
                 return {"messages": ["Critical error: Account not found."], "game_state": "error"}
 
             start_room_id = config.CHARGEN_START_ROOM
@@ -91,8 +111,7 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
             player.mtps = mtps
             player.stps = stps
 
-            if start_room_id not in player.visited_rooms:
-                player.visited_rooms.append(start_room_id)
+            player.visited_rooms.add(start_room_id)
 
             player.send_message(f"Welcome, **{player.name}**! You awaken from a hazy dream...")
             world.add_player_to_room_index(player.name.lower(), start_room_id)
@@ -100,78 +119,64 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
         else:
             # Loading Character
             player = Player(world, player_db_data["name"], player_db_data["current_room_id"], player_db_data)
-            if player.current_room_id not in player.visited_rooms:
-                player.visited_rooms.append(player.current_room_id)
+            player.visited_rooms.add(player.current_room_id)
 
             player.group_id = world.get_player_group_id_on_load(player.name.lower())
             world.add_player_to_room_index(player.name.lower(), player.current_room_id)
+            # Let the vitals pulse catch up on anything that happened while offline
+            player.schedule_vitals()
 
-    # --- NEW: Command Stacking & Aliases ---
+    # --- Command Stacking & Aliases ---
 
-    # 1. Handle Stacking (;)
-    if ";" in command_line:
-        # Split into segments
-        stacked_cmds = [cmd.strip() for cmd in command_line.split(";") if cmd.strip()]
-        if not stacked_cmds:
-            # User typed ';;;' or just ';'
-            pass
-        else:
-            # The first command is executed now
-            command_line = stacked_cmds[0]
-            # The rest are queued
-            if len(stacked_cmds) > 1:
-                player.command_queue.extend(stacked_cmds[1:])
+    # 1. Tokenize once: the first segment runs now, the rest (';') are queued
+    segments = tokenize_command_line(command_line)
+    if segments:
+        command_line, parts = segments[0]
+        if len(segments) > 1:
+            player.command_queue.extend(text for text, _ in segments[1:])
+    else:
+        command_line, parts = "", []
 
     # 2. Handle Aliases
-    first_word = command_line.split()[0].lower() if command_line else ""
-    if first_word and first_word in player.aliases:
-        # Simple substitution: Replace alias key with alias value
-        # E.g. alias "k" -> "kill"
-        # Input "k goblin" -> "kill goblin"
-        # Input "k" -> "kill"
-
-        alias_val = player.aliases[first_word]
-        # Split command line to preserve arguments
-        cmd_parts = command_line.split()
-        args = cmd_parts[1:] if len(cmd_parts) > 1 else []
-
-        # Reconstruct
-        command_line = f"{alias_val} {' '.join(args)}".strip()
+    # Simple substitution of the first word: alias "k" -> "kill", "k goblin" -> "kill goblin"
+    if parts:
+        alias_val = player.aliases.get(parts[0].lower())
+        if alias_val:
+            parts = alias_val.split() + parts[1:]
+            command_line = " ".join(parts)
 
-    # --- END NEW ---
+    # 3. Command Parsing
+    command = parts[0].lower() if parts else ""
+    args = parts[1:]
+    is_ping = command == "ping" and not args
 
     # Check Freeze
     if player.flags.get("frozen", "off") == "on":
-        if command_line.strip().lower() not in ['quit', 'help']:
+        if args or command not in ('quit', 'help'):
             player.send_message("You are frozen solid and cannot act.")
             vitals_data = player.get_vitals()
-            map_data = _get_map_data(player, world)
             return {
                 "messages": player.messages,
                 "game_state": player.game_state,
                 "vitals": vitals_data,
-                "map_data": map_data,
+                **get_map_update(player, world, sid),
                 "leave_message": None
             }
 
     # 2. State Management Updates
-    if player.game_state == "playing" and command_line.lower() != "ping":
+    if player.game_state == "playing" and not is_ping:
         if player.is_goto_active:
             player.is_goto_active = False
             player.goto_id = None
 
     # Ensure room hydration
-    world.room_manager.get_room(player.current_room_id)
-    room = world.room_manager.get_active_room_safe(player.current_room_id)
+    with tracing.span("hydrate"):
+        world.room_manager.get_room(player.current_room_id)
+        room = world.room_manager.get_active_room_safe(player.current_room_id)
 
     if not room:
         room = Room("void", "The Void", "Nothing is here.")
 
-    # 3. Command Parsing
-    parts = command_line.strip().split()
-    command = parts[0].lower() if parts else ""
-    args = parts[1:] if parts else []
-
     # 4. Game State Handling
     if player.game_state == "chargen":
         if player.chargen_step == 0 and command == "look":
@@ -203,8 +208,7 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
 
     elif player.game_state == "playing":
         if not parts:
-            if command_line.lower() != "ping":
-                player.send_message("What?")
+            player.send_message("What?")
         else:
             if _run_verb(world, player, room, command, args):
                 pass
@@ -221,10 +225,12 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
     })
 
     if command in CRITICAL_COMMANDS:
-        save_game_state(player)
+        with tracing.span("persist"):
+            save_game_state(player, flush_history=command in ('quit', 'logout'))
 
     vitals_data = player.get_vitals()
-    map_data = _get_map_data(player, world)
+    with tracing.span("map"):
+        map_update = get_map_update(player, world, sid)
 
     leave_msg = getattr(player, "temp_leave_message", None)
     player.temp_leave_message = None
@@ -233,33 +239,38 @@ def execute_command(world: 'World', player_name: str, command_line: str, sid: st
         "messages": player.messages,
         "game_state": player.game_state,
         "vitals": vitals_data,
-        "map_data": map_data,
+        **map_update,
         "leave_message": leave_msg
     }
 
 def _run_verb(world: 'World', player: Player, room: Room, command: str, args: List[str]) -> bool:
     """
-    Instantiates and executes the verb class found in the registry.
+    Runs the handler the dispatch table holds for 'command' (already lower-cased).
+    Stateless handlers are called directly; verb classes are instantiated and executed.
     Returns True if a verb was found and executed, False otherwise.
     """
-    verb_info = VerbRegistry.get_verb_info(command)
-
-    if verb_info:
-        VerbClass, admin_only = verb_info
+    entry = VerbRegistry.resolve(command)
 
+    if entry:
         is_admin = getattr(player, "is_admin", False)
-        if admin_only and not is_admin:
+        if entry.admin_only and not is_admin:
             return False
 
+        if metrics.ENABLED:
+            metrics.COMMANDS.inc(entry.primary)
+        tracing.set_verb(entry.primary)
+
         try:
-            verb_instance = VerbClass(world=world, player=player, room=room, args=args, command=command)
-            verb_instance.execute()
+            with tracing.span("verb"):
+                if entry.stateless:
+                    entry.handler(world, player, room, args, command)
+                else:
+                    verb_instance = entry.handler(world=world, player=player, room=room, args=args, command=command)
+                    verb_instance.execute()
             return True
         except Exception as e:
             player.send_message(f"An error occurred: {e}")
-            print(f"Error running command '{command}': {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error running command '%s': %s", command, e)
             return True
 
     return False
\ No newline at end of file
@@ -0,0 +1,123 @@
+# mud_backend/core/critical_tables.py
+"""
+Compiles criticals.json into dense, read-only lookup tables.
+
+criticals.json:  { damage_type: { location: { "1": {message, extra_damage, wound_rank, stun?, fatal?}, ... } } }
+
+Compiled form:   rows[damage_type_id][location_id] -> tuple of CriticalResult indexed by rank
+                 (index 0 is the "no critical" record, the last index is the table's max rank).
+
+All fallbacks (unknown damage type -> slash, unknown location -> the type's first
+location, missing rank -> "A solid hit!") are resolved once at compile time.
+Non-critical sections of the file (e.g. 'wounds', 'scars' description text) are skipped.
+"""
+import random
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class CriticalResult(NamedTuple):
+    message: str
+    extra_damage: int
+    wound_rank: int
+    stun: bool
+    fatal: bool
+
+
+NO_CRITICAL = CriticalResult("", 0, 0, False, False)
+DEFAULT_CRITICAL = CriticalResult("A solid hit!", 1, 1, False, False)
+FALLBACK_DAMAGE_TYPE = "slash"
+
+# Base rank -> the ranks it may randomize to (uniform pick). Ranks above 9 use the last row.
+CRIT_RANK_SPREAD: Tuple[Tuple[int, ...], ...] = (
+    (0,),
+    (1,),
+    (1, 2),
+    (2, 3),
+    (2, 3, 4),
+    (3, 4, 5),
+    (3, 4, 5, 6),
+    (4, 5, 6, 7),
+    (4, 5, 6, 7, 8),
+    (5, 6, 7, 8, 9),
+)
+
+CritRow = Tuple[CriticalResult, ...]
+
+
+def randomize_crit_rank(base_rank: int) -> int:
+    if base_rank <= 0:
+        return 0
+    return random.choice(CRIT_RANK_SPREAD[min(base_rank, len(CRIT_RANK_SPREAD) - 1)])
+
+
+def _compile_row(rank_table: Dict[str, Any]) -> Optional[CritRow]:
+    """Dense tuple of records for one location, or None if this isn't a critical table."""
+    records = {}
+    for rank_key, entry in rank_table.items():
+        if not isinstance(entry, dict) or not str(rank_key).isdigit():
+            return None
+        records[int(rank_key)] = CriticalResult(
+            entry.get("message", ""),
+            entry.get("extra_damage", 0),
+            entry.get("wound_rank", 0),
+            bool(entry.get("stun", False)),
+            bool(entry.get("fatal", False)),
+        )
+    max_rank = max(records) if records else 1
+    return (NO_CRITICAL,) + tuple(records.get(rank, DEFAULT_CRITICAL) for rank in range(1, max_rank + 1))
+
+
+class CriticalTables:
+    """Immutable crit lookups built once per asset load."""
+    __slots__ = ("damage_type_ids", "location_ids", "rows", "fallback_rows", "_fallback_type_id")
+
+    def __init__(self, criticals: Dict[str, Any]):
+        self.damage_type_ids: Dict[str, int] = {}
+        self.location_ids: Dict[str, int] = {}
+
+        compiled: Dict[str, Dict[str, CritRow]] = {}
+        for damage_type, crit_table in (criticals or {}).items():
+            if not isinstance(crit_table, dict):
+                continue
+            type_rows = {}
+            for location, rank_table in crit_table.items():
+                row = _compile_row(rank_table) if isinstance(rank_table, dict) else None
+                if row is None:
+                    type_rows = None
+                    break
+                type_rows[location] = row
+            if type_rows is None:
+                continue
+            compiled[damage_type] = type_rows
+            self.damage_type_ids[damage_type] = len(self.damage_type_ids)
+            for location in type_rows:
+                if location not in self.location_ids:
+                    self.location_ids[location] = len(self.location_ids)
+
+        default_row: CritRow = (NO_CRITICAL, DEFAULT_CRITICAL)
+        rows = []
+        fallback_rows = []
+        for damage_type in self.damage_type_ids:
+            type_rows = compiled[damage_type]
+            # Unknown locations use the type's first location, like the JSON lookup did
+            fallback = next(iter(type_rows.values())) if type_rows else default_row
+            fallback_rows.append(fallback)
+            rows.append(tuple(type_rows.get(location, fallback) for location in self.location_ids))
+
+        self.rows: Tuple[Tuple[CritRow, ...], ...] = tuple(rows)
+        self.fallback_rows: Tuple[CritRow, ...] = tuple(fallback_rows)
+        self._fallback_type_id = self.damage_type_ids.get(FALLBACK_DAMAGE_TYPE)
+
+    def lookup(self, damage_type: str, location: str, rank: int) -> CriticalResult:
+        if rank <= 0:
+            return NO_CRITICAL
+        type_id = self.damage_type_ids.get(damage_type, self._fallback_type_id)
+        if type_id is None:
+            return DEFAULT_CRITICAL
+        location_id = self.location_ids.get(location)
+        row = self.rows[type_id][location_id] if location_id is not None else self.fallback_rows[type_id]
+        return row[min(rank, len(row) - 1)]
+
+
+def compile_critical_tables(criticals: Dict[str, Any]) -> CriticalTables:
+    return CriticalTables(criticals)
@@ -12,6 +12,8 @@ from pymongo.errors import ConnectionFailure
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from mud_backend import config
+from mud_backend.core import metrics
+from mud_backend.core.log import get_logger
 
 if TYPE_CHECKING:
     from .game_objects import Player, Room
@@ -22,6 +24,10 @@ DATABASE_NAME = config.DATABASE_NAME
 client: Optional[MongoClient] = None
 db = None
 
+logger = get_logger("db")
+# Dangling exits are looked up on every path search; warn once per room_id
+_missing_room_ids = set()
+
 def get_db():
     global client, db
     
@@ -54,6 +60,14 @@ def get_db():
         # Kill the server immediately so we don't run in a broken state
         sys.exit(1)
 
+def use_database(database):
+    """
+    Points every helper in this module at 'database' instead of connecting to
+    MongoDB (e.g. core.memory_db.MemoryDatabase for load tests and benchmarks).
+    """
+    global db
+    db = database
+
 def ensure_initial_data():
     """Ensures base entities exist from JSON definitions."""
     database = get_db()
@@ -138,7 +152,7 @@ def create_account(username: str, password: str) -> bool:
         })
         return True
     except Exception as e:
-        print(f"[DB ERROR] Could not create account: {e}")
+        logger.error("Could not create account: %s", e)
         return False
 
 def check_account_password(account_data: dict, password: str) -> bool:
@@ -157,13 +171,18 @@ def fetch_player_data(player_name: str) -> dict:
 def fetch_room_data(room_id: str) -> dict:
     room_data = get_db().rooms.find_one({"room_id": room_id})
     if room_data is None:
-        print(f"[DB WARN] room_id '{room_id}' not found in DB. Is it defined in the JSON files?")
+        if room_id not in _missing_room_ids:
+            _missing_room_ids.add(room_id)
+            logger.warning("room_id '%s' not found in DB. Is it defined in the JSON files?", room_id)
         return {"room_id": "void", "name": "The Void", "description": "Nothing but endless darkness here."}
     return room_data
 
-def save_game_state(player: 'Player'):
-    player_data = player.to_dict()
+def save_game_state(player: 'Player', flush_history: bool = False):
+    player_data = player.to_dict(include_unloaded_profile=False)
     player_data["account_username"] = player.account_username 
+    history = player.history_for_save(force=flush_history)
+    if history is not None:
+        player_data["message_history"] = history
     
     result = get_db().players.update_one(
         {"name": player.name}, 
@@ -223,6 +242,13 @@ def fetch_all_rooms() -> dict:
             rooms_dict[room_id] = room_data
     return rooms_dict
 
+def fetch_room_index() -> Dict[str, int]:
+    return {doc["room_id"]: doc["index"] for doc in get_db().room_index.find()}
+
+def save_room_index_entries(entries: Dict[str, int]):
+    if not entries: return
+    get_db().room_index.insert_many([{"room_id": room_id, "index": index} for room_id, index in entries.items()])
+
 def _load_json_data(filename: str) -> Any:
     try:
         json_path = os.path.join(os.path.dirname(__file__), '..', 'data', filename)
@@ -427,4 +453,10 @@ def update_player_locker(player_name: str, locker_data: dict):
     get_db().players.update_one(
         {"name": {"$regex": f"^{player_name}$", "$options": "i"}},
         {"$set": {"locker": locker_data}}
-    )
\ No newline at end of file
+    )
+
+# --- Metrics ---
+# Every public helper above gets a call counter and latency histogram (labelled
+# by function name). Runs last so 'from db import x' elsewhere binds the
+# wrapped helper. A no-op when metrics are disabled.
+metrics.instrument_module(sys.modules[__name__], exclude=("get_db", "use_database"))
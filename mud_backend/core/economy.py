@@ -6,6 +6,9 @@ import copy
 import json
 import os
 from typing import Dict, Any, List, Optional
+from mud_backend.core.log import get_logger
+
+logger = get_logger("economy")
 
 # --- Configuration for Dynamic Shop Displays ---
 
@@ -26,7 +29,7 @@ def load_restock_pools() -> Dict[str, Any]:
         with open(json_path, 'r') as f:
             return json.load(f)
     except Exception as e:
-        print(f"Error loading restock pools: {e}")
+        logger.error("Error loading restock pools: %s", e)
         return {}
 
 # Load once at module import time
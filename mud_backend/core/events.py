@@ -1,6 +1,9 @@
 # mud_backend/core/events.py
 from collections import defaultdict
 from typing import Callable, List, Dict, Any
+from mud_backend.core.log import get_logger
+
+logger = get_logger("events")
 
 class EventBus:
     """
@@ -20,14 +23,11 @@ class EventBus:
         """
         Trigger an event. All subscribers are called with the provided kwargs.
         """
-        # Debug log for critical events could go here
-        # if event_type not in ["tick"]: print(f"[EVENT] {event_type} triggered: {kwargs}")
-        
+        logger.debug("%s triggered: %s", event_type, kwargs)
+
         if event_type in self.subscribers:
             for callback in self.subscribers[event_type]:
                 try:
                     callback(**kwargs)
                 except Exception as e:
-                    print(f"[EVENT BUS ERROR] Error handling '{event_type}': {e}")
-                    import traceback
-                    traceback.print_exc()
\ No newline at end of file
+                    logger.exception("Error handling '%s': %s", event_type, e)
\ No newline at end of file
@@ -1,15 +1,47 @@
 # mud_backend/core/faction_handler.py
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from typing import Dict, Any, Optional, List, FrozenSet, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
     from mud_backend.core.game_objects import Player
 
+KOS_CON_LEVELS = frozenset(["Threatening", "Scowls"])
+
+def build_faction_kos_sets(game_factions: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """
+    Precomputes, for every known faction, the set of factions it is KOS with.
+    KOS is symmetric: if either side lists the other, both sets contain it.
+    """
+    all_factions = game_factions.get("factions", {})
+    kos_sets: Dict[str, set] = {faction_id: set() for faction_id in all_factions}
+    for faction_id, faction_data in all_factions.items():
+        for other_id in faction_data.get("kos_factions", []):
+            if other_id not in kos_sets:
+                continue
+            kos_sets[faction_id].add(other_id)
+            kos_sets[other_id].add(faction_id)
+    return {faction_id: frozenset(others) for faction_id, others in kos_sets.items()}
+
+def _get_faction_standing(player: 'Player', faction_id: str) -> Tuple[int, str]:
+    """
+    Returns (effective_value, con_level) from the player's faction cache,
+    computing and storing it on a miss. See Player.invalidate_faction_cache.
+    """
+    standing = player.faction_cache.get(faction_id)
+    if standing is None:
+        effective_value = _compute_effective_faction_value(player, faction_id)
+        standing = (effective_value, get_con_level(player.world, effective_value))
+        player.faction_cache[faction_id] = standing
+    return standing
+
 def get_effective_faction_value(player: 'Player', faction_id: str) -> int:
     """
-    Calculates the effective faction standing.
+    Returns the effective faction standing (cached per player).
     Effective = Earned (Quests/Kills) + Racial Modifiers + Deity Modifiers
     """
+    return _get_faction_standing(player, faction_id)[0]
+
+def _compute_effective_faction_value(player: 'Player', faction_id: str) -> int:
     # 1. Earned Value (Mutable)
     earned_value = player.factions.get(faction_id, 0)
     
@@ -32,14 +64,22 @@ def get_con_level(world: 'World', faction_value: int) -> str:
     Takes a numerical faction value and returns the corresponding
     con level string (e.g., "Amiable", "Threatening").
     """
+    con_cache = world.assets.con_level_cache
+    con_name = con_cache.get(faction_value)
+    if con_name is not None:
+        return con_name
+
     con_levels = world.game_factions.get("config", {}).get("con_levels", [])
     default_con = world.game_factions.get("config", {}).get("default_con", "Indifferent")
     
+    con_name = default_con
     for level in con_levels:
         if level.get("min", 0) <= faction_value <= level.get("max", 0):
-            return level.get("name", default_con)
-            
-    return default_con
+            con_name = level.get("name", default_con)
+            break
+
+    con_cache[faction_value] = con_name
+    return con_name
 
 def get_player_faction_con(player: 'Player', target_faction: str) -> str:
     """
@@ -48,8 +88,7 @@ def get_player_faction_con(player: 'Player', target_faction: str) -> str:
     if not target_faction:
         return get_con_level(player.world, 0)
         
-    effective_value = get_effective_faction_value(player, target_faction)
-    return get_con_level(player.world, effective_value)
+    return _get_faction_standing(player, target_faction)[1]
 
 def adjust_player_faction(player: 'Player', faction_id: str, amount: int, propagate: bool = True):
     """
@@ -68,6 +107,7 @@ def adjust_player_faction(player: 'Player', faction_id: str, amount: int, propag
     new_earned = max(-5000, min(5000, new_earned))
     
     player.factions[faction_id] = new_earned
+    player.faction_cache.pop(faction_id, None)
     
     # Feedback
     faction_config = player.world.game_factions.get("factions", {}).get(faction_id, {})
@@ -87,6 +127,9 @@ def adjust_player_faction(player: 'Player', faction_id: str, amount: int, propag
             inverse_amount = -amount
             adjust_player_faction(player, opp_id, inverse_amount, propagate=False)
 
+        # Standing changed: mobs in the room may now consider the player KOS
+        player.world.entity_manager.queue_aggro_for_player(player.name, player.current_room_id)
+
 def are_factions_kos(world: 'World', faction_a: str, faction_b: str) -> bool:
     """
     Checks if two factions are inherently Kill-on-Sight (KOS) with each other.
@@ -94,20 +137,8 @@ def are_factions_kos(world: 'World', faction_a: str, faction_b: str) -> bool:
     if not faction_a or not faction_b:
         return False
         
-    all_factions = world.game_factions.get("factions", {})
-    
-    faction_a_data = all_factions.get(faction_a)
-    faction_b_data = all_factions.get(faction_b)
-    
-    if not faction_a_data or not faction_b_data:
-        return False
-        
-    if faction_b in faction_a_data.get("kos_factions", []):
-        return True
-    if faction_a in faction_b_data.get("kos_factions", []):
-        return True
-        
-    return False
+    kos_set = world.assets.faction_kos_sets.get(faction_a)
+    return kos_set is not None and faction_b in kos_set
 
 def is_player_kos_to_entity(player: 'Player', entity: Dict[str, Any]) -> bool:
     """
@@ -117,13 +148,7 @@ def is_player_kos_to_entity(player: 'Player', entity: Dict[str, Any]) -> bool:
     if not entity_faction:
         return False 
         
-    effective_value = get_effective_faction_value(player, entity_faction)
-    con_level = get_con_level(player.world, effective_value)
-    
-    if con_level in ["Threatening", "Scowls"]:
-        return True
-        
-    return False
+    return _get_faction_standing(player, entity_faction)[1] in KOS_CON_LEVELS
 
 def get_faction_adjustments_on_kill(world: 'World', entity_faction: str) -> Dict[str, int]:
     if not entity_faction:
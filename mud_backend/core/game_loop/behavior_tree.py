@@ -0,0 +1,143 @@
+# mud_backend/core/game_loop/behavior_tree.py
+"""
+Compiles monster 'ai_script' blocks into predicate closures.
+
+ai_script JSON:  [ { "conditions": [ {"type": ..., "value": ...}, ... ],
+                     "action": {"type": ..., "value": ...} }, ... ]
+
+Compiled form:   ( (predicates_tuple, AIAction), ... )
+
+Each predicate is called as predicate(monster, target_player, room_stats) where
+room_stats is the per-tick RoomAggregates for the monster's room.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+Predicate = Callable[[Dict, Any, 'RoomAggregates'], bool]
+
+
+class AIAction(NamedTuple):
+    type: str
+    value: Any
+
+
+CompiledScript = Tuple[Tuple[Tuple[Predicate, ...], AIAction], ...]
+
+
+class RoomAggregates:
+    """
+    Facts about one room, computed once per monster tick and shared by every
+    mob in that room (ally HP, player presence).
+    """
+    __slots__ = ("room_id", "player_names", "faction_members")
+
+    def __init__(self, room_id: str, player_names, objects: List[Dict]):
+        self.room_id = room_id
+        self.player_names = player_names
+        # faction -> [(hp_pct, uid, obj), ...] sorted by hp_pct ascending
+        self.faction_members: Dict[str, List[Tuple[float, str, Dict]]] = {}
+
+        for obj in objects:
+            faction = obj.get("faction")
+            if not faction:
+                continue
+            hp_pct = (obj.get("hp", 0) / (obj.get("max_hp", 1) or 1)) * 100
+            if faction not in self.faction_members:
+                self.faction_members[faction] = []
+            self.faction_members[faction].append((hp_pct, obj.get("uid"), obj))
+
+        for members in self.faction_members.values():
+            members.sort(key=lambda entry: entry[0])
+
+    @property
+    def has_players(self) -> bool:
+        return bool(self.player_names)
+
+    def lowest_ally(self, faction: str, exclude_uid: Optional[str]) -> Optional[Tuple[float, str, Dict]]:
+        """The most injured member of 'faction' in the room, other than exclude_uid."""
+        for entry in self.faction_members.get(faction, ()):
+            if entry[1] != exclude_uid:
+                return entry
+        return None
+
+
+# --- CONDITION COMPILERS ---
+
+def _compile_health_below_percent(value: Any) -> Predicate:
+    threshold = int(value)
+    def predicate(monster, target, room_stats):
+        return (monster.get("hp", 0) / (monster.get("max_hp", 1) or 1)) * 100 < threshold
+    return predicate
+
+def _compile_target_health_below_percent(value: Any) -> Predicate:
+    threshold = int(value)
+    def predicate(monster, target, room_stats):
+        if not target: return False
+        return (target.hp / (target.max_hp or 1)) * 100 < threshold
+    return predicate
+
+def _compile_target_status(value: Any) -> Predicate:
+    needs_prone = (value == "prone")
+    def predicate(monster, target, room_stats):
+        if not target or value not in target.status_effects: return False
+        if needs_prone and target.posture != "prone": return False
+        return True
+    return predicate
+
+def _compile_self_status(value: Any) -> Predicate:
+    def predicate(monster, target, room_stats):
+        return value in monster.get("status_effects", [])
+    return predicate
+
+def _compile_has_ally_low_hp(value: Any) -> Predicate:
+    threshold = int(value)
+    def predicate(monster, target, room_stats):
+        if room_stats is None: return False
+        ally = room_stats.lowest_ally(monster.get("faction"), monster.get("uid"))
+        return ally is not None and ally[0] < threshold
+    return predicate
+
+
+CONDITION_COMPILERS: Dict[str, Callable[[Any], Predicate]] = {
+    "health_below_percent": _compile_health_below_percent,
+    "target_health_below_percent": _compile_target_health_below_percent,
+    "target_status": _compile_target_status,
+    "self_status": _compile_self_status,
+    "has_ally_low_hp": _compile_has_ally_low_hp,
+}
+
+
+def compile_ai_script(script: List[Dict]) -> CompiledScript:
+    """Compiles one ai_script list. Unknown condition types are ignored (always pass)."""
+    compiled = []
+    for block in script or []:
+        action = block.get("action")
+        if not action:
+            continue
+        predicates = []
+        for cond in block.get("conditions", []):
+            compiler = CONDITION_COMPILERS.get(cond.get("type"))
+            if compiler:
+                predicates.append(compiler(cond.get("value")))
+        compiled.append((tuple(predicates), AIAction(action.get("type"), action.get("value"))))
+    return tuple(compiled)
+
+
+def compile_ai_scripts(monster_templates: Dict[str, Dict]) -> Dict[str, CompiledScript]:
+    """Compiles the ai_script of every template that has one, keyed by monster_id."""
+    compiled = {}
+    for monster_id, template in monster_templates.items():
+        script = template.get("ai_script")
+        if script:
+            compiled[monster_id] = compile_ai_script(script)
+    return compiled
+
+
+def select_action(compiled: CompiledScript, monster: Dict, target: Any, room_stats: Optional[RoomAggregates]) -> Optional[AIAction]:
+    """Returns the action of the first block whose predicates all pass."""
+    for predicates, action in compiled:
+        for predicate in predicates:
+            if not predicate(monster, target, room_stats):
+                break
+        else:
+            return action
+    return None
@@ -1,16 +1,30 @@
 # mud_backend/core/game_loop/crafting.py
 import random
-from typing import TYPE_CHECKING
+import threading
+import uuid
+from typing import Any, Dict, List, Set, Tuple, TYPE_CHECKING
+
+from mud_backend import config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
+    from mud_backend.core.game_objects import Room
 
 # Smelting Constants
 MAX_TEMP = 2000
 AMBIENT_TEMP = 20
 FUEL_BURN_RATE = 5 # 5 Units per tick
 TEMP_GAIN_PER_FUEL = 10
-TEMP_LOSS_RATE = 2 
+TEMP_LOSS_RATE = 2
+SMELT_TEMP = 1000
+SMELT_AMOUNT = 5
+ATMOSPHERE_TEMP = 100
+ATMOSPHERE_CHANCE = 0.10
 
 def _get_furnace_atmosphere(temp: int, slag: int, fuel: int) -> str:
     """Generates a flavor string based on furnace state."""
@@ -28,66 +42,185 @@ def _get_furnace_atmosphere(temp: int, slag: int, fuel: int) -> str:
     else:
         return "emits a blinding white light and a deafening roar like a captured dragon!"
 
+def is_furnace(obj: Dict[str, Any]) -> bool:
+    return bool(obj.get("keywords")) and "furnace" in obj["keywords"] and "state" in obj
+
+def _is_idle(state: Dict[str, Any]) -> bool:
+    """A cold furnace with no fuel is a fixed point of the step: nothing to simulate."""
+    return state.get("fuel", 0) <= 0 and state.get("temp", AMBIENT_TEMP) <= AMBIENT_TEMP
+
+
+class CraftingStationRegistry:
+    """
+    Every furnace in a hydrated room, and which of them are awake.
+
+    Rooms register their furnaces once, when RoomManager hydrates them, so the
+    crafting step never scans room objects. Stations are keyed by the stub's
+    uid: hydrate_room_objects rebuilds room.objects on every verb, but shares
+    each furnace's "state" dict with its stub in room.data, so the state the
+    registry holds is the one verbs change and room saves write. A furnace is
+    awake while it holds fuel or is above ambient; the smelting verbs wake()
+    it when a player changes its state. Cold, empty furnaces cost nothing.
+    """
+    def __init__(self, world: 'World'):
+        self.world = world
+        self.lock = threading.RLock()
+        # uid -> (room_id, furnace); furnace["state"] is shared with the room's stub
+        self._stations: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._by_room: Dict[str, List[str]] = {}
+        self._awake: Set[str] = set()
+
+    def register_room(self, room: 'Room'):
+        with room.lock:
+            furnaces = [obj for obj in room.data.get("objects", []) if is_furnace(obj)]
+            for furnace in furnaces:
+                # Same persistent uid hydrate_room_objects would assign
+                furnace.setdefault("uid", uuid.uuid4().hex)
+        with self.lock:
+            self._drop_room(room.room_id)
+            for furnace in furnaces:
+                self._add(room.room_id, furnace)
+
+    def drop_room(self, room_id: str):
+        with self.lock:
+            self._drop_room(room_id)
+
+    def _drop_room(self, room_id: str):
+        for key in self._by_room.pop(room_id, []):
+            self._stations.pop(key, None)
+            self._awake.discard(key)
+
+    def _add(self, room_id: str, furnace: Dict[str, Any]):
+        key = furnace["uid"]
+        if key not in self._stations:
+            self._by_room.setdefault(room_id, []).append(key)
+        self._stations[key] = (room_id, furnace)
+        if not _is_idle(furnace["state"]):
+            self._awake.add(key)
+
+    def wake(self, room_id: str, furnace: Dict[str, Any]):
+        """Called after a player changes a (hydrated) furnace; registers furnaces placed since hydration."""
+        key = furnace["uid"]
+        with self.lock:
+            if key not in self._stations:
+                self._add(room_id, furnace)
+            self._awake.add(key)
+
+    def awake(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Snapshot of (key, room_id, furnace), so furnaces can be woken while a step runs."""
+        with self.lock:
+            return [(key, *self._stations[key]) for key in self._awake]
+
+    def sleep(self, keys: List[str]):
+        with self.lock:
+            for key in keys:
+                _, furnace = self._stations.get(key, (None, None))
+                # A verb may have refuelled it since the step read it
+                if furnace is not None and _is_idle(furnace["state"]):
+                    self._awake.discard(key)
+
+    def awake_count(self) -> int:
+        return len(self._awake)
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+
+def _step_heat(fuel: List[float], temp: List[float], air_flow: List[float]) -> Tuple[List[float], List[float]]:
+    """
+    One tick of fuel burn, heating and cooling for every furnace at once.
+    Returns (fuel consumed, temperature change) per furnace.
+    Large batches use NumPy column arrays when it is installed.
+    """
+    count = len(fuel)
+    if np is not None and count >= config.CRAFTING_VECTOR_MIN:
+        fuel_a = np.asarray(fuel, dtype=np.float64)
+        temp_a = np.asarray(temp, dtype=np.float64)
+        air_a = np.asarray(air_flow, dtype=np.float64)
+
+        burn_rate = FUEL_BURN_RATE * (0.5 + (air_a / 100.0))
+        consumed = np.where(fuel_a > 0, np.minimum(fuel_a, burn_rate), 0.0)
+        heated = temp_a + consumed * TEMP_GAIN_PER_FUEL * (0.2 + (air_a / 125.0))
+        cooling = TEMP_LOSS_RATE * (1.0 + (air_a / 50.0)) + (heated - AMBIENT_TEMP) * 0.05
+        return consumed.tolist(), (heated - cooling - temp_a).tolist()
+
+    consumed_list, delta_list = [], []
+    for fuel_i, temp_i, air_i in zip(fuel, temp, air_flow):
+        consumed = 0.0
+        heated = temp_i
+        if fuel_i > 0:
+            consumed = min(fuel_i, FUEL_BURN_RATE * (0.5 + (air_i / 100.0)))
+            heated += consumed * TEMP_GAIN_PER_FUEL * (0.2 + (air_i / 125.0))
+        cooling = TEMP_LOSS_RATE * (1.0 + (air_i / 50.0)) + (heated - AMBIENT_TEMP) * 0.05
+        consumed_list.append(consumed)
+        delta_list.append(heated - cooling - temp_i)
+    return consumed_list, delta_list
+
+def _smelt(state: Dict[str, Any]):
+    """Converts one batch of ore to metal (only called above SMELT_TEMP)."""
+    if state.get("ore", 0) < SMELT_AMOUNT:
+        return
+    state["ore"] -= SMELT_AMOUNT
+    slag_generated = 5
+    if state.get("flux", 0) >= SMELT_AMOUNT:
+        state["flux"] -= SMELT_AMOUNT
+        slag_generated = 2
+    state["slag"] = state.get("slag", 0) + slag_generated
+    state["ready_metal"] = state.get("ready_metal", 0) + SMELT_AMOUNT
+
 def process_crafting_stations(world: 'World', broadcast_callback):
     """
-    Iterates through all active rooms and processes any active crafting stations.
+    Steps every awake furnace in the world together.
+    Atmosphere lines are only rolled for rooms someone is in.
     """
-    # Snapshot active room IDs to avoid iteration size errors
-    with world.room_directory_lock:
-        active_room_ids = list(world.active_rooms.keys())
+    registry = world.crafting_stations
+    stations = registry.awake()
+    if not stations:
+        return
 
-    for room_id in active_room_ids:
+    # Rooms are locked one at a time; verbs only ever touch a single furnace
+    states = []
+    unloaded_rooms = set()
+    for _, room_id, furnace in stations:
         room = world.get_active_room_safe(room_id)
-        if not room: continue
-        
-        # We lock the room because we might modify the furnace state object
+        if room is None:
+            unloaded_rooms.add(room_id)
+            states.append(None)
+            continue
         with room.lock:
-            for obj in room.objects:
-                if obj.get("keywords") and "furnace" in obj.get("keywords") and "state" in obj:
-                    _process_furnace_tick(obj, room_id, broadcast_callback)
-
-def _process_furnace_tick(furnace: dict, room_id: str, broadcast_callback):
-    state = furnace["state"]
-    
-    # 1. Fuel & Temp Logic
-    fuel = state.get("fuel", 0)
-    temp = state.get("temp", AMBIENT_TEMP)
-    air_flow = state.get("air_flow", 50) 
-    
-    burn_rate = FUEL_BURN_RATE * (0.5 + (air_flow / 100.0))
-    
-    if fuel > 0:
-        consumed = min(fuel, burn_rate)
-        state["fuel"] -= consumed
-        efficiency = 0.2 + (air_flow / 125.0) 
-        temp_gain = consumed * TEMP_GAIN_PER_FUEL * efficiency
-        temp += temp_gain
-    
-    # Cooling Logic
-    cooling = TEMP_LOSS_RATE * (1.0 + (air_flow / 50.0))
-    cooling += (temp - AMBIENT_TEMP) * 0.05
-    temp -= cooling
-    state["temp"] = max(AMBIENT_TEMP, min(MAX_TEMP, int(temp)))
-    
-    # 2. Smelting Logic
-    if temp > 1000 and state.get("ore", 0) > 0:
-        flux = state.get("flux", 0)
-        ore = state.get("ore", 0)
-        
-        conversion_amt = 5 
-        
-        if ore >= conversion_amt:
-            state["ore"] -= conversion_amt
-            
-            slag_generated = 5 
-            if flux >= conversion_amt:
-                state["flux"] -= conversion_amt
-                slag_generated = 2 
-            
-            state["slag"] = state.get("slag", 0) + slag_generated
-            state["ready_metal"] = state.get("ready_metal", 0) + conversion_amt
-
-    # 3. Ambient Feedback (Dynamic)
-    if temp > 100 and random.random() < 0.10:
-        flavor_text = _get_furnace_atmosphere(state["temp"], state.get("slag", 0), state.get("fuel", 0))
-        broadcast_callback(room_id, f"The {furnace['name']} {flavor_text}", "ambient")
\ No newline at end of file
+            state = furnace["state"]
+            states.append((state.get("fuel", 0), state.get("temp", AMBIENT_TEMP), state.get("air_flow", 50)))
+
+    live = [index for index, values in enumerate(states) if values is not None]
+    consumed, temp_delta = _step_heat(
+        [states[i][0] for i in live], [states[i][1] for i in live], [states[i][2] for i in live]
+    )
+
+    idle_keys = []
+    for column, index in enumerate(live):
+        key, room_id, furnace = stations[index]
+        room = world.get_active_room_safe(room_id)
+        if room is None:
+            continue
+        with room.lock:
+            state = furnace["state"]
+            # Applied as changes, so a CHARGE or BELLOW since the read is kept
+            if consumed[column] > 0:
+                state["fuel"] = state.get("fuel", 0) - consumed[column]
+            temp = state.get("temp", AMBIENT_TEMP) + temp_delta[column]
+            state["temp"] = max(AMBIENT_TEMP, min(MAX_TEMP, int(temp)))
+            if temp > SMELT_TEMP and state.get("ore", 0) > 0:
+                _smelt(state)
+            if _is_idle(state):
+                idle_keys.append(key)
+            flavor_text = None
+            if temp > ATMOSPHERE_TEMP and world.get_players_in_room(room_id) and random.random() < ATMOSPHERE_CHANCE:
+                flavor_text = _get_furnace_atmosphere(state["temp"], state.get("slag", 0), state.get("fuel", 0))
+        if flavor_text:
+            broadcast_callback(room_id, f"The {furnace['name']} {flavor_text}", "ambient")
+
+    if idle_keys:
+        registry.sleep(idle_keys)
+    # Registered again, from fresh stubs, if the room is hydrated again
+    for room_id in unloaded_rooms:
+        registry.drop_room(room_id)
@@ -2,81 +2,53 @@
 import random
 import copy
 import time 
-from typing import Callable, Tuple, List, Dict, TYPE_CHECKING
+from typing import Callable, Tuple, List, Dict, Set, Optional, TYPE_CHECKING
 from mud_backend import config
 from mud_backend.core import faction_handler
 from mud_backend.core import combat_system
+from mud_backend.core.game_loop.behavior_tree import AIAction
+from mud_backend.core.game_loop.behavior_tree import CompiledScript
+from mud_backend.core.game_loop.behavior_tree import RoomAggregates
+from mud_backend.core.game_loop.behavior_tree import compile_ai_script
+from mud_backend.core.game_loop.behavior_tree import select_action
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
 
 # --- AI BEHAVIOR LOGIC ---
 
-def _evaluate_conditions(world: 'World', monster: Dict, target: 'Player', conditions: List[Dict]) -> bool:
-    """Returns True if ALL conditions in the block are met."""
-    for cond in conditions:
-        c_type = cond.get("type")
-        c_val = cond.get("value")
-        
-        if c_type == "health_below_percent":
-            hp_pct = (monster.get("hp", 0) / monster.get("max_hp", 1)) * 100
-            if hp_pct >= int(c_val): return False
-            
-        elif c_type == "target_health_below_percent":
-            if not target: return False
-            t_hp_pct = (target.hp / target.max_hp) * 100
-            if t_hp_pct >= int(c_val): return False
-
-        elif c_type == "target_status":
-            if not target or c_val not in target.status_effects: return False
-            if c_val == "prone" and target.posture != "prone": return False
-
-        elif c_type == "self_status":
-            if c_val not in monster.get("status_effects", []): return False
-
-        elif c_type == "has_ally_low_hp":
-            # Scan room for injured faction members
-            room_id = world.mob_locations.get(monster.get("uid"))
-            if not room_id: return False
-            room = world.get_active_room_safe(room_id)
-            found = False
-            if room:
-                with room.lock:
-                    for obj in room.objects:
-                        if obj.get("uid") == monster.get("uid"): continue
-                        if obj.get("faction") == monster.get("faction"):
-                            hp_pct = (obj.get("hp", 0) / obj.get("max_hp", 1)) * 100
-                            if hp_pct < int(c_val):
-                                found = True
-                                break
-            if not found: return False
-
-    return True
-
-def _execute_behavior_tree(world: 'World', monster: Dict, current_target_id: str, room_id: str, broadcast_callback) -> Dict:
+def _get_compiled_script(world: 'World', monster: Dict) -> CompiledScript:
+    """Returns the template's precompiled ai_script (compiled once at asset load)."""
+    script = monster.get("ai_script")
+    if not script:
+        return ()
+    monster_id = monster.get("monster_id")
+    compiled = world.assets.compiled_ai_scripts.get(monster_id) if monster_id else None
+    if compiled is None:
+        compiled = compile_ai_script(script)
+        if monster_id:
+            world.assets.compiled_ai_scripts[monster_id] = compiled
+    return compiled
+
+def _execute_behavior_tree(world: 'World', monster: Dict, current_target_id: str, room_stats: Optional[RoomAggregates]) -> Optional[AIAction]:
     """
-    Evaluates the 'ai_script' list. Returns an Action Dict if one triggers.
+    Evaluates the compiled 'ai_script'. Returns an AIAction if one triggers.
     Structure of ai_script: [ { "conditions": [...], "action": {...} }, ... ]
     """
-    script = monster.get("ai_script", [])
-    if not script: return None
+    compiled = _get_compiled_script(world, monster)
+    if not compiled: return None
 
     target_player = None
     if current_target_id:
         player_info = world.get_player_info(current_target_id)
         if player_info: target_player = player_info.get("player_obj")
 
-    for block in script:
-        conditions = block.get("conditions", [])
-        if _evaluate_conditions(world, monster, target_player, conditions):
-            return block.get("action")
-            
-    return None
+    return select_action(compiled, monster, target_player, room_stats)
 
-def _perform_ai_action(world: 'World', monster: Dict, action: Dict, current_target_id: str, room_id: str, broadcast_callback):
+def _perform_ai_action(world: 'World', monster: Dict, action: AIAction, current_target_id: str, room_id: str, broadcast_callback, room_stats: Optional[RoomAggregates] = None):
     """Executes the chosen action."""
-    act_type = action.get("type")
-    act_val = action.get("value")
+    act_type = action.type
+    act_val = action.value
     monster_name = monster.get("name", "The creature")
     monster_uid = monster.get("uid")
 
@@ -90,14 +62,12 @@ def _perform_ai_action(world: 'World', monster: Dict, action: Dict, current_targ
         
         # Handle Healing Ally logic specially
         if spell.get("effect") == "heal":
-            # Find the injured ally again
-            room = world.get_active_room_safe(room_id)
+            # Most injured member of our faction, from this tick's room aggregates
             target_ally = None
-            if room:
-                for obj in room.objects:
-                    if obj.get("faction") == monster.get("faction") and obj.get("hp", 100) < obj.get("max_hp", 100):
-                        target_ally = obj
-                        break
+            if room_stats:
+                ally_entry = room_stats.lowest_ally(monster.get("faction"), None)
+                if ally_entry and ally_entry[0] < 100:
+                    target_ally = ally_entry[2]
             
             if target_ally:
                 heal_amt = spell.get("base_power", 10)
@@ -169,10 +139,21 @@ def _apply_monster_rt(world, monster, seconds):
 
 # --- CORE AI LOOPS ---
 
+def _player_draws_aggro(monster_data: Dict, player_obj: 'Player') -> bool:
+    """True if this player, standing next to this monster, should be attacked."""
+    # Ignore dead players, admins, or invisible players
+    if player_obj.hp <= 0: return False
+    if player_obj.flags.get("invisible", "off") == "on": return False
+
+    # Check Aggression Flags
+    if monster_data.get("is_aggressive", False): return True
+    return faction_handler.is_player_kos_to_entity(player_obj, monster_data)
+
 def _scan_for_player_targets(world: 'World', monster_data: Dict, room_id: str) -> bool:
     """
     Scans the room for players. If an aggressive or KOS player is found,
     starts combat and returns True.
+    Full-room scan; the game loop uses process_aggro_queue instead.
     """
     monster_uid = monster_data.get("uid")
     if not monster_uid: return False
@@ -185,14 +166,10 @@ def _scan_for_player_targets(world: 'World', monster_data: Dict, room_id: str) -
     if "stunned" in status_effects or "sleeping" in status_effects:
         return False
 
-    is_aggressive = monster_data.get("is_aggressive", False)
-    
     # Get all players in the room
     player_names = world.entity_manager.get_players_in_room(room_id)
     if not player_names: return False
 
-    target_player = None
-    
     for p_name in player_names:
         p_info = world.get_player_info(p_name)
         if not p_info: continue
@@ -200,23 +177,60 @@ def _scan_for_player_targets(world: 'World', monster_data: Dict, room_id: str) -
         player_obj = p_info.get("player_obj")
         if not player_obj: continue
         
-        # Ignore dead players, admins, or invisible players
-        if player_obj.hp <= 0: continue
-        if player_obj.flags.get("invisible", "off") == "on": continue
-        
-        # Check Aggression Flags
-        is_kos = faction_handler.is_player_kos_to_entity(player_obj, monster_data)
-        
-        if is_aggressive or is_kos:
-            target_player = player_obj
-            break
-    
-    if target_player:
-        _initiate_combat(world, monster_data, target_player, room_id)
-        return True # Combat started
+        if _player_draws_aggro(monster_data, player_obj):
+            _initiate_combat(world, monster_data, player_obj, room_id)
+            return True # Combat started
 
     return False
 
+def process_aggro_queue(world: 'World') -> int:
+    """
+    Evaluates the (mob_uid, player_name) pairs queued by room-entry events
+    (player arrives, mob spawns/wanders in, invisibility or faction changes,
+    a mob leaves combat). Each pair is checked once; nothing polls idle rooms.
+    Pairs whose mob is stunned/asleep are deferred to the next monster tick.
+    Returns the number of fights started.
+    """
+    pairs = world.entity_manager.drain_aggro_queue()
+    if not pairs:
+        return 0
+
+    started = 0
+    engaged: Set[str] = set()
+    for uid, player_name in pairs:
+        if uid in engaged or world.get_combat_state(uid):
+            continue
+        if world.get_defeated_monster(uid):
+            continue
+
+        room_id = world.mob_locations.get(uid)
+        player_obj = world.get_player_obj(player_name)
+        if not room_id or not player_obj or player_obj.current_room_id != room_id:
+            continue
+
+        room = world.get_active_room_safe(room_id)
+        if not room:
+            continue
+        monster_data = None
+        with room.lock:
+            for obj in room.objects:
+                if obj.get("uid") == uid:
+                    monster_data = obj
+                    break
+        if not monster_data:
+            continue
+
+        status_effects = monster_data.get("status_effects", [])
+        if "stunned" in status_effects or "sleeping" in status_effects:
+            world.entity_manager.defer_aggro_pair(uid, player_name)
+            continue
+
+        if _player_draws_aggro(monster_data, player_obj):
+            _initiate_combat(world, monster_data, player_obj, room_id)
+            engaged.add(uid)
+            started += 1
+    return started
+
 def _initiate_combat(world: 'World', monster_data: Dict, target_player: 'Player', room_id: str):
     current_time = time.time()
     monster_uid = monster_data.get("uid")
@@ -229,7 +243,8 @@ def _initiate_combat(world: 'World', monster_data: Dict, target_player: 'Player'
         "combat_broadcast"
     )
     
-    target_player.send_message(f"The {monster_name} attacks you!")
+    # Runs outside any command, so deliver straight to the client
+    world.send_message_to_player(target_player.name.lower(), f"The {monster_name} attacks you!", "combat_other")
     
     # Calculate Reaction/Roundtime
     monster_agi = monster_data.get("stats", {}).get("AGI", 50)
@@ -292,117 +307,133 @@ def _check_and_start_npc_combat(world: 'World', npc: Dict, room_id: str):
             
             return 
 
-def process_monster_ai(world: 'World', log_time_prefix: str, broadcast_callback: Callable):
-    potential_movers: List[Tuple[Dict, str]] = []
-
-    with world.index_lock:
-        active_uids = list(world.active_mob_uids)
-        
-    for i, uid in enumerate(active_uids):
-        if i % 50 == 0:
-            world.socketio.sleep(0) # Yield to heartbeat
-            
-        room_id = world.mob_locations.get(uid)
-        if not room_id:
-            world.unregister_mob(uid)
+def _get_rooms_needing_ai(world: 'World') -> List[str]:
+    """
+    Rooms worth simulating this tick: any room with a player in it, plus any
+    room where a mob is already fighting. Every other room is asleep and costs nothing.
+    """
+    room_ids = set(world.entity_manager.get_occupied_room_ids())
+    for combatant_id, state in world.get_all_combat_states():
+        if state.get("state_type") != "combat":
             continue
-            
-        # Check room status
-        with world.index_lock:
-            players_in_room = world.room_players.get(room_id)
+        room_id = world.mob_locations.get(combatant_id)
+        if room_id:
+            room_ids.add(room_id)
+    return list(room_ids)
+
+def _process_monster(world: 'World', uid: str, monster_obj: Dict, room, room_id: str,
+                     players_in_room: Set[str], potential_movers: List[Tuple[Dict, str]],
+                     broadcast_callback: Callable, room_stats: Optional[RoomAggregates] = None):
+    """Runs one AI step for a single monster that is known to be in room_id."""
+    # Hydrate template if missing movement rules (rare but possible on reload)
+    monster_id = monster_obj.get("monster_id")
+    if monster_id and "movement_rules" not in monster_obj:
+         template = world.game_monster_templates.get(monster_id)
+         if template: monster_obj.update(copy.deepcopy(template))
+
+    # --- AI PRIORITY 1: Check Status Effects (Stun/Delimbed/Prone) ---
+    status_effects = monster_obj.get("status_effects", [])
+    
+    if "stunned" in status_effects:
+        # Skip all actions if stunned
+        return
         
-        room = world.get_active_room_safe(room_id)
-        if not room:
-             if players_in_room:
-                 world.get_room(room_id) # Hydrate
-                 room = world.get_active_room_safe(room_id)
-             else:
-                 continue
+    # --- AI PRIORITY 2: Combat & Behavior Tree ---
+    combat_state = world.get_combat_state(uid)
+    in_combat = combat_state and combat_state.get("state_type") == "combat"
+    target_id = combat_state.get("target_id") if in_combat else None
+
+    # [FIX] Validate Target Presence: If target left room, stop combat
+    if in_combat and target_id:
+        target_found = target_id in players_in_room
         
-        if not room: continue
-
-        monster_obj = None
-        with room.lock:
-            for obj in room.objects:
-                if obj.get("uid") == uid:
-                    monster_obj = obj
-                    break
+        # Check mobs (if not found as player)
+        if not target_found:
+            with room.lock:
+                for obj in room.objects:
+                    if obj.get("uid") == target_id:
+                        target_found = True
+                        break
         
-        if not monster_obj:
-            world.unregister_mob(uid)
-            continue
+        if not target_found:
+            world.remove_combat_state(uid)
+            in_combat = False
+            target_id = None
+            # Optional: You could broadcast a message here like "The creature looks confused."
+
+    # 2a. Execute Behavior Script (if any)
+    # We do this even if not in combat to allow for passive behaviors like healing or buffering
+    script_action = _execute_behavior_tree(world, monster_obj, target_id, room_stats)
+    
+    if script_action:
+        _perform_ai_action(world, monster_obj, script_action, target_id, room_id, broadcast_callback, room_stats)
+        # If action taken, skip standard attack/move this tick
+        return
+
+    # 2b. Mob-vs-mob faction check (player aggro is event-driven, see process_aggro_queue)
+    if not in_combat:
+        _check_and_start_npc_combat(world, monster_obj, room_id)
+
+    # --- AI PRIORITY 3: Movement (Wander) ---
+    # Only move if not in combat and not prone/delimbed legs
+    if monster_obj.get("movement_rules") and not in_combat:
+        # Check for leg damage preventing movement
+        if monster_obj.get("delimbed_right_leg") or monster_obj.get("delimbed_left_leg"):
+            pass # Can't wander if legless
+        elif monster_obj.get("posture") == "prone":
+            # Stand up chance?
+            if random.random() < 0.5:
+                monster_obj["posture"] = "standing"
+                broadcast_callback(room_id, f"The {monster_obj.get('name')} struggles to its feet.", "ambient")
+        else:
+            potential_movers.append((monster_obj, room_id))
 
-        # Hydrate template if missing movement rules (rare but possible on reload)
-        monster_id = monster_obj.get("monster_id")
-        if monster_id and "movement_rules" not in monster_obj:
-             template = world.game_monster_templates.get(monster_id)
-             if template: monster_obj.update(copy.deepcopy(template))
+def process_monster_ai(world: 'World', log_time_prefix: str, broadcast_callback: Callable):
+    # Give stunned/sleeping mobs another chance at the players they missed
+    world.entity_manager.requeue_deferred_aggro()
 
-        # --- AI PRIORITY 1: Check Status Effects (Stun/Delimbed/Prone) ---
-        status_effects = monster_obj.get("status_effects", [])
-        
-        if "stunned" in status_effects:
-            # Skip all actions if stunned
+    potential_movers: List[Tuple[Dict, str]] = []
+    processed_uids: Set[str] = set()
+
+    for room_id in _get_rooms_needing_ai(world):
+        mob_uids = world.entity_manager.get_mobs_in_room(room_id)
+        if not mob_uids:
             continue
-            
-        # --- AI PRIORITY 2: Combat & Behavior Tree ---
-        combat_state = world.get_combat_state(uid)
-        in_combat = combat_state and combat_state.get("state_type") == "combat"
-        target_id = combat_state.get("target_id") if in_combat else None
-
-        # [FIX] Validate Target Presence: If target left room, stop combat
-        if in_combat and target_id:
-            target_found = False
-            
-            # Check players
-            if players_in_room:
-                for p_name in players_in_room:
-                    if p_name.lower() == target_id:
-                        target_found = True
-                        break
-            
-            # Check mobs (if not found as player)
-            if not target_found:
-                with room.lock:
-                    for obj in room.objects:
-                        if obj.get("uid") == target_id:
-                            target_found = True
-                            break
-            
-            if not target_found:
-                world.remove_combat_state(uid)
-                in_combat = False
-                target_id = None
-                # Optional: You could broadcast a message here like "The creature looks confused."
-
-        # 2a. Execute Behavior Script (if any)
-        # We do this even if not in combat to allow for passive behaviors like healing or buffering
-        script_action = _execute_behavior_tree(world, monster_obj, target_id, room_id, broadcast_callback)
-        
-        if script_action:
-            _perform_ai_action(world, monster_obj, script_action, target_id, room_id, broadcast_callback)
-            # If action taken, skip standard attack/move this tick
+
+        players_in_room = world.entity_manager.get_players_in_room(room_id)
+
+        room = world.get_active_room_safe(room_id)
+        if not room:
+            world.get_room(room_id) # Hydrate
+            room = world.get_active_room_safe(room_id)
+        if not room:
             continue
 
-        # 2b. Standard Aggro Scan (if not fighting)
-        if not in_combat:
-            started_combat = _scan_for_player_targets(world, monster_obj, room_id)
-            if not started_combat:
-                _check_and_start_npc_combat(world, monster_obj, room_id)
-
-        # --- AI PRIORITY 3: Movement (Wander) ---
-        # Only move if not in combat and not prone/delimbed legs
-        if monster_obj.get("movement_rules") and not in_combat:
-            # Check for leg damage preventing movement
-            if monster_obj.get("delimbed_right_leg") or monster_obj.get("delimbed_left_leg"):
-                pass # Can't wander if legless
-            elif monster_obj.get("posture") == "prone":
-                # Stand up chance?
-                if random.random() < 0.5:
-                    monster_obj["posture"] = "standing"
-                    broadcast_callback(room_id, f"The {monster_obj.get('name')} struggles to its feet.", "ambient")
-            else:
-                potential_movers.append((monster_obj, room_id))
+        # One pass over the room objects resolves the whole roster
+        roster: Dict[str, Dict] = {}
+        room_stats = None
+        with room.lock:
+            for obj in room.objects:
+                obj_uid = obj.get("uid")
+                if obj_uid in mob_uids:
+                    roster[obj_uid] = obj
+            # Shared by every scripted mob here; only built when someone needs it
+            if any(obj.get("ai_script") for obj in roster.values()):
+                room_stats = RoomAggregates(room_id, players_in_room, room.objects)
+
+        for uid in mob_uids:
+            if uid not in roster:
+                world.unregister_mob(uid)
+
+        for uid, monster_obj in roster.items():
+            # A mob that fled into a later room this tick does not act twice
+            if uid in processed_uids:
+                continue
+            processed_uids.add(uid)
+            if len(processed_uids) % 50 == 0:
+                world.socketio.sleep(0) # Yield to heartbeat
+
+            _process_monster(world, uid, monster_obj, room, room_id, players_in_room, potential_movers, broadcast_callback, room_stats)
 
     moved_monster_uids = set()
 
@@ -447,13 +478,11 @@ def process_monster_ai(world: 'World', log_time_prefix: str, broadcast_callback:
                     arr_msg = monster.get("spawn_message_arrival", "A {name} slinks in.").format(name=monster_name)
                     broadcast_callback(destination_room_id, arr_msg, "ambient_move")
                     
-                    # Re-scan for targets in new room immediately
-                    if not _scan_for_player_targets(world, monster, destination_room_id):
-                        _check_and_start_npc_combat(world, monster, destination_room_id)
+                    # Player aggro in the new room was queued by update_mob_location
+                    _check_and_start_npc_combat(world, monster, destination_room_id)
 
 def process_monster_ambient_messages(world: 'World', log_time_prefix: str, broadcast_callback: Callable):
-    with world.index_lock:
-        active_rooms = [rid for rid, players in world.room_players.items() if players]
+    active_rooms = world.entity_manager.get_occupied_room_ids()
     
     for i, room_id in enumerate(active_rooms):
         if i % 20 == 0:
@@ -1,15 +1,18 @@
 # mud_backend/core/game_loop/monster_respawn.py
+import heapq
+import itertools
 import random
+import threading
 import time
 import copy 
 import uuid
-from typing import TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
+    from mud_backend.core.game_objects import Room
 
 from mud_backend import config
-from mud_backend.core import combat_system
 from mud_backend.core import faction_handler
 
 
@@ -33,6 +36,180 @@ def _re_equip_entity_from_template(entity_runtime_data, entity_template, game_eq
          entity_runtime_data["hp"] = entity_template["hp"]
 
 
+class RespawnScheduler:
+    """
+    Min-heap of respawn deadlines over world.defeated_monsters.
+
+    The defeated store stays the source of truth. Heap entries are never
+    removed in place: an entry whose uid is no longer defeated, or whose
+    deadline was pushed back by a newer defeat, is simply dropped when popped.
+    Respawns won for a room that is not loaded are parked in pending_by_room
+    and applied by RoomManager when that room next hydrates.
+    """
+    def __init__(self, world: 'World'):
+        self.world = world
+        self.lock = threading.RLock()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self.pending_by_room: Dict[str, List[str]] = {}
+
+    def schedule(self, runtime_uid: str, eligible_at: float):
+        with self.lock:
+            heapq.heappush(self._heap, (eligible_at, next(self._counter), runtime_uid))
+
+    def pop_due(self, now: float) -> List[str]:
+        """Pops every uid whose deadline has passed (each uid at most once)."""
+        due = []
+        seen = set()
+        with self.lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, runtime_uid = heapq.heappop(self._heap)
+                if runtime_uid not in seen:
+                    seen.add(runtime_uid)
+                    due.append(runtime_uid)
+        return due
+
+    def backlog_size(self) -> int:
+        """Heap entries (including stale ones) plus respawns parked on unloaded rooms."""
+        with self.lock:
+            return len(self._heap) + sum(len(uids) for uids in self.pending_by_room.values())
+
+    def defer_to_room(self, room_id: str, runtime_uid: str):
+        with self.lock:
+            self.pending_by_room.setdefault(room_id, []).append(runtime_uid)
+
+    def materialize_pending(self, room: 'Room'):
+        """Applies respawns recorded while 'room' was unloaded. Called right after hydration."""
+        with self.lock:
+            pending = self.pending_by_room.pop(room.room_id, None)
+        if not pending:
+            return
+
+        spawned_any = False
+        for runtime_uid in pending:
+            respawn_info = self.world.get_defeated_monster(runtime_uid)
+            if not isinstance(respawn_info, dict):
+                continue
+            if _respawn_into_room(self.world, room, runtime_uid, respawn_info):
+                spawned_any = True
+            else:
+                self.schedule(runtime_uid, time.time())
+
+        if spawned_any:
+            self.world.save_room(room)
+
+
+def _respawn_into_room(world: 'World',
+                       active_room: 'Room',
+                       runtime_uid: str,
+                       respawn_info: Dict,
+                       broadcast_callback=None,
+                       send_to_player_callback=None) -> bool:
+    """
+    Places a fresh copy of the defeated entity into active_room.
+    Callbacks are only given when the room is live; a lazily materialized
+    respawn has no audience, so it neither announces itself nor aggroes here
+    (register_mob still queues aggro for whoever walks in).
+    Returns True if the entity was spawned and its defeated record cleared.
+    """
+    current_time_float = time.time()
+    room_id_to_respawn_in = respawn_info["room_id"]
+    entity_type = respawn_info["type"]
+    is_template_unique = respawn_info.get("is_unique", False)
+
+    entity_template_key = respawn_info.get("template_key")
+    if not entity_template_key:
+        entity_template_key = respawn_info.get("monster_id", "unknown")
+
+    with active_room.lock:
+        current_room_objects = active_room.objects
+        
+        base_template_data = None
+        if entity_type == "monster":
+            base_template_data = world.game_monster_templates.get(entity_template_key)
+        elif entity_type == "npc":
+             if entity_template_key:
+                 base_template_data = world.game_monster_templates.get(entity_template_key)
+
+        if not base_template_data:
+            return False
+        
+        entity_display_name = base_template_data.get("name", entity_template_key)
+        
+        if is_template_unique: 
+            id_key_to_check = "monster_id" if entity_type == "monster" else "uid"
+            id_val_to_check = entity_template_key if entity_type == "monster" else runtime_uid
+            
+            if any(obj.get(id_key_to_check) == id_val_to_check for obj in current_room_objects):
+                return False
+        
+        new_entity = copy.deepcopy(base_template_data)
+        
+        if entity_type == "monster":
+            new_monster_uid = uuid.uuid4().hex
+            new_entity["uid"] = new_monster_uid
+            monster_id_to_check = new_monster_uid 
+            
+            # --- LEVEL RANGE LOGIC ---
+            level_range = new_entity.get("level_range")
+            if level_range and isinstance(level_range, list) and len(level_range) == 2:
+                min_lvl, max_lvl = level_range
+                actual_level = random.randint(min_lvl, max_lvl)
+                new_entity["level"] = actual_level
+                # Scale HP: +10% per level above minimum? Or base it on template.
+                # Simple scaling: If template HP is for level X, scale by ratio.
+                base_level = new_entity.get("level", 1) # This is the template default
+                if actual_level > base_level:
+                    ratio = 1.0 + ((actual_level - base_level) * 0.1)
+                    new_entity["max_hp"] = int(new_entity.get("max_hp", 10) * ratio)
+                    new_entity["hp"] = new_entity["max_hp"]
+            # -------------------------
+
+        else: # NPC
+            new_entity["uid"] = runtime_uid 
+            monster_id_to_check = runtime_uid
+            new_entity["hp"] = new_entity.get("max_hp", 50)
+
+        active_room.objects.append(new_entity)
+
+    world.remove_defeated_monster(runtime_uid)
+    world.remove_monster_hp(runtime_uid)
+
+    # Register in Spatial Index
+    world.register_mob(monster_id_to_check, room_id_to_respawn_in)
+
+    if broadcast_callback is None:
+        return True
+
+    broadcast_callback(room_id_to_respawn_in, f"The {entity_display_name} appears.", "ambient_spawn")
+    
+    # --- AGGRO CHECK ---
+    is_aggressive = base_template_data.get("is_aggressive", False)
+    
+    for player_id in world.entity_manager.get_players_in_room(room_id_to_respawn_in):
+        player_obj = world.get_player_obj(player_id)
+        if not player_obj: continue
+        
+        is_kos = faction_handler.is_player_kos_to_entity(player_obj, base_template_data)
+        
+        player_state = world.get_combat_state(player_id)
+        player_in_combat = player_state and player_state.get("state_type") == "combat"
+
+        if (is_aggressive or is_kos) and not player_in_combat:
+            send_to_player_callback(player_obj.name, f"The **{entity_display_name}** notices you and attacks!", "combat_other")
+            
+            world.set_combat_state(monster_id_to_check, {
+                "state_type": "combat",
+                "target_id": player_id,
+                "next_action_time": current_time_float,
+                "current_room_id": room_id_to_respawn_in
+            })
+            world.set_monster_hp(monster_id_to_check, new_entity.get("max_hp", 50))
+            break 
+
+    return True
+
+
 def process_respawns(world: 'World',
                      log_time_prefix, 
                      broadcast_callback,
@@ -41,127 +218,39 @@ def process_respawns(world: 'World',
                      game_equipment_tables_global, 
                      game_items_global             
                      ):
-    
+    """
+    Pops only the respawns whose deadline has passed. Losers of the chance
+    roll (and spawns blocked by a unique copy) go back on the heap for the
+    next tick. Each touched room is saved once at the end of the tick.
+    """
     current_time_float = time.time()
-    all_defeated = world.get_all_defeated_monsters()
-    respawned_entity_runtime_ids_to_remove = []
+    scheduler = world.respawn_scheduler
+    default_chance = getattr(config, "NPC_DEFAULT_RESPAWN_CHANCE", 0.2)
+    rooms_to_save: Dict[str, 'Room'] = {}
     
-    for runtime_uid, respawn_info in all_defeated:
-        entity_template_key = respawn_info.get("template_key")
-        if not entity_template_key:
-                entity_template_key = respawn_info.get("monster_id", "unknown")
-
+    for runtime_uid in scheduler.pop_due(current_time_float):
+        respawn_info = world.get_defeated_monster(runtime_uid)
         if not isinstance(respawn_info, dict):
+            continue # Stale heap entry
+        if respawn_info.get("eligible_at", current_time_float) > current_time_float:
+            continue # Superseded by a later defeat; its own entry is still queued
+
+        respawn_chance = respawn_info.get("chance", default_chance)
+        if random.random() >= respawn_chance:
+            scheduler.schedule(runtime_uid, current_time_float)
             continue
-        
-        eligible_at = respawn_info.get("eligible_at", current_time_float)
-        is_eligible = current_time_float >= eligible_at
-
-        if is_eligible:
-            respawn_chance = respawn_info.get("chance", getattr(config, "NPC_DEFAULT_RESPAWN_CHANCE", 0.2))
-            if random.random() < respawn_chance:
-                room_id_to_respawn_in = respawn_info["room_id"]
-                entity_type = respawn_info["type"]
-                is_template_unique = respawn_info.get("is_unique", False)
-
-                active_room = world.get_active_room_safe(room_id_to_respawn_in)
-                if not active_room:
-                    world.get_room(room_id_to_respawn_in) # Forces hydration
-                    active_room = world.get_active_room_safe(room_id_to_respawn_in)
-                
-                if not active_room:
-                    continue
-                
-                with active_room.lock:
-                    current_room_objects = active_room.objects
-                    
-                    base_template_data = None
-                    if entity_type == "monster":
-                        base_template_data = world.game_monster_templates.get(entity_template_key)
-                    elif entity_type == "npc":
-                         if entity_template_key:
-                             base_template_data = world.game_monster_templates.get(entity_template_key)
-
-                    if not base_template_data:
-                        continue
-                    
-                    entity_display_name = base_template_data.get("name", entity_template_key)
-                    
-                    can_respawn_this_template_into_room = True
-                    if is_template_unique: 
-                        id_key_to_check = "monster_id" if entity_type == "monster" else "uid"
-                        id_val_to_check = entity_template_key if entity_type == "monster" else runtime_uid
-                        
-                        if any(obj.get(id_key_to_check) == id_val_to_check for obj in current_room_objects):
-                            can_respawn_this_template_into_room = False
-                    
-                    if can_respawn_this_template_into_room:
-                        new_entity = copy.deepcopy(base_template_data)
-                        
-                        if entity_type == "monster":
-                            new_monster_uid = uuid.uuid4().hex
-                            new_entity["uid"] = new_monster_uid
-                            monster_id_to_check = new_monster_uid 
-                            
-                            # --- LEVEL RANGE LOGIC ---
-                            level_range = new_entity.get("level_range")
-                            if level_range and isinstance(level_range, list) and len(level_range) == 2:
-                                min_lvl, max_lvl = level_range
-                                actual_level = random.randint(min_lvl, max_lvl)
-                                new_entity["level"] = actual_level
-                                # Scale HP: +10% per level above minimum? Or base it on template.
-                                # Simple scaling: If template HP is for level X, scale by ratio.
-                                base_level = new_entity.get("level", 1) # This is the template default
-                                if actual_level > base_level:
-                                    ratio = 1.0 + ((actual_level - base_level) * 0.1)
-                                    new_entity["max_hp"] = int(new_entity.get("max_hp", 10) * ratio)
-                                    new_entity["hp"] = new_entity["max_hp"]
-                            # -------------------------
-
-                        else: # NPC
-                            new_entity["uid"] = runtime_uid 
-                            monster_id_to_check = runtime_uid
-                            new_entity["hp"] = new_entity.get("max_hp", 50)
-
-                        active_room.objects.append(new_entity)
-
-                        # Register in Spatial Index
-                        world.register_mob(monster_id_to_check, room_id_to_respawn_in)
-                        
-                        broadcast_callback(room_id_to_respawn_in, f"The {entity_display_name} appears.", "ambient_spawn")
-                        world.remove_monster_hp(runtime_uid)
-                        
-                        # --- AGGRO CHECK ---
-                        is_aggressive = base_template_data.get("is_aggressive", False)
-                        players_in_world = world.get_all_players_info()
-                        
-                        for p_name, p_data in players_in_world:
-                            if p_data.get("current_room_id") == room_id_to_respawn_in:
-                                player_obj = p_data.get("player_obj")
-                                if not player_obj: continue
-                                player_id = player_obj.name.lower()
-                                
-                                is_kos = faction_handler.is_player_kos_to_entity(player_obj, base_template_data)
-                                
-                                player_state = world.get_combat_state(player_id)
-                                player_in_combat = player_state and player_state.get("state_type") == "combat"
-
-                                if (is_aggressive or is_kos) and not player_in_combat:
-                                    send_to_player_callback(player_obj.name, f"The **{entity_display_name}** notices you and attacks!", "combat_other")
-                                    monster_rt = combat_system.calculate_roundtime(base_template_data.get("stats", {}).get("AGI", 50))
-                                    
-                                    world.set_combat_state(monster_id_to_check, {
-                                        "state_type": "combat",
-                                        "target_id": player_id,
-                                        "next_action_time": current_time_float,
-                                        "current_room_id": room_id_to_respawn_in
-                                    })
-                                    world.set_monster_hp(monster_id_to_check, new_entity.get("max_hp", 50))
-                                    break 
-
-                        respawned_entity_runtime_ids_to_remove.append(runtime_uid)
-                
-                world.save_room(active_room)
-                
-    for runtime_uid_to_remove in respawned_entity_runtime_ids_to_remove:
-        world.remove_defeated_monster(runtime_uid_to_remove)
\ No newline at end of file
+
+        room_id_to_respawn_in = respawn_info["room_id"]
+        active_room = world.get_active_room_safe(room_id_to_respawn_in)
+        if not active_room:
+            # Nobody can be in an unloaded room; apply it when the room hydrates
+            scheduler.defer_to_room(room_id_to_respawn_in, runtime_uid)
+            continue
+
+        if _respawn_into_room(world, active_room, runtime_uid, respawn_info, broadcast_callback, send_to_player_callback):
+            rooms_to_save[room_id_to_respawn_in] = active_room
+        else:
+            scheduler.schedule(runtime_uid, current_time_float)
+
+    for active_room in rooms_to_save.values():
+        world.save_room(active_room)
@@ -0,0 +1,246 @@
+# mud_backend/core/game_loop/profiler.py
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from mud_backend import config
+from mud_backend.core.log import get_logger
+
+logger = get_logger("profiler")
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0)
+
+_NS_PER_MS = 1_000_000
+
+
+class PhaseStats:
+    """Rolling window of durations for one phase, plus lifetime totals."""
+    __slots__ = ("name", "window", "count", "total_ns", "max_ns")
+
+    def __init__(self, name: str, window_size: int):
+        self.name = name
+        self.window: Deque[int] = deque(maxlen=window_size)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int):
+        self.window.append(duration_ns)
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self.window)
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for duration_ns in samples:
+            duration_ms = duration_ns / _NS_PER_MS
+            for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+                if duration_ms <= bound:
+                    buckets[index] += 1
+                    break
+            else:
+                buckets[-1] += 1
+
+        def pct(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))] / _NS_PER_MS, 3)
+
+        return {
+            "count": self.count,
+            "window": len(samples),
+            "mean_ms": round(sum(samples) / len(samples) / _NS_PER_MS, 3) if samples else 0.0,
+            "p50_ms": pct(0.50),
+            "p90_ms": pct(0.90),
+            "p99_ms": pct(0.99),
+            "window_max_ms": round(samples[-1] / _NS_PER_MS, 3) if samples else 0.0,
+            "max_ms": round(self.max_ns / _NS_PER_MS, 3),
+            "histogram": buckets,
+        }
+
+
+class _PhaseTimer:
+    """Reusable context manager; one per phase name, so timing allocates nothing."""
+    __slots__ = ("profiler", "name", "started_ns")
+
+    def __init__(self, profiler: 'TickProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started_ns = 0
+
+    def __enter__(self):
+        self.started_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.started_ns)
+        return False
+
+
+class TickProfiler:
+    """
+    Per-phase timers for the game loop.
+
+    game_loop_iteration() brackets each pass with begin_iteration() /
+    end_iteration() and each phase with `with profiler.phase("combat"):`.
+    The global tick's own phases are recorded as "tick.<name>".
+
+    A pass over config.TICK_PROFILER_SLOW_MS goes to the slow-tick log with
+    its per-phase breakdown. While a pass is running, a sampler thread
+    (config.TICK_PROFILER_SAMPLE_INTERVAL_MS) grabs the loop thread's stack
+    once the pass is already past config.TICK_PROFILER_SAMPLE_AFTER_MS, so a
+    slow entry also says *where* the time went. Fast passes are never sampled.
+    """
+    def __init__(self, window_size: Optional[int] = None, slow_ms: Optional[float] = None):
+        self.window_size = window_size or config.TICK_PROFILER_WINDOW
+        self.slow_ns = int((slow_ms if slow_ms is not None else config.TICK_PROFILER_SLOW_MS) * _NS_PER_MS)
+        self.enabled = config.TICK_PROFILER_ENABLED
+        self.lock = threading.RLock()
+        self.phases: Dict[str, PhaseStats] = {}
+        self._timers: Dict[str, _PhaseTimer] = {}
+        self.slow_ticks: Deque[Dict[str, Any]] = deque(maxlen=config.TICK_PROFILER_SLOW_LOG_SIZE)
+
+        # Current pass (only touched from the loop thread, read by the sampler)
+        self._iteration_started_ns = 0
+        self._iteration_phases: Dict[str, int] = {}
+        self._samples: Counter = Counter()
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+
+    # --- Timing ---
+
+    def phase(self, name: str) -> _PhaseTimer:
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = _PhaseTimer(self, name)
+            self._timers[name] = timer
+        return timer
+
+    def record(self, name: str, duration_ns: int):
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = PhaseStats(name, self.window_size)
+                self.phases[name] = stats
+            stats.record(duration_ns)
+        if self._iteration_started_ns:
+            self._iteration_phases[name] = self._iteration_phases.get(name, 0) + duration_ns
+
+    def begin_iteration(self):
+        if not self.enabled:
+            return
+        if self._loop_thread_id is None:
+            self._loop_thread_id = threading.get_ident()
+            self._start_sampler()
+        self._iteration_phases = {}
+        self._samples = Counter()
+        self._iteration_started_ns = time.perf_counter_ns()
+
+    def end_iteration(self):
+        if not self.enabled or not self._iteration_started_ns:
+            return
+        total_ns = time.perf_counter_ns() - self._iteration_started_ns
+        self._iteration_started_ns = 0
+        self.record("iteration", total_ns)
+        if total_ns >= self.slow_ns:
+            self._log_slow_tick(total_ns)
+
+    # --- Slow ticks ---
+
+    def _log_slow_tick(self, total_ns: int):
+        phases_ms = {
+            name: round(duration_ns / _NS_PER_MS, 3)
+            for name, duration_ns in sorted(self._iteration_phases.items(), key=lambda kv: -kv[1])
+        }
+        stacks = [
+            {"count": count, "stack": list(stack)}
+            for stack, count in self._samples.most_common(config.TICK_PROFILER_SLOW_STACKS)
+        ]
+        entry = {
+            "at": time.time(),
+            "total_ms": round(total_ns / _NS_PER_MS, 3),
+            "phases_ms": phases_ms,
+            "samples": sum(self._samples.values()),
+            "stacks": stacks,
+        }
+        with self.lock:
+            self.slow_ticks.append(entry)
+
+        worst = next(iter(phases_ms.items()), ("?", 0.0))
+        logger.warning(
+            "Slow tick: %.1fms (worst phase: %s %.1fms)", entry["total_ms"], worst[0], worst[1],
+            extra={"fields": {"total_ms": entry["total_ms"], "phases_ms": phases_ms}}
+        )
+        if stacks:
+            logger.info("  hottest sampled frame: %s", stacks[0]["stack"][-1])
+
+    def _start_sampler(self):
+        interval_ms = config.TICK_PROFILER_SAMPLE_INTERVAL_MS
+        if interval_ms <= 0 or self._sampler is not None:
+            return
+        self._sampler = threading.Thread(
+            target=self._sample_loop, args=(interval_ms / 1000.0,), name="tick-profiler-sampler", daemon=True
+        )
+        self._sampler.start()
+
+    def _sample_loop(self, interval_s: float):
+        # A real OS thread (app.py does not patch threading), so it can look
+        # at the loop thread's frame even while the loop is hogging the hub.
+        after_ns = int(config.TICK_PROFILER_SAMPLE_AFTER_MS * _NS_PER_MS)
+        wake = threading.Event()
+        while True:
+            wake.wait(interval_s)
+            started_ns = self._iteration_started_ns
+            if not self.enabled or not started_ns:
+                continue
+            if time.perf_counter_ns() - started_ns < after_ns:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = tuple(
+                f"{summary.filename.rsplit('mud_backend', 1)[-1]}:{summary.lineno} {summary.name}"
+                for summary in traceback.extract_stack(frame, limit=config.TICK_PROFILER_STACK_DEPTH)
+            )
+            # The pass may have ended while we were walking the stack
+            if self._iteration_started_ns == started_ns:
+                self._samples[stack] += 1
+
+    # --- Reporting ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            phases = {name: stats.snapshot() for name, stats in self.phases.items()}
+            slow_ticks = list(self.slow_ticks)
+        return {
+            "enabled": self.enabled,
+            "budget_ms": self.slow_ns / _NS_PER_MS,
+            "histogram_bounds_ms": list(HISTOGRAM_BOUNDS_MS),
+            "phases": phases,
+            "slow_ticks": slow_ticks,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.phases.clear()
+            self.slow_ticks.clear()
+
+    def format_table(self) -> List[str]:
+        """Text rows for the TICKPROF admin verb."""
+        snapshot = self.snapshot()
+        rows = [f"{'Phase':<22}{'count':>8}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)"]
+        ordered = sorted(snapshot["phases"].items(), key=lambda kv: (kv[0] != "iteration", kv[0]))
+        for name, stats in ordered:
+            rows.append(
+                f"{name:<22}{stats['count']:>8}{stats['mean_ms']:>9.2f}{stats['p50_ms']:>9.2f}"
+                f"{stats['p90_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}"
+            )
+        return rows
@@ -0,0 +1,37 @@
+# mud_backend/core/game_loop/vitals.py
+import threading
+from typing import List, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mud_backend.core.game_state import World
+
+
+class VitalsScheduler:
+    """
+    The players the global tick's vitals pulse has work for.
+
+    A player is scheduled when something takes them off steady state (a vital
+    drops below max, a max stat changes, exp lands in the field pool, a bandage
+    goes on, login). The pulse drops them again once Player.needs_vitals_pulse
+    is False, so full-health idle players cost nothing per tick.
+    """
+    def __init__(self, world: 'World'):
+        self.world = world
+        self.lock = threading.RLock()
+        self._scheduled: Set[str] = set()
+
+    def schedule(self, player_name_lower: str):
+        with self.lock:
+            self._scheduled.add(player_name_lower)
+
+    def unschedule(self, player_name_lower: str):
+        with self.lock:
+            self._scheduled.discard(player_name_lower)
+
+    def scheduled(self) -> List[str]:
+        """Snapshot, so players can be (un)scheduled while the pulse runs."""
+        with self.lock:
+            return list(self._scheduled)
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
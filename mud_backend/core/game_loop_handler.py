@@ -11,8 +11,11 @@ from mud_backend.core.game_objects import Player
 from mud_backend.core.game_loop import environment
 from mud_backend.core.game_loop import monster_respawn
 from mud_backend.core import loot_system
+from mud_backend.core.log import get_logger
 from mud_backend import config
 
+logger = get_logger("tick")
+
 def _get_absorption_room_type(room_id: str) -> str:
     """Determines the room type for experience absorption."""
     if room_id in getattr(config, 'NODE_ROOM_IDS', []):
@@ -51,64 +54,59 @@ def _prune_active_players(world: 'World', log_prefix: str, broadcast_callback: C
                 room_id = player_info.get("current_room_id", "unknown")
                 disappears_message = f'<span class="keyword" data-name="{player_name}" data-verbs="look">{player_name}</span> disappears.'
                 broadcast_callback(room_id, disappears_message, "ambient")
-                print(f"{log_prefix}: Pruned stale player {player_name} from room {room_id}.")
+                logger.info("%s: Pruned stale player %s from room %s.", log_prefix, player_name, room_id)
 
 def _process_player_vitals(world: 'World', log_prefix: str, send_to_player_callback: Callable, send_vitals_callback: Callable):
-    if config.DEBUG_MODE:
-        print(f"{log_prefix}: Processing player vitals...")
-
-    active_players_list = world.get_all_players_info()
-
-    for player_name, data in active_players_list:
-        player_obj = data.get("player_obj")
+    """
+    Runs only for players on world.vitals_scheduler (see VitalsScheduler) and
+    sends each of them just the vitals fields that changed.
+    """
+    scheduler = world.vitals_scheduler
+    logger.debug("%s: Processing vitals for %d players...", log_prefix, len(scheduler))
+
+    for player_name in scheduler.scheduled():
+        player_obj = world.get_player_obj(player_name)
         if not player_obj:
+            scheduler.unschedule(player_name)
             continue
 
-        vitals_changed = False
-
         # 1. Regenerate Stats
-        hp_regen_amount = player_obj.hp_regeneration
-        if player_obj.hp < player_obj.max_hp and hp_regen_amount > 0:
-            player_obj.hp = min(player_obj.max_hp, player_obj.hp + hp_regen_amount)
-            vitals_changed = True
-
-        mana_regen_amount = player_obj.mana_regeneration_per_pulse
-        if player_obj.mana < player_obj.max_mana and mana_regen_amount > 0:
-            player_obj.mana = min(player_obj.max_mana, player_obj.mana + mana_regen_amount)
-            vitals_changed = True
-
-        stamina_regen_amount = player_obj.stamina_regen_per_pulse
-        if player_obj.stamina < player_obj.max_stamina and stamina_regen_amount > 0:
-            player_obj.stamina = min(player_obj.max_stamina, player_obj.stamina + stamina_regen_amount)
-            vitals_changed = True
-
-        spirit_regen_amount = player_obj.spirit_regeneration_per_pulse
-        if player_obj.spirit < player_obj.max_spirit and spirit_regen_amount > 0:
-            player_obj.spirit = min(player_obj.max_spirit, player_obj.spirit + spirit_regen_amount)
-            vitals_changed = True
-
-        # 2. Process Wounds & Bandages (FIX: Always run this!)
-        # Previous logic only ran this via get_vitals() which only ran if vitals_changed was True.
-        # Now we run it explicitly to check for healing/scaring.
+        if player_obj.hp < player_obj.max_hp:
+            hp_regen_amount = player_obj.hp_regeneration
+            if hp_regen_amount > 0:
+                player_obj.hp = min(player_obj.max_hp, player_obj.hp + hp_regen_amount)
+
+        if player_obj.mana < player_obj.max_mana:
+            mana_regen_amount = player_obj.mana_regeneration_per_pulse
+            if mana_regen_amount > 0:
+                player_obj.mana = min(player_obj.max_mana, player_obj.mana + mana_regen_amount)
+
+        if player_obj.stamina < player_obj.max_stamina:
+            stamina_regen_amount = player_obj.stamina_regen_per_pulse
+            if stamina_regen_amount > 0:
+                player_obj.stamina = min(player_obj.max_stamina, player_obj.stamina + stamina_regen_amount)
+
+        if player_obj.spirit < player_obj.max_spirit:
+            spirit_regen_amount = player_obj.spirit_regeneration_per_pulse
+            if spirit_regen_amount > 0:
+                player_obj.spirit = min(player_obj.max_spirit, player_obj.spirit + spirit_regen_amount)
+
+        # 2. Process Wounds & Bandages (healing / scarring / troll regen)
         player_obj._process_wounds()
 
-        # If wounds healed, the player object will be marked dirty.
-        if player_obj._is_dirty:
-            vitals_changed = True
-
         # 3. Absorb Exp
         room_type = _get_absorption_room_type(player_obj.current_room_id)
         absorption_msg = player_obj.absorb_exp_pulse(room_type)
         if absorption_msg:
-            vitals_changed = True
             send_to_player_callback(player_obj.name, absorption_msg, "message")
 
-        # 4. Send Update if needed
-        if vitals_changed:
-            vitals_data = player_obj.get_vitals()
-            send_vitals_callback(player_obj.name, vitals_data)
-            # Reset dirty flag after sending to avoid spamming next tick if nothing else changed
-            player_obj._is_dirty = False
+        # 4. Send only what changed
+        vitals_delta = player_obj.get_vitals_delta()
+        if vitals_delta:
+            send_vitals_callback(player_obj.name, vitals_delta)
+
+        if not player_obj.needs_vitals_pulse:
+            scheduler.unschedule(player_name)
 
 def check_and_run_game_tick(world: 'World', broadcast_callback: Callable, send_to_player_callback: Callable, send_vitals_callback: Callable) -> bool:
     current_time = time.time()
@@ -118,10 +116,12 @@ def check_and_run_game_tick(world: 'World', broadcast_callback: Callable, send_t
 
     world.last_game_tick_time = current_time
     world.game_tick_counter += 1
+    profiler = world.tick_profiler
 
     # --- Auction Tick ---
     if world.game_tick_counter % 2 == 0:
-        world.auction_manager.tick()
+        with profiler.phase("tick.auctions"):
+            world.auction_manager.tick()
 
     # --- NEW: Treasure Pressure Decay ---
     # Decay pressure slightly every tick to simulate recovery over time
@@ -139,44 +139,48 @@ def check_and_run_game_tick(world: 'World', broadcast_callback: Callable, send_t
 
     log_time = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
     log_prefix = f"{log_time} - GAME_TICK ({world.game_tick_counter})"
-    if config.DEBUG_MODE:
-        print(f"{log_prefix}: Running global tick...")
-
-    _prune_active_players(world, log_prefix, broadcast_callback)
-
-    environment.update_environment_state(
-        world=world,
-        game_tick_counter=world.game_tick_counter,
-        active_players_dict=temp_active_players,
-        log_time_prefix=log_prefix,
-        broadcast_callback=broadcast_callback
-    )
-
-    environment.process_room_periodic_events(world)
-
-    monster_respawn.process_respawns(
-        world=world,
-        log_time_prefix=log_prefix,
-        broadcast_callback=broadcast_callback,
-        send_to_player_callback=send_to_player_callback,
-        game_npcs_dict={},
-        game_equipment_tables_global={},
-        game_items_global=world.game_items
-    )
-
-    decay_messages_by_room = loot_system.process_corpse_decay(world)
-    for room_id, messages in decay_messages_by_room.items():
-        for msg in messages:
-            broadcast_callback(room_id, msg, "ambient_decay")
-
-    _process_player_vitals(
-        world=world,
-        log_prefix=log_prefix,
-        send_to_player_callback=send_to_player_callback,
-        send_vitals_callback=send_vitals_callback
-    )
-
-    if config.DEBUG_MODE:
-        print(f"{log_prefix}: Global tick complete.")
+    logger.debug("%s: Running global tick...", log_prefix)
+
+    with profiler.phase("tick.prune"):
+        _prune_active_players(world, log_prefix, broadcast_callback)
+
+    with profiler.phase("tick.environment"):
+        environment.update_environment_state(
+            world=world,
+            game_tick_counter=world.game_tick_counter,
+            active_players_dict=temp_active_players,
+            log_time_prefix=log_prefix,
+            broadcast_callback=broadcast_callback
+        )
+
+    with profiler.phase("tick.periodic_events"):
+        environment.process_room_periodic_events(world)
+
+    with profiler.phase("tick.respawns"):
+        monster_respawn.process_respawns(
+            world=world,
+            log_time_prefix=log_prefix,
+            broadcast_callback=broadcast_callback,
+            send_to_player_callback=send_to_player_callback,
+            game_npcs_dict={},
+            game_equipment_tables_global={},
+            game_items_global=world.game_items
+        )
+
+    with profiler.phase("tick.corpse_decay"):
+        decay_messages_by_room = loot_system.process_corpse_decay(world)
+        for room_id, messages in decay_messages_by_room.items():
+            for msg in messages:
+                broadcast_callback(room_id, msg, "ambient_decay")
+
+    with profiler.phase("tick.vitals"):
+        _process_player_vitals(
+            world=world,
+            log_prefix=log_prefix,
+            send_to_player_callback=send_to_player_callback,
+            send_vitals_callback=send_vitals_callback
+        )
+
+    logger.debug("%s: Global tick complete.", log_prefix)
 
     return True
\ No newline at end of file
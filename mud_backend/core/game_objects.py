@@ -7,18 +7,104 @@ import threading
 from mud_backend import config
 from mud_backend.core.utils import calculate_skill_bonus, get_stat_bonus
 from mud_backend.core.entities import GameEntity
+from mud_backend.core.tracked import TrackedDict, TrackedList, TrackedField
+from mud_backend.core.player_state import PlayerFlags, PlayerProfile, ProfileField, PROFILE_FIELDS
+from mud_backend.core.player_state import pack_message_history, unpack_message_history
+from mud_backend.core.player_state import OrderedSet, VisitedRooms
 from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
 
+# Derived stat -> the tracked Player fields it is computed from
+DERIVED_STAT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "race_data": ("appearance",),
+    "stat_modifiers": ("appearance",),
+    "max_hp": ("stats", "skills", "appearance", "buffs"),
+    "max_mana": ("stats", "skills", "appearance", "buffs"),
+    "max_stamina": ("stats", "skills", "appearance", "buffs"),
+    "max_spirit": ("stats", "skills", "appearance", "buffs"),
+    "max_carry_weight": ("stats", "appearance"),
+    "current_encumbrance": ("inventory", "worn_items"),
+    "worn_items_display": ("worn_items",),
+}
+
+# Derived stats whose change can leave a full player below max (needs a regen pulse)
+_MAX_VITAL_STATS = ("max_hp", "max_mana", "max_stamina", "max_spirit")
+
+# get_vitals() fields that alias live Player containers; snapshotted by value
+_LIVE_VITALS_FIELDS = ("wounds", "scars", "bandages", "status_effects")
+
+# Tracked field -> the derived stats to drop when it changes
+_DERIVED_STAT_DEPENDENTS: Dict[str, Tuple[str, ...]] = {}
+for _stat, _fields in DERIVED_STAT_DEPENDENCIES.items():
+    for _field in _fields:
+        _DERIVED_STAT_DEPENDENTS[_field] = _DERIVED_STAT_DEPENDENTS.get(_field, ()) + (_stat,)
+
+
+def derived_stat(func):
+    """Read-only property cached in Player._derived until one of its dependencies changes."""
+    key = func.__name__
+
+    def getter(self):
+        derived = self._derived
+        if key in derived:
+            return derived[key]
+        value = func(self)
+        derived[key] = value
+        return value
+
+    getter.__name__ = key
+    getter.__doc__ = func.__doc__
+    return property(getter)
+
 class Player(GameEntity):
+    # Hot core: touched every tick, kept in slots. Everything else
+    # (progression, quests, bookkeeping) stays in the instance dict,
+    # and the cold profile is only built when first used.
+    __slots__ = (
+        "world", "lock", "current_room_id",
+        "_hp", "_mana", "_stamina", "_spirit",
+        "posture", "stance", "status_effects", "next_action_time", "roundtime",
+        "_flags", "command_queue", "aliases", "_is_dirty", "_derived", "faction_cache",
+        "_stats", "_skills", "_buffs", "_inventory", "_worn_items",
+        "_profile", "_profile_doc",
+        "messages", "message_history", "_history_dirty", "_history_saved_at",
+        "_sent_vitals", "_sent_map", "_sent_map_sid",
+    )
+
+    # Mutating (or reassigning) any of these drops the derived stats that depend on them
+    stats = TrackedField("stats", TrackedDict)
+    skills = TrackedField("skills", TrackedDict)
+    buffs = TrackedField("buffs", TrackedDict)
+    inventory = TrackedField("inventory", TrackedList)
+    worn_items = TrackedField("worn_items", TrackedDict)
+
+    # Cold profile (see player_state.PlayerProfile)
+    appearance = ProfileField()
+    deities = ProfileField()
+    guilds = ProfileField()
+    locker = ProfileField()
+    friends = ProfileField()
+    ignored = ProfileField()
+
     def __init__(self, world: 'World', name: str, current_room_id: str, db_data: Optional[dict] = None):
         uid = db_data.get("_id") if db_data else None
         if not uid:
             uid = uuid.uuid4().hex
         super().__init__(uid=str(uid), name=name, data=db_data)
         
+        self._derived: Dict[str, Any] = {}
+        # Last vitals sent to the client; update_vitals pulses send only the fields that differ
+        self._sent_vitals: Dict[str, Any] = {}
+        # Map entries last sent, and to which client; see room_handler.get_map_update
+        self._sent_map: Dict[str, Dict[str, Any]] = {}
+        self._sent_map_sid: Optional[str] = None
+        # Only the cold slice of the DB document is kept until the profile is built
+        self._profile: Optional[PlayerProfile] = None
+        self._profile_doc: Optional[Dict[str, Any]] = {
+            field: self.data[field] for field in PROFILE_FIELDS if field in self.data
+        }
         self.is_player = True
         self.world = world 
         self.lock = threading.RLock()
@@ -31,15 +117,16 @@ class Player(GameEntity):
             self.is_admin = True
         
         self.messages = [] 
-        
-        self.aliases = self.data.get("aliases", {})
-        self.message_history = self.data.get("message_history", [])
-        self.friends = self.data.get("friends", [])
-        self.ignored = self.data.get("ignored", [])
+        # Ring buffer; written to the DB on logout or every MESSAGE_HISTORY_SAVE_INTERVAL_SECONDS
+        self.message_history = unpack_message_history(self.data.get("message_history"))
+        self._history_dirty = False
+        self._history_saved_at = time.time()
 
         self._is_dirty = False
         self._last_save_time = time.time()
         self.command_queue: List[str] = [] 
+        # Read by execute_command on every line, so kept off the cold profile
+        self.aliases: Dict[str, str] = self.data.get("aliases", {})
 
         self.experience: int = self.data.get("experience", 0)
         self.unabsorbed_exp: int = self.data.get("unabsorbed_exp", 0)
@@ -56,7 +143,6 @@ class Player(GameEntity):
         
         self.game_state = self.data.get("game_state", "playing")
         self.chargen_step = self.data.get("chargen_step", 0)
-        self.appearance = self.data.get("appearance", {})
         self.skills = self.data.get("skills", {})
         self.skill_learning_progress = self.data.get("skill_learning_progress", {})
         
@@ -99,19 +185,20 @@ class Player(GameEntity):
         self.stamina_burst_pulses = self.data.get("stamina_burst_pulses", 0) 
         self.prepared_spell = self.data.get("prepared_spell", None)
         self.buffs = self.data.get("buffs", {})
-        self.known_spells = self.data.get("known_spells", [])
-        self.known_maneuvers = self.data.get("known_maneuvers", [])
-        self.completed_quests = self.data.get("completed_quests", [])
+        self.known_spells = OrderedSet(self.data.get("known_spells", []))
+        self.known_maneuvers = OrderedSet(self.data.get("known_maneuvers", []))
+        self.completed_quests = OrderedSet(self.data.get("completed_quests", []))
         self.factions = self.data.get("factions", {})
-        self.deities = self.data.get("deities", []) 
-        self.guilds = self.data.get("guilds", [])   
-        self.flags = self.data.get("flags", {})
+        # faction_id -> (effective_value, con_level); see faction_handler
+        self.faction_cache: Dict[str, Tuple[int, str]] = {}
+        self._flags = PlayerFlags(self.data.get("flags", {}))
         self.quest_counters = self.data.get("quest_counters", {})
         
         if self.data.get("quest_trip_counter"):
             self.quest_counters["trip_training_attempts"] = self.data.get("quest_trip_counter")
 
-        self.visited_rooms = self.data.get("visited_rooms", [])
+        room_index = world.assets.room_index if world is not None else None
+        self.visited_rooms = VisitedRooms(room_index, self.data.get("visited_rooms"))
         self.is_goto_active = self.data.get("is_goto_active", False)
         self.goto_id = None 
         self.group_id = self.data.get("group_id", None) 
@@ -121,29 +208,74 @@ class Player(GameEntity):
         # --- STALKING ---
         self.stalking_target_uid = self.data.get("stalking_target_uid", None)
         
-        self.locker = self.data.get("locker", {
-            "capacity": 50,
-            "items": [],
-            "rent_due": 0
-        })
-        
         self.temp_leave_message = None
         self.level_xp_target = self._get_xp_target_for_level(self.level)
         
         # Transient list for investigating hidden players
         self.detected_hiders: List[str] = []
 
+        # The DB document is not retained; 'data' is now only a scratch
+        # space for transient keys (e.g. _pending_training).
+        self.data = {}
+
+    @property
+    def profile(self) -> PlayerProfile:
+        if self._profile is None:
+            self._profile = PlayerProfile(self, self._profile_doc or {})
+            self._profile_doc = None
+        return self._profile
+
+    @property
+    def flags(self) -> PlayerFlags:
+        return self._flags
+
+    @flags.setter
+    def flags(self, value):
+        self._flags = value if isinstance(value, PlayerFlags) else PlayerFlags(value)
+
     def mark_dirty(self):
         self._is_dirty = True
 
+    def invalidate_derived(self, dependency: str):
+        """Drops cached derived stats computed from 'dependency' (a TrackedField name)."""
+        derived = self._derived
+        if not derived:
+            return
+        max_changed = False
+        for key in _DERIVED_STAT_DEPENDENTS.get(dependency, ()):
+            if derived.pop(key, None) is not None and key in _MAX_VITAL_STATS:
+                max_changed = True
+        if max_changed:
+            self.schedule_vitals()
+
+    def schedule_vitals(self):
+        """Puts this player on the global tick's vitals pulse (regen, wound healing, exp absorption)."""
+        self.world.vitals_scheduler.schedule(self.name.lower())
+
+    @property
+    def needs_vitals_pulse(self) -> bool:
+        if self.unabsorbed_exp > 0 or self.bandages:
+            return True
+        if self.wounds and self.race == "Troll":
+            return True
+        return (self._hp < self.max_hp or self._mana < self.max_mana
+                or self._stamina < self.max_stamina or self._spirit < self.max_spirit)
+
+    def invalidate_faction_cache(self):
+        """Call after anything feeding effective faction changes (race, deities, guilds)."""
+        self.faction_cache.clear()
+
     @property
     def is_hidden(self) -> bool:
         return self.flags.get("hidden", False)
 
     @is_hidden.setter
     def is_hidden(self, value: bool):
+        was_hidden = self.flags.get("hidden", False)
         self.flags["hidden"] = value
         self.mark_dirty()
+        if was_hidden and not value:
+            self.world.entity_manager.queue_aggro_for_player(self.name, self.current_room_id)
 
     def is_ignoring(self, other_name: str) -> bool:
         return other_name.lower() in self.ignored
@@ -153,13 +285,16 @@ class Player(GameEntity):
 
     @property
     def race(self) -> str: 
+        if self._profile is None:
+            # Don't build the whole profile just to look up the race
+            return (self._profile_doc or {}).get("appearance", {}).get("race", "Human")
         return self.appearance.get("race", "Human")
 
-    @property
+    @derived_stat
     def race_data(self) -> dict:
         return self.world.game_races.get(self.race, self.world.game_races.get("Human", {}))
 
-    @property
+    @derived_stat
     def stat_modifiers(self) -> dict:
         return self.race_data.get("stat_modifiers", {})
 
@@ -171,14 +306,14 @@ class Player(GameEntity):
     def base_hp(self) -> int: 
         return math.trunc((self.stats.get("STR", 0) + self.stats.get("CON", 0)) / 10)
 
-    @property
+    @derived_stat
     def max_hp(self) -> int:
         base_hp_val = self.base_hp
         pf_ranks = self.skills.get("physical_fitness", 0)
         hp_gain_rate = self.race_data.get("hp_gain_per_pf_rank", 6)
         return base_hp_val + (pf_ranks * hp_gain_rate)
 
-    @property
+    @derived_stat
     def max_mana(self) -> int:
         int_b = get_stat_bonus(self.stats.get("INT", 50), "INT", self.stat_modifiers)
         log_b = get_stat_bonus(self.stats.get("LOG", 50), "LOG", self.stat_modifiers)
@@ -193,7 +328,7 @@ class Player(GameEntity):
         mc_avg = math.trunc(mc_bonus / 3)
         return int_b + stat_avg + hp_avg + mc_avg
 
-    @property
+    @derived_stat
     def max_stamina(self) -> int:
         con_b = get_stat_bonus(self.stats.get("CON", 50), "CON", self.stat_modifiers)
         str_b = get_stat_bonus(self.stats.get("STR", 50), "STR", self.stat_modifiers)
@@ -205,7 +340,7 @@ class Player(GameEntity):
         pf_avg = math.trunc(pf_bonus / 3)
         return con_b + stat_avg + pf_avg
 
-    @property
+    @derived_stat
     def max_spirit(self) -> int:
         ess_b = get_stat_bonus(self.stats.get("ESS", 50), "ESS", self.stat_modifiers)
         zea_b = get_stat_bonus(self.stats.get("ZEA", 50), "ZEA", self.stat_modifiers)
@@ -229,14 +364,14 @@ class Player(GameEntity):
         }
         return RACE_WEIGHTS.get(self.race, 180)
 
-    @property
+    @derived_stat
     def max_carry_weight(self) -> float:
         str_stat = self.stats.get("STR", 50)
         term_1 = math.trunc((str_stat - 20) / 200.0 * 100) / 100.0 * self.body_weight
         term_2 = self.body_weight / 200.0
         return max(5.0, term_1 + term_2)
 
-    @property
+    @derived_stat
     def current_encumbrance(self) -> float:
         total_weight = 0.0
         for item_id in self.inventory:
@@ -258,6 +393,8 @@ class Player(GameEntity):
         if self._hp != value:
             self._hp = value
             self.mark_dirty()
+            if value < self.max_hp:
+                self.schedule_vitals()
     @property
     def mana(self):
         return self._mana
@@ -266,6 +403,8 @@ class Player(GameEntity):
         if self._mana != value:
             self._mana = value
             self.mark_dirty()
+            if value < self.max_mana:
+                self.schedule_vitals()
     @property
     def stamina(self):
         return self._stamina
@@ -274,6 +413,8 @@ class Player(GameEntity):
         if self._stamina != value:
             self._stamina = value
             self.mark_dirty()
+            if value < self.max_stamina:
+                self.schedule_vitals()
     @property
     def spirit(self):
         return self._spirit
@@ -282,6 +423,8 @@ class Player(GameEntity):
         if self._spirit != value:
             self._spirit = value
             self.mark_dirty()
+            if value < self.max_spirit:
+                self.schedule_vitals()
 
     @property
     def hp_regeneration(self) -> int:
@@ -448,6 +591,7 @@ class Player(GameEntity):
             if not is_band_share: self.send_message(f"You gain {actual_gained} field experience. ({self.mind_status})")
             else: self.send_message(f"You gain {actual_gained} field experience from your band. ({self.mind_status})")
         self.mark_dirty()
+        self.schedule_vitals()
 
     def absorb_exp_pulse(self, room_type: str = "other") -> Optional[str]:
         if self.unabsorbed_exp <= 0: return None
@@ -511,8 +655,22 @@ class Player(GameEntity):
     def send_message(self, message: str):
         self.messages.append(message)
         self.message_history.append(message)
-        if len(self.message_history) > 100:
-            self.message_history = self.message_history[-100:]
+        self._history_dirty = True
+
+    def history_for_save(self, force: bool = False) -> Optional[str]:
+        """
+        Packed history if it should be written with this save, else None.
+        Periodic saves only include it every MESSAGE_HISTORY_SAVE_INTERVAL_SECONDS;
+        force=True (logout) always includes unsaved lines.
+        """
+        if not self._history_dirty:
+            return None
+        now = time.time()
+        if not force and now - self._history_saved_at < config.MESSAGE_HISTORY_SAVE_INTERVAL_SECONDS:
+            return None
+        self._history_dirty = False
+        self._history_saved_at = now
+        return pack_message_history(self.message_history)
 
     def get_equipped_item_data(self, slot: str) -> Optional[dict]:
         item_id = self.worn_items.get(slot) 
@@ -541,7 +699,7 @@ class Player(GameEntity):
         old_room_obj = self.world.get_active_room_safe(old_room)
         if old_room_obj and getattr(old_room_obj, "is_table", False):
             if getattr(old_room_obj, "owner", None) == self.name.lower():
-                current_occupants = list(self.world.room_players.get(old_room, []))
+                current_occupants = list(self.world.get_players_in_room(old_room))
                 remaining = [p for p in current_occupants if p.lower() != self.name.lower()]
                 if remaining:
                     new_owner = remaining[0]
@@ -573,7 +731,7 @@ class Player(GameEntity):
         
         target_room_obj = self.world.get_active_room_safe(target_room_id)
         if target_room_obj and getattr(target_room_obj, "is_table", False):
-            existing_occupants = [p for p in self.world.room_players.get(target_room_id, []) if p.lower() != self.name.lower()]
+            existing_occupants = [p for p in self.world.get_players_in_room(target_room_id) if p.lower() != self.name.lower()]
             if not existing_occupants:
                 target_room_obj.owner = self.name.lower()
                 target_room_obj.invited_guests = [] 
@@ -583,8 +741,7 @@ class Player(GameEntity):
                     new_owner = existing_occupants[0]
                     target_room_obj.owner = new_owner.lower()
         
-        if target_room_id not in self.visited_rooms:
-            self.visited_rooms.append(target_room_id)
+        self.visited_rooms.add(target_room_id)
         
         if move_message:
             self.send_message(move_message)
@@ -689,8 +846,12 @@ class Player(GameEntity):
                 if regen_occurred:
                     self.mark_dirty()
 
-    def to_dict(self) -> dict:
-        data = super().to_dict() if hasattr(super(), 'to_dict') else self.data.copy()
+    def to_dict(self, include_unloaded_profile: bool = True) -> dict:
+        """
+        Serializes the character. With include_unloaded_profile=False (saves),
+        a profile that was never built is left out: $set keeps the stored copy.
+        """
+        data = dict(self.data)
         data.update({
             "name": self.name,
             "current_room_id": self.current_room_id,
@@ -703,12 +864,11 @@ class Player(GameEntity):
             "inventory": self.inventory,
             "worn_items": self.worn_items,
             "wealth": self.wealth,
-            "flags": self.flags,
+            "flags": self.flags.to_dict(),
+            "aliases": self.aliases,
             "quest_counters": self.quest_counters,
-            "completed_quests": self.completed_quests,
+            "completed_quests": list(self.completed_quests),
             "factions": self.factions,
-            "deities": self.deities, 
-            "guilds": self.guilds, 
             "level": self.level,
             "experience": self.experience,
             "unabsorbed_exp": self.unabsorbed_exp,
@@ -717,7 +877,6 @@ class Player(GameEntity):
             "stps": self.stps,
             "game_state": self.game_state,
             "chargen_step": self.chargen_step,
-            "appearance": self.appearance,
             "skill_learning_progress": self.skill_learning_progress,
             "ranks_trained_this_level": self.ranks_trained_this_level,
             "deaths_recent": self.deaths_recent,
@@ -734,28 +893,24 @@ class Player(GameEntity):
             "stamina_burst_pulses": self.stamina_burst_pulses,
             "prepared_spell": self.prepared_spell,
             "buffs": self.buffs,
-            "known_spells": self.known_spells,
-            "known_maneuvers": self.known_maneuvers,
-            "visited_rooms": self.visited_rooms,
+            "known_spells": list(self.known_spells),
+            "known_maneuvers": list(self.known_maneuvers),
+            "visited_rooms": self.visited_rooms.to_storage(),
             "is_goto_active": self.is_goto_active,
             "group_id": self.group_id,
             "band_id": self.band_id,
             "band_xp_bank": self.band_xp_bank,
             "stalking_target_uid": self.stalking_target_uid,
             "is_admin": self.is_admin,
-            "locker": self.locker,
-            "aliases": self.aliases,
-            "message_history": self.message_history,
-            "friends": self.friends,
-            "ignored": self.ignored,
             "last_troll_regen_time": self._last_troll_regen_time
         })
+        if self._profile is not None or include_unloaded_profile:
+            data.update(self.profile.to_dict())
         return data
 
-    def get_vitals(self) -> Dict[str, Any]:
-        # Hook for wound processing (lazy update on status check)
-        self._process_wounds()
-
+    @derived_stat
+    def worn_items_display(self) -> Dict[str, Dict[str, str]]:
+        """The worn_items part of get_vitals(); rebuilt only when equipment changes."""
         worn_data = {}
         for slot_id, slot_name in config.EQUIPMENT_SLOTS.items():
             item_ref = self.worn_items.get(slot_id)
@@ -770,6 +925,11 @@ class Player(GameEntity):
                         "name": item_data.get("name", "an item"),
                         "slot_display": slot_name
                     }
+        return worn_data
+
+    def get_vitals(self) -> Dict[str, Any]:
+        # Hook for wound processing (lazy update on status check)
+        self._process_wounds()
 
         combat_state = self.world.get_combat_state(self.name.lower())
         real_next_action = 0.0
@@ -794,7 +954,7 @@ class Player(GameEntity):
                 real_duration = getattr(self, "_rt_duration", real_next_action - time.time())
         # -------------------------------------------
 
-        return {
+        vitals = {
             "health": self.hp, "max_health": self.max_hp,
             "mana": self.mana, "max_mana": self.max_mana,
             "stamina": self.stamina, "max_stamina": self.max_stamina,
@@ -804,7 +964,7 @@ class Player(GameEntity):
             "wounds": self.wounds,
             "scars": self.scars,
             "bandages": self.bandages,
-            "worn_items": worn_data,
+            "worn_items": self.worn_items_display,
             "exp_to_next": self.level_xp_target - self.experience,
             "exp_percent": (self.experience / self.level_xp_target) * 100,
             "posture": self.posture,
@@ -814,6 +974,20 @@ class Player(GameEntity):
             "rt_type": real_rt_type,
             "is_hidden": self.is_hidden 
         }
+        # Everything returned here is sent to the client, so it becomes the delta baseline
+        sent = dict(vitals)
+        for key in _LIVE_VITALS_FIELDS:
+            sent[key] = copy.deepcopy(vitals[key])
+        self._sent_vitals = sent
+        return vitals
+
+    def get_vitals_delta(self) -> Dict[str, Any]:
+        """Only the get_vitals() fields that changed since the client was last sent vitals."""
+        previous = self._sent_vitals
+        vitals = self.get_vitals()
+        if not previous:
+            return vitals
+        return {key: value for key, value in vitals.items() if previous.get(key) != value}
 
 class Room(GameEntity):
     def __init__(self, room_id: str, name: str, description: str, db_data: Optional[dict] = None):
@@ -3,7 +3,7 @@ import time
 import threading
 import copy
 from mud_backend import config
-from typing import Dict, Any, Optional, List, Tuple, Set
+from typing import Dict, Any, FrozenSet, Optional, List, Tuple, Set
 from mud_backend.core.game_objects import Player, Room
 from mud_backend.core.asset_manager import AssetManager 
 from mud_backend.core.events import EventBus 
@@ -11,6 +11,10 @@ from mud_backend.core.managers import ConnectionManager, RoomManager, EntityMana
 from mud_backend.core.mail_manager import MailManager
 from mud_backend.core.auction_manager import AuctionManager
 from mud_backend.core.loot_system import TreasureManager
+from mud_backend.core.game_loop.monster_respawn import RespawnScheduler
+from mud_backend.core.game_loop.vitals import VitalsScheduler
+from mud_backend.core.game_loop.crafting import CraftingStationRegistry
+from mud_backend.core.game_loop.profiler import TickProfiler
 
 class ShardedStore:
     """Thread-safe dictionary store with sharded locks."""
@@ -34,6 +38,9 @@ class ShardedStore:
     def pop(self, key: str, default=None):
         data, lock = self._get_shard(key)
         with lock: return data.pop(key, default)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
             
     def contains(self, key: str) -> bool:
         data, lock = self._get_shard(key)
@@ -59,6 +66,10 @@ class World:
         self.mail_manager = MailManager(self) 
         self.auction_manager = AuctionManager(self)
         self.treasure_manager = TreasureManager(self)
+        self.respawn_scheduler = RespawnScheduler(self)
+        self.vitals_scheduler = VitalsScheduler(self)
+        self.crafting_stations = CraftingStationRegistry(self)
+        self.tick_profiler = TickProfiler()
 
         self.player_directory_lock = threading.RLock()
         self.active_players: Dict[str, Dict[str, Any]] = {}
@@ -83,6 +94,7 @@ class World:
         self.last_game_tick_time: float = time.time()
         self.tick_interval_seconds: float = config.TICK_INTERVAL_SECONDS
         self.last_monster_tick_time: float = time.time()
+        self.last_crafting_tick_time: float = time.time()
         self.game_tick_counter: int = 0
         self.player_timeout_seconds: int = config.PLAYER_TIMEOUT_SECONDS
         self.last_band_payout_time: float = time.time()
@@ -108,6 +120,8 @@ class World:
     def mob_locations(self): return self.entity_manager.mob_locations
     @property
     def room_players(self): return self.entity_manager.room_players
+    @property
+    def room_mobs(self): return self.entity_manager.room_mobs
 
     # --- ASSET PROPERTIES ---
     @property
@@ -175,6 +189,9 @@ class World:
     def remove_player_from_room_index(self, player_name: str, room_id: str):
         self.entity_manager.remove_player_from_room(player_name, room_id)
 
+    def get_players_in_room(self, room_id: str) -> FrozenSet[str]:
+        return self.entity_manager.get_players_in_room(room_id)
+
     # --- DELEGATED METHODS (Rooms) ---
     def get_active_room_safe(self, room_id: str) -> Optional[Room]:
         return self.room_manager.get_active_room_safe(room_id)
@@ -306,12 +323,21 @@ class World:
     def set_combat_state(self, combatant_id: str, data: Dict[str, Any]):
         self.combat_state.set(combatant_id, data)
     def remove_combat_state(self, combatant_id: str) -> Optional[Dict[str, Any]]:
-        return self.combat_state.pop(combatant_id)
+        state = self.combat_state.pop(combatant_id)
+        self._requeue_mob_aggro(combatant_id)
+        return state
     def get_all_combat_states(self) -> List[Tuple[str, Dict[str, Any]]]:
         return self.combat_state.get_all_items()
     def stop_combat_for_all(self, combatant_id_1: str, combatant_id_2: str):
         self.combat_state.pop(combatant_id_1)
         self.combat_state.pop(combatant_id_2)
+        self._requeue_mob_aggro(combatant_id_1)
+        self._requeue_mob_aggro(combatant_id_2)
+    def _requeue_mob_aggro(self, combatant_id: str):
+        # A mob that just dropped out of combat gets one fresh look at its room
+        room_id = self.entity_manager.mob_locations.get(combatant_id)
+        if room_id:
+            self.entity_manager.queue_aggro_for_mob(combatant_id, room_id)
     def get_monster_hp(self, monster_uid: str) -> Optional[int]:
         return self.runtime_monster_hp.get(monster_uid)
     def set_monster_hp(self, monster_uid: str, hp: int):
@@ -328,6 +354,7 @@ class World:
         return self.defeated_monsters.get(monster_uid)
     def set_defeated_monster(self, monster_uid: str, data: Dict[str, Any]):
         self.defeated_monsters.set(monster_uid, data)
+        self.respawn_scheduler.schedule(monster_uid, data.get("eligible_at", time.time()))
     def remove_defeated_monster(self, monster_uid: str) -> Optional[Dict[str, Any]]:
         return self.defeated_monsters.pop(monster_uid)
     def get_all_defeated_monsters(self) -> List[Tuple[str, Dict[str, Any]]]:
@@ -0,0 +1,180 @@
+# mud_backend/core/log.py
+"""
+Server logging.
+
+Every subsystem logs through its own stdlib logger ("mud.<subsystem>"), with
+%-style arguments so a message is only formatted if its level is enabled:
+
+    logger = get_logger("broadcast")
+    logger.debug("Sending to %s (SID: %s)", player_name, sid)
+
+configure() (called once by app.py) puts a single QueueHandler on the "mud"
+logger. The game loop only ever pays for an enqueue; a QueueListener thread
+does the actual writing, to a rotating JSON-lines file and to the console.
+Levels come from config.LOG_LEVEL / config.LOG_LEVELS and can be changed at
+runtime with set_level() (the LOGLEVEL admin verb).
+"""
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Dict, Optional
+
+from mud_backend import config
+
+ROOT_LOGGER_NAME = "mud"
+# Exported command traces (core/tracing.py): their own file, never the console
+TRACE_LOGGER_NAME = f"{ROOT_LOGGER_NAME}.trace"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{subsystem}")
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, subsystem, msg, plus any extra={'fields': {...}}."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "subsystem": record.name.split(".", 1)[-1],
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        return json.dumps(entry, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Keeps the console looking like it always has: [SUBSYSTEM] message."""
+    def format(self, record: logging.LogRecord) -> str:
+        subsystem = record.name.split(".", 1)[-1].upper()
+        if record.levelno >= logging.WARNING:
+            return f"[{subsystem} {record.levelname}] {record.getMessage()}"
+        return f"[{subsystem}] {record.getMessage()}"
+
+
+class _TraceFilter(logging.Filter):
+    def __init__(self, traces: bool):
+        super().__init__()
+        self.traces = traces
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (record.name == TRACE_LOGGER_NAME) == self.traces
+
+
+class _RawFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
+
+
+def _level(name) -> int:
+    if isinstance(name, int):
+        return name
+    level = logging.getLevelName(str(name).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level '{name}'")
+    return level
+
+
+def configure():
+    """Installs the queue handler and starts the writer thread. Safe to call twice."""
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(_level(config.LOG_LEVEL))
+    root.propagate = False
+    for subsystem, level in config.LOG_LEVELS.items():
+        get_logger(subsystem).setLevel(_level(level))
+
+    handlers = []
+    if config.TRACE_FILE:
+        os.makedirs(os.path.dirname(os.path.abspath(config.TRACE_FILE)), exist_ok=True)
+        trace_handler = logging.handlers.RotatingFileHandler(
+            config.TRACE_FILE, maxBytes=config.LOG_FILE_MAX_BYTES, backupCount=config.LOG_FILE_BACKUPS, encoding="utf-8"
+        )
+        trace_handler.setFormatter(_RawFormatter())
+        trace_handler.addFilter(_TraceFilter(traces=True))
+        handlers.append(trace_handler)
+        logging.getLogger(TRACE_LOGGER_NAME).setLevel(logging.INFO)
+    else:
+        logging.getLogger(TRACE_LOGGER_NAME).setLevel(logging.WARNING)
+
+    if config.LOG_FILE:
+        log_dir = os.path.dirname(os.path.abspath(config.LOG_FILE))
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            config.LOG_FILE, maxBytes=config.LOG_FILE_MAX_BYTES, backupCount=config.LOG_FILE_BACKUPS, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonLineFormatter())
+        file_handler.addFilter(_TraceFilter(traces=False))
+        handlers.append(file_handler)
+    if config.LOG_CONSOLE_LEVEL:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(_level(config.LOG_CONSOLE_LEVEL))
+        console_handler.setFormatter(ConsoleFormatter())
+        console_handler.addFilter(_TraceFilter(traces=False))
+        handlers.append(console_handler)
+
+    # Unbounded, so a burst never blocks the game loop. Not eventlet-patched
+    # (app.py leaves threading alone), so the listener is a real OS thread.
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.handlers[:] = [queue_handler]
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+
+
+def configure_subprocess():
+    """
+    For worker processes. A forked child inherits the QueueHandler, but the
+    listener thread only runs in the parent, so records would be lost:
+    the child writes straight to its console instead.
+    """
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(_level(config.LOG_LEVEL))
+    root.propagate = False
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ConsoleFormatter())
+    root.handlers[:] = [console_handler]
+
+
+def shutdown():
+    """Flushes whatever is queued. Called on server exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def set_level(subsystem: str, level) -> int:
+    """subsystem 'all' sets the root level and clears per-subsystem overrides."""
+    level_value = _level(level)
+    if subsystem == "all":
+        logging.getLogger(ROOT_LOGGER_NAME).setLevel(level_value)
+        for name in subsystem_levels():
+            if get_logger(name).name != TRACE_LOGGER_NAME:
+                get_logger(name).setLevel(logging.NOTSET)
+    else:
+        get_logger(subsystem).setLevel(level_value)
+    return level_value
+
+
+def subsystem_levels() -> Dict[str, str]:
+    """Effective level of every subsystem logger created so far."""
+    prefix = ROOT_LOGGER_NAME + "."
+    levels = {}
+    for name in sorted(logging.root.manager.loggerDict):
+        if name.startswith(prefix):
+            levels[name[len(prefix):]] = logging.getLevelName(logging.getLogger(name).getEffectiveLevel())
+    return levels
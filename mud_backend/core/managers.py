@@ -3,17 +3,63 @@ import threading
 import copy
 import uuid
 from collections import deque
-from typing import Dict, Any, Optional, Set, List, Union, TYPE_CHECKING
+from typing import Dict, Any, FrozenSet, Optional, Set, List, Tuple, Union, TYPE_CHECKING
 from mud_backend.core.game_objects import Room, Player
+from mud_backend.core import metrics
+from mud_backend.core import wire
+from mud_backend.core.log import get_logger
+from mud_backend import config
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
 
+logger = get_logger("broadcast")
+connection_logger = get_logger("connection")
+
 class ConnectionManager:
     """Handles SocketIO connections and broadcasting."""
     def __init__(self, world: 'World'):
         self.world = world
         self.socketio = None # Injected later
+        # sid -> encoder state, for clients that negotiated the compact protocol
+        self.wire_sessions: Dict[str, wire.WireSession] = {}
+
+    def emit_to_sid(self, event: str, payload: Any, sid: str):
+        """Emit path for game output to one client, so metrics see every event."""
+        session = self.wire_sessions.get(sid)
+        if session is not None and event in wire.COMPACT_EVENTS:
+            # Encoded and emitted with no yield in between, so template
+            # numbers reach the client in the order they were assigned
+            payload = session.encode(payload)
+        if metrics.ENABLED:
+            metrics.record_emit(event, payload)
+        self.socketio.emit(event, payload, room=sid)
+
+    def emit_to_room(self, event: str, payload: Any, room: Optional[str] = None):
+        """
+        One emit to a socket.io room (everyone when room is None). Counted
+        once: the recipients are not known here. Never compact-encoded, as
+        the clients in a room do not share a wire session.
+        """
+        if metrics.ENABLED:
+            metrics.record_emit(event, payload)
+        if payload is None:
+            self.socketio.emit(event, room=room)
+        else:
+            self.socketio.emit(event, payload, room=room)
+
+    def negotiate_protocol(self, sid: str, offer: Dict[str, Any]) -> Dict[str, Any]:
+        """Handles a client's protocol offer; returns the 'protocol' reply."""
+        if offer.get("protocol") != wire.PROTOCOL_COMPACT or not config.WIRE_COMPACT_ENABLED:
+            self.wire_sessions.pop(sid, None)
+            return {"protocol": wire.PROTOCOL_JSON}
+        session = wire.WireSession(use_msgpack=bool(offer.get("msgpack")))
+        self.wire_sessions[sid] = session
+        connection_logger.debug("%s negotiated the compact protocol (%s)", sid, "msgpack" if session.use_msgpack else "json")
+        return session.describe()
+
+    def drop_wire_session(self, sid: str):
+        self.wire_sessions.pop(sid, None)
         
     def send_to_player(self, player_name_lower: str, message: str, msg_type: str = "message"):
         if not self.socketio: return
@@ -21,7 +67,7 @@ class ConnectionManager:
         if player_info:
             sid = player_info.get("sid")
             if sid: 
-                self.socketio.emit("message", {'text': message, 'type': msg_type}, room=sid)
+                self.emit_to_sid("message", {'text': message, 'type': msg_type}, sid)
             
             # Handle Snooping
             player_obj = player_info.get("player_obj")
@@ -32,7 +78,7 @@ class ConnectionManager:
                     for snooper_name in snoopers:
                         snooper_info = self.world.get_player_info(snooper_name)
                         if snooper_info and snooper_info.get("sid"):
-                            self.socketio.emit("message", {'text': snoop_msg, 'type': 'message'}, room=snooper_info["sid"])
+                            self.emit_to_sid("message", {'text': snoop_msg, 'type': 'message'}, snooper_info["sid"])
 
     def join_room(self, sid: str, room_id: str):
         """Adds a socket to a room channel."""
@@ -63,13 +109,12 @@ class ConnectionManager:
         # We rely on the Entity Manager for truth about who is in the room.
         players_in_room = self.world.entity_manager.get_players_in_room(room_id)
         
-        # [DEBUG] Show who is in the room index
-        print(f"[DEBUG BROADCAST] Room: {room_id} | Msg: {message[:30]}... | Candidates: {players_in_room}")
+        logger.debug("Room: %s | Msg: %.30s... | Candidates: %s", room_id, message, players_in_room)
 
         for player_name in players_in_room:
             player_info = self.world.get_player_info(player_name)
             if not player_info: 
-                print(f"[DEBUG BROADCAST] Skipped {player_name} (No Info)")
+                logger.debug("Skipped %s (No Info)", player_name)
                 continue
             
             player_obj = player_info.get("player_obj")
@@ -77,25 +122,20 @@ class ConnectionManager:
             
             # Skip invalid, offline, or explicitly skipped players
             if not player_obj or not sid: 
-                print(f"[DEBUG BROADCAST] Skipped {player_name} (No SID/Obj)")
+                logger.debug("Skipped %s (No SID/Obj)", player_name)
                 continue
             
             if sid in skip_sids_set:
-                print(f"[DEBUG BROADCAST] Skipped {player_name} (SID {sid} is in skip list)")
+                logger.debug("Skipped %s (SID %s is in skip list)", player_name, sid)
                 continue
             
             # Flag Checks
             if msg_type.startswith("ambient") and player_obj.flags.get("ambient", "on") == "off": continue 
             if msg_type == "combat_death" and player_obj.flags.get("showdeath", "on") == "off": continue 
             
-            # [DEBUG] Confirm sending
-            print(f"[DEBUG BROADCAST] Sending to {player_name} (SID: {sid})")
+            logger.debug("Sending to %s (SID: %s)", player_name, sid)
 
-            self.socketio.emit(
-                'message', 
-                {'text': message, 'type': msg_type}, 
-                room=sid
-            )
+            self.emit_to_sid('message', {'text': message, 'type': msg_type}, sid)
 
     def broadcast_to_world(self, message: str, msg_type: str = "global_chat", skip_player_name: str = None):
         if not self.socketio: return
@@ -107,11 +147,7 @@ class ConnectionManager:
             
             sid = p_info.get("sid")
             if sid:
-                self.socketio.emit(
-                    'message', 
-                    {'text': message, 'type': msg_type}, 
-                    room=sid
-                )
+                self.emit_to_sid('message', {'text': message, 'type': msg_type}, sid)
 
     def broadcast_to_radius(self, start_room_id: str, radius: int, message: str, msg_type: str = "message", skip_player_name: str = None):
         if not self.socketio: return
@@ -153,11 +189,7 @@ class ConnectionManager:
             if p_room_id in rooms_in_range:
                 sid = p_info.get("sid")
                 if sid:
-                    self.socketio.emit(
-                        'message', 
-                        {'text': message, 'type': msg_type}, 
-                        room=sid
-                    )
+                    self.emit_to_sid('message', {'text': message, 'type': msg_type}, sid)
 
     def disconnect_player(self, sid: str):
         player_to_remove = None
@@ -167,7 +199,7 @@ class ConnectionManager:
                 break
         
         if player_to_remove:
-            print(f"[CONNECTION] Player {player_to_remove} disconnected.")
+            connection_logger.info("Player %s disconnected.", player_to_remove)
             self.world.remove_player(player_to_remove)
 
 
@@ -190,8 +222,13 @@ class RoomManager:
             template = self.world.assets.get_room_template(room_id)
             if template:
                 room_obj = self._hydrate_room(template)
+                if metrics.ENABLED:
+                    metrics.ROOM_HYDRATIONS.inc()
                 with self.directory_lock:
                     self.active_rooms[room_id] = room_obj
+                # Respawns that came due while the room was unloaded
+                self.world.respawn_scheduler.materialize_pending(room_obj)
+                self.world.crafting_stations.register_room(room_obj)
         
         if room_obj:
             return room_obj.to_dict()
@@ -267,44 +304,119 @@ class RoomManager:
         self.world.event_bus.emit("save_room", room=room_obj)
 
 
+_NO_PLAYERS: FrozenSet[str] = frozenset()
+
+
 class EntityManager:
     def __init__(self, world: 'World'):
         self.world = world
         self.index_lock = threading.RLock()
-        self.room_players: Dict[str, Set[str]] = {} 
+        # Presence index: room_id -> frozenset of lowercase player names.
+        # Writers build a new frozenset under index_lock and swap it in with one
+        # dict assignment, so readers never lock and never see a half-applied move.
+        self.room_players: Dict[str, FrozenSet[str]] = {} 
         self.active_mob_uids: Set[str] = set()
         self.mob_locations: Dict[str, str] = {} 
+        # Per-room roster of mob uids (inverse of mob_locations)
+        self.room_mobs: Dict[str, Set[str]] = {}
+        # Event-driven aggro: (mob_uid, player_name) pairs awaiting one evaluation.
+        # Dict used as an ordered set so repeated events collapse into one check.
+        self.pending_aggro: Dict[Tuple[str, str], None] = {}
+        # Pairs whose mob could not act (stunned/asleep); retried each monster tick
+        self.deferred_aggro: Dict[Tuple[str, str], None] = {}
+
+    def _add_to_room_roster(self, uid: str, room_id: str):
+        if room_id not in self.room_mobs:
+            self.room_mobs[room_id] = set()
+        self.room_mobs[room_id].add(uid)
+
+    def _remove_from_room_roster(self, uid: str, room_id: Optional[str]):
+        if room_id and room_id in self.room_mobs:
+            self.room_mobs[room_id].discard(uid)
+            if not self.room_mobs[room_id]:
+                del self.room_mobs[room_id]
 
     def register_mob(self, uid: str, room_id: str):
         with self.index_lock:
+            old_room_id = self.mob_locations.get(uid)
+            if old_room_id != room_id:
+                self._remove_from_room_roster(uid, old_room_id)
             self.active_mob_uids.add(uid)
             self.mob_locations[uid] = room_id
+            self._add_to_room_roster(uid, room_id)
+            self.queue_aggro_for_mob(uid, room_id)
 
     def unregister_mob(self, uid: str):
         with self.index_lock:
             self.active_mob_uids.discard(uid)
-            self.mob_locations.pop(uid, None)
+            old_room_id = self.mob_locations.pop(uid, None)
+            self._remove_from_room_roster(uid, old_room_id)
 
     def update_mob_location(self, uid: str, new_room_id: str):
         with self.index_lock:
             if uid in self.active_mob_uids:
+                self._remove_from_room_roster(uid, self.mob_locations.get(uid))
                 self.mob_locations[uid] = new_room_id
+                self._add_to_room_roster(uid, new_room_id)
+                self.queue_aggro_for_mob(uid, new_room_id)
+
+    def get_mobs_in_room(self, room_id: str) -> Set[str]:
+        with self.index_lock:
+            return self.room_mobs.get(room_id, set()).copy()
+
+    def get_occupied_room_ids(self) -> List[str]:
+        """Rooms that currently hold at least one player."""
+        return list(self.room_players)
+
+    def queue_aggro_for_player(self, player_name: str, room_id: str):
+        """A player appeared/changed in room_id: check them against every mob there."""
+        name = player_name.lower()
+        with self.index_lock:
+            for uid in self.room_mobs.get(room_id, ()):
+                self.pending_aggro[(uid, name)] = None
+
+    def queue_aggro_for_mob(self, uid: str, room_id: str):
+        """A mob appeared/became idle in room_id: check it against every player there."""
+        with self.index_lock:
+            for name in self.room_players.get(room_id, ()):
+                self.pending_aggro[(uid, name)] = None
+
+    def defer_aggro_pair(self, uid: str, player_name: str):
+        with self.index_lock:
+            self.deferred_aggro[(uid, player_name)] = None
+
+    def requeue_deferred_aggro(self):
+        with self.index_lock:
+            if self.deferred_aggro:
+                self.pending_aggro.update(self.deferred_aggro)
+                self.deferred_aggro.clear()
+
+    def drain_aggro_queue(self) -> List[Tuple[str, str]]:
+        with self.index_lock:
+            if not self.pending_aggro:
+                return []
+            pairs = list(self.pending_aggro)
+            self.pending_aggro.clear()
+            return pairs
 
     def add_player_to_room(self, player_name: str, room_id: str):
         name = player_name.lower()
         with self.index_lock:
-            if room_id not in self.room_players:
-                self.room_players[room_id] = set()
-            self.room_players[room_id].add(name)
+            self.room_players[room_id] = self.room_players.get(room_id, _NO_PLAYERS) | {name}
+            self.queue_aggro_for_player(name, room_id)
 
     def remove_player_from_room(self, player_name: str, room_id: str):
         name = player_name.lower()
         with self.index_lock:
-            if room_id in self.room_players:
-                self.room_players[room_id].discard(name)
-                if not self.room_players[room_id]:
-                    del self.room_players[room_id]
+            occupants = self.room_players.get(room_id)
+            if occupants is None or name not in occupants:
+                return
+            remaining = occupants - {name}
+            if remaining:
+                self.room_players[room_id] = remaining
+            else:
+                del self.room_players[room_id]
 
-    def get_players_in_room(self, room_id: str) -> Set[str]:
-        with self.index_lock:
-            return self.room_players.get(room_id, set()).copy()
\ No newline at end of file
+    def get_players_in_room(self, room_id: str) -> FrozenSet[str]:
+        """Immutable snapshot of who is in room_id. Lock-free; safe to keep and iterate."""
+        return self.room_players.get(room_id, _NO_PLAYERS)
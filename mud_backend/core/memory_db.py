@@ -0,0 +1,174 @@
+# mud_backend/core/memory_db.py
+"""
+In-process stand-in for the MongoDB database used by core/db.py.
+
+Supports exactly the query/update shapes db.py issues: equality (including
+"value in array" matching), $regex/$options, $ne, $in, and $set/$inc updates
+with upsert. Documents are copied in and out like a real driver would, so
+callers can't mutate stored state by accident.
+
+Usage (load tests, benchmarks, offline runs):
+    db.use_database(MemoryDatabase())
+    db.ensure_initial_data()
+"""
+import copy
+import re
+import threading
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+_MISSING = object()
+
+
+class InsertOneResult:
+    __slots__ = ("inserted_id",)
+
+    def __init__(self, inserted_id: Any):
+        self.inserted_id = inserted_id
+
+
+class UpdateResult:
+    __slots__ = ("matched_count", "modified_count", "upserted_id")
+
+    def __init__(self, matched_count: int, modified_count: int, upserted_id: Any = None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    __slots__ = ("deleted_count",)
+
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+def _values_equal(stored: Any, expected: Any) -> bool:
+    if stored is _MISSING:
+        return expected is None
+    if stored == expected:
+        return True
+    # Mongo matches a scalar against any element of an array field
+    return isinstance(stored, list) and expected in stored
+
+
+def _matches_condition(stored: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict) or not any(str(key).startswith("$") for key in condition):
+        return _values_equal(stored, condition)
+
+    for operator, operand in condition.items():
+        if operator == "$regex":
+            if stored is _MISSING or stored is None:
+                return False
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            if not re.search(operand, str(stored), flags):
+                return False
+        elif operator == "$options":
+            continue
+        elif operator == "$ne":
+            if _values_equal(stored, operand):
+                return False
+        elif operator == "$in":
+            if not any(_values_equal(stored, option) for option in operand):
+                return False
+        else:
+            raise NotImplementedError(f"MemoryDatabase does not support query operator '{operator}'")
+    return True
+
+
+def _matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    if not query:
+        return True
+    for key, condition in query.items():
+        if not _matches_condition(doc.get(key, _MISSING), condition):
+            return False
+    return True
+
+
+def _apply_update(doc: Dict[str, Any], update: Dict[str, Any]):
+    for operator, fields in update.items():
+        if operator == "$set":
+            for key, value in fields.items():
+                doc[key] = copy.deepcopy(value)
+        elif operator == "$inc":
+            for key, amount in fields.items():
+                doc[key] = doc.get(key, 0) + amount
+        else:
+            raise NotImplementedError(f"MemoryDatabase does not support update operator '{operator}'")
+
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.RLock()
+        self._docs: List[Dict[str, Any]] = []
+
+    def find(self, query: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        with self.lock:
+            found = [copy.deepcopy(doc) for doc in self._docs if _matches(doc, query)]
+        return iter(found)
+
+    def find_one(self, query: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            for doc in self._docs:
+                if _matches(doc, query):
+                    return copy.deepcopy(doc)
+        return None
+
+    def count_documents(self, query: Optional[Dict[str, Any]] = None) -> int:
+        with self.lock:
+            return sum(1 for doc in self._docs if _matches(doc, query))
+
+    def insert_one(self, doc: Dict[str, Any]) -> InsertOneResult:
+        # Like the real driver, the caller's dict gets its _id filled in
+        if "_id" not in doc:
+            doc["_id"] = uuid.uuid4().hex
+        with self.lock:
+            self._docs.append(copy.deepcopy(doc))
+        return InsertOneResult(doc["_id"])
+
+    def insert_many(self, docs: List[Dict[str, Any]]):
+        for doc in docs:
+            self.insert_one(doc)
+
+    def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> UpdateResult:
+        with self.lock:
+            for doc in self._docs:
+                if _matches(doc, query):
+                    _apply_update(doc, update)
+                    return UpdateResult(1, 1)
+            if not upsert:
+                return UpdateResult(0, 0)
+            new_doc = {key: copy.deepcopy(value) for key, value in query.items() if not isinstance(value, dict)}
+            _apply_update(new_doc, update)
+            new_doc.setdefault("_id", uuid.uuid4().hex)
+            self._docs.append(new_doc)
+            return UpdateResult(0, 0, new_doc["_id"])
+
+    def delete_one(self, query: Dict[str, Any]) -> DeleteResult:
+        with self.lock:
+            for index, doc in enumerate(self._docs):
+                if _matches(doc, query):
+                    del self._docs[index]
+                    return DeleteResult(1)
+        return DeleteResult(0)
+
+
+class MemoryDatabase:
+    """Collections are created on first access, like Mongo's."""
+    def __init__(self):
+        self._collections: Dict[str, MemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = MemoryCollection(name)
+                self._collections[name] = collection
+            return collection
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
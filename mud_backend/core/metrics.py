@@ -0,0 +1,295 @@
+# mud_backend/core/metrics.py
+"""
+Process-wide metrics registry (counters, gauges, histograms) rendered in the
+Prometheus text exposition format by the /metrics route in app.py.
+
+Hooks elsewhere are written as
+
+    if metrics.ENABLED:
+        COMMANDS.inc(verb)
+
+so a server running with config.METRICS_ENABLED = False pays one module
+attribute check per hook. db.py goes further: its helpers are only wrapped
+with timers (instrument_module) when metrics are enabled at import.
+
+Gauges that mirror world state (online players, active rooms...) are
+callbacks evaluated at scrape time, never updated from the hot path.
+"""
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from mud_backend import config
+from mud_backend.core.log import get_logger
+
+ENABLED = config.METRICS_ENABLED
+
+logger = get_logger("metrics")
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Tuple) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._key(labels)
+        with self.lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self.lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Set directly, or give a callback returning the value (or {labels: value})."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), callback: Optional[Callable] = None):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self.lock:
+            self._values[key] = value
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                result = self.callback()
+            except Exception as e:
+                logger.warning("Gauge %s callback failed: %s", self.name, e)
+                return []
+            if isinstance(result, dict):
+                items = sorted((self._key(key if isinstance(key, tuple) else (key,)), value) for key, value in result.items())
+            else:
+                items = [((), result)]
+        else:
+            with self.lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[key] = series
+            series[index] += 1
+            series[-1] += value
+
+    def _render_samples(self) -> List[str]:
+        with self.lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            bucket_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self.lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = (), callback: Optional[Callable] = None) -> Gauge:
+        gauge = self._register(Gauge(name, help_text, labelnames, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Hot-path metrics (hooks check ENABLED first) ---
+COMMANDS = REGISTRY.counter("mud_commands_total", "Commands dispatched, by primary verb.", ("verb",))
+EMITS = REGISTRY.counter("mud_emits_total", "Socket.IO events emitted to clients.", ("event",))
+EMIT_BYTES = REGISTRY.counter("mud_emit_bytes_total", "Approximate JSON payload bytes emitted to clients.", ("event",))
+DB_OPS = REGISTRY.counter("mud_db_operations_total", "db.py helper calls.", ("function",))
+DB_ERRORS = REGISTRY.counter("mud_db_errors_total", "db.py helper calls that raised.", ("function",))
+DB_LATENCY = REGISTRY.histogram("mud_db_operation_seconds", "db.py helper latency.", ("function",))
+ROOM_HYDRATIONS = REGISTRY.counter("mud_room_hydrations_total", "Rooms built from their template on first access.")
+PERSISTENCE_LAST_RUN = REGISTRY.gauge("mud_persistence_last_run_timestamp", "Unix time the persistence task last finished a pass.")
+PERSISTENCE_SAVED = REGISTRY.counter("mud_persistence_saved_players_total", "Players written by the persistence task.")
+
+
+def record_emit(event: str, payload) -> None:
+    """Counts one emit. Callers check ENABLED first; sizing the payload is not free."""
+    EMITS.inc(event)
+    if payload is None:
+        return
+    if isinstance(payload, (str, bytes)):
+        size = len(payload)
+    elif isinstance(payload, dict):
+        # Cheap estimate: string values dominate every payload we send
+        size = sum(len(str(key)) + len(value if isinstance(value, str) else str(value)) for key, value in payload.items())
+    else:
+        size = len(str(payload))
+    EMIT_BYTES.inc(event, amount=size)
+
+
+def timed(function_name: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            DB_ERRORS.inc(function_name)
+            raise
+        finally:
+            DB_OPS.inc(function_name)
+            DB_LATENCY.observe(time.perf_counter() - started, function_name)
+    return wrapper
+
+
+def instrument_module(module, exclude: Iterable[str] = ()) -> None:
+    """
+    Replaces every public function defined in 'module' with a timed wrapper.
+    Callers that go through the module attribute (db.fetch_x(...)) and calls
+    inside the module (resolved through its globals) both pick it up.
+    Does nothing when metrics are disabled.
+    """
+    if not ENABLED:
+        return
+    excluded = set(exclude)
+    for name, value in list(vars(module).items()):
+        if name.startswith("_") or name in excluded or not callable(value):
+            continue
+        if getattr(value, "__module__", None) != module.__name__ or isinstance(value, type):
+            continue
+        setattr(module, name, timed(name, value))
+
+
+def register_world_gauges(world, event_queue=None) -> None:
+    """Scrape-time gauges over live world state."""
+    REGISTRY.gauge("mud_players_online", "Players in the active player directory.",
+                   callback=lambda: len(world.active_players))
+    REGISTRY.gauge("mud_rooms_active", "Hydrated rooms held by the RoomManager.",
+                   callback=lambda: len(world.room_manager.active_rooms))
+    REGISTRY.gauge("mud_rooms_occupied", "Rooms with at least one player in them.",
+                   callback=lambda: len(world.entity_manager.room_players))
+    REGISTRY.gauge("mud_mobs_active", "Monsters and NPCs registered with the EntityManager.",
+                   callback=lambda: len(world.entity_manager.active_mob_uids))
+    REGISTRY.gauge("mud_combat_states", "Entries in the combat state store.",
+                   callback=lambda: len(world.combat_state))
+    REGISTRY.gauge("mud_respawn_backlog", "Respawn deadlines queued plus respawns parked on unloaded rooms.",
+                   callback=world.respawn_scheduler.backlog_size)
+    REGISTRY.gauge("mud_vitals_scheduled", "Players the vitals pulse still has work for.",
+                   callback=lambda: len(world.vitals_scheduler))
+    REGISTRY.gauge("mud_crafting_stations", "Furnaces registered in hydrated rooms.",
+                   callback=lambda: len(world.crafting_stations))
+    REGISTRY.gauge("mud_crafting_stations_awake", "Furnaces the crafting step still has work for.",
+                   callback=world.crafting_stations.awake_count)
+    REGISTRY.gauge("mud_persistence_dirty_players", "Online players with unsaved changes.",
+                   callback=lambda: sum(1 for _, info in world.get_all_players_info()
+                                        if info.get("player_obj") and info["player_obj"]._is_dirty))
+    REGISTRY.gauge("mud_persistence_lag_seconds", "Seconds since the persistence task last finished a pass.",
+                   callback=lambda: _persistence_lag())
+    if event_queue is not None:
+        REGISTRY.gauge("mud_event_queue_depth", "Game events waiting for the game loop.",
+                       callback=event_queue.qsize)
+
+
+_started_at = time.time()
+
+
+def _persistence_lag() -> float:
+    last_run = PERSISTENCE_LAST_RUN.value() or _started_at
+    return round(time.time() - last_run, 3)
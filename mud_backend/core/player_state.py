@@ -0,0 +1,299 @@
+# mud_backend/core/player_state.py
+"""
+Compact containers backing Player.
+
+PlayerFlags    - the flags dict, with the common on/off and True/False flags
+                 packed into one int; anything else falls through to a small dict.
+message history - a fixed-size deque, stored as one separator-joined string.
+OrderedSet     - set lookups for the id lists on Player (quests, spells, friends...),
+                 saved as a list in insertion order.
+VisitedRooms   - a bitmap over RoomIndex integers; rooms without an index
+                 (created at runtime) are kept by name alongside it.
+PlayerProfile  - the cold half of a character (appearance, lore, locker,
+                 history, social lists). Built from its slice of the DB document
+                 the first time any of it is touched.
+"""
+import base64
+import copy
+from collections import deque
+from collections.abc import MutableMapping, MutableSet
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+from mud_backend import config
+from mud_backend.core.tracked import TrackedDict, TrackedField
+
+if TYPE_CHECKING:
+    from mud_backend.core.game_objects import Player
+    from mud_backend.core.room_index import RoomIndex
+
+# Flags that are almost always "on"/"off" or True/False. Order is the bit layout.
+PACKED_FLAGS = (
+    "invisible", "hidden", "sneaking", "frozen", "comm_ring_active",
+    "mechanics", "combat", "showdeath", "descriptions", "ambient", "idlekick",
+    "righthand", "lefthand", "safedrop", "groupinvites", "autosneak",
+)
+_FLAG_INDEX = {name: index for index, name in enumerate(PACKED_FLAGS)}
+
+# Three bits per flag: present, truthy, stored-as-bool
+_PRESENT = 1
+_ON = 2
+_BOOL = 4
+
+
+class PlayerFlags(MutableMapping):
+    __slots__ = ("_bits", "_extra")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._bits = 0
+        self._extra: Dict[str, Any] = {}
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    def _packed(self, key: str) -> int:
+        index = _FLAG_INDEX.get(key)
+        if index is None:
+            return 0
+        return (self._bits >> (index * 3)) & 7
+
+    def __getitem__(self, key: str) -> Any:
+        packed = self._packed(key)
+        if packed & _PRESENT:
+            if packed & _BOOL:
+                return bool(packed & _ON)
+            return "on" if packed & _ON else "off"
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        index = _FLAG_INDEX.get(key)
+        packed = 0
+        if index is not None:
+            if value is True or value is False:
+                packed = _PRESENT | _BOOL | (_ON if value else 0)
+            elif value == "on" or value == "off":
+                packed = _PRESENT | (_ON if value == "on" else 0)
+
+        if packed:
+            shift = index * 3
+            self._bits = (self._bits & ~(7 << shift)) | (packed << shift)
+            self._extra.pop(key, None)
+            return
+
+        if index is not None:
+            self._bits &= ~(7 << (index * 3))
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        packed = self._packed(key)
+        if packed & _PRESENT:
+            self._bits &= ~(7 << (_FLAG_INDEX[key] * 3))
+            return
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in PACKED_FLAGS:
+            if self._packed(key) & _PRESENT:
+                yield key
+        yield from self._extra
+
+    def __len__(self) -> int:
+        count = len(self._extra)
+        for key in PACKED_FLAGS:
+            if self._packed(key) & _PRESENT:
+                count += 1
+        return count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"PlayerFlags({self.to_dict()!r})"
+
+
+class OrderedSet(MutableSet):
+    """
+    Insertion-ordered set that keeps the list methods Player code already
+    uses (append/remove/extend). Copies and pickles come out as plain lists.
+    """
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Optional[Iterable[Any]] = None):
+        self._items: Dict[Any, None] = dict.fromkeys(items or ())
+
+    def __contains__(self, value) -> bool:
+        return value in self._items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, value):
+        self._items[value] = None
+
+    def discard(self, value):
+        self._items.pop(value, None)
+
+    def remove(self, value):
+        del self._items[value]
+
+    def append(self, value):
+        self._items[value] = None
+
+    def extend(self, values: Iterable[Any]):
+        for value in values:
+            self._items[value] = None
+
+    def to_list(self) -> List[Any]:
+        return list(self._items)
+
+    def __copy__(self):
+        return list(self._items)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self._items), memo)
+
+    def __reduce__(self):
+        return (list, (list(self._items),))
+
+    def __repr__(self):
+        return repr(list(self._items))
+
+
+class VisitedRooms(MutableSet):
+    """
+    Stored as {"bitmap": <base64, little-endian>, "extra": [room_id, ...]}.
+    The older plain list of room ids is still accepted on load.
+    """
+    __slots__ = ("_room_index", "_bits", "_extra")
+
+    def __init__(self, room_index: Optional['RoomIndex'], stored: Any = None):
+        self._room_index = room_index
+        self._bits = 0
+        self._extra: Dict[str, None] = {}
+        if isinstance(stored, dict):
+            bitmap = stored.get("bitmap")
+            if bitmap:
+                self._bits = int.from_bytes(base64.b64decode(bitmap), "little")
+            stored = stored.get("extra", [])
+        for room_id in stored or []:
+            self.add(room_id)
+
+    def _index_of(self, room_id: str) -> Optional[int]:
+        if self._room_index is None:
+            return None
+        return self._room_index.get(room_id)
+
+    def __contains__(self, room_id) -> bool:
+        index = self._index_of(room_id)
+        if index is not None:
+            return bool((self._bits >> index) & 1)
+        return room_id in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        if self._room_index is not None:
+            bits = self._bits
+            while bits:
+                lowest = bits & -bits
+                room_id = self._room_index.room_id(lowest.bit_length() - 1)
+                if room_id is not None:
+                    yield room_id
+                bits ^= lowest
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return bin(self._bits).count("1") + len(self._extra)
+
+    def add(self, room_id: str):
+        index = self._index_of(room_id)
+        if index is not None:
+            self._bits |= 1 << index
+        else:
+            self._extra[room_id] = None
+
+    def discard(self, room_id: str):
+        index = self._index_of(room_id)
+        if index is not None:
+            self._bits &= ~(1 << index)
+        self._extra.pop(room_id, None)
+
+    def append(self, room_id: str):
+        self.add(room_id)
+
+    def to_storage(self) -> Dict[str, Any]:
+        bitmap = self._bits.to_bytes((self._bits.bit_length() + 7) // 8, "little")
+        return {
+            "bitmap": base64.b64encode(bitmap).decode("ascii"),
+            "extra": list(self._extra),
+        }
+
+    def __repr__(self):
+        return f"VisitedRooms({len(self)} rooms)"
+
+
+# ASCII record separator; never produced by game text
+_HISTORY_SEPARATOR = "\x1e"
+
+
+def pack_message_history(history: Deque[str]) -> str:
+    return _HISTORY_SEPARATOR.join(history)
+
+
+def unpack_message_history(stored: Any) -> Deque[str]:
+    """Accepts the packed string or the older list-of-lines format."""
+    if isinstance(stored, str):
+        lines = stored.split(_HISTORY_SEPARATOR) if stored else []
+    else:
+        lines = stored or []
+    return deque(lines, maxlen=config.MESSAGE_HISTORY_SIZE)
+
+
+# Player attributes that live on the profile, not the hot core
+PROFILE_FIELDS = (
+    "appearance", "deities", "guilds", "locker",
+    "friends", "ignored",
+)
+
+
+class PlayerProfile:
+    __slots__ = ("_owner", "_appearance", "deities", "guilds", "locker",
+                 "friends", "ignored")
+
+    appearance = TrackedField("appearance", TrackedDict)
+
+    def __init__(self, owner: 'Player', doc: Dict[str, Any]):
+        self._owner = owner
+        self.appearance = doc.get("appearance", {})
+        self.deities = doc.get("deities", [])
+        self.guilds = doc.get("guilds", [])
+        self.locker = doc.get("locker", {
+            "capacity": 50,
+            "items": [],
+            "rent_due": 0
+        })
+        self.friends = OrderedSet(doc.get("friends", []))
+        self.ignored = OrderedSet(doc.get("ignored", []))
+
+    def invalidate_derived(self, dependency: str):
+        self._owner.invalidate_derived(dependency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in PROFILE_FIELDS}
+        data["friends"] = list(self.friends)
+        data["ignored"] = list(self.ignored)
+        return data
+
+
+class ProfileField:
+    """Player attribute stored on its PlayerProfile (materialized on first access)."""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj.profile, self.name)
+
+    def __set__(self, obj, value):
+        setattr(obj.profile, self.name, value)
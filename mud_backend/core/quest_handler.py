@@ -51,8 +51,7 @@ def _handle_room_enter_event(world, player: Player, room_id: str, **kwargs):
     Handles 'Cartographer' and 'Ghost Walk' updates.
     """
     # Update visited rooms for map logic
-    if room_id not in player.visited_rooms:
-        player.visited_rooms.append(room_id)
+    player.visited_rooms.add(room_id)
 
     for quest_id, quest_data in world.game_quests.items():
         if not _is_quest_available(player, quest_data, check_prereqs_only=True): continue
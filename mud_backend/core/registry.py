@@ -1,55 +1,52 @@
 # mud_backend/core/registry.py
-from typing import Callable, Dict, List, Type, Optional, Tuple
+import sys
+from typing import Callable, Dict, List, NamedTuple, Type, Optional, Union
+
+
+class VerbEntry(NamedTuple):
+    """One row of the dispatch table (every alias points at its primary's entry)."""
+    primary: str
+    handler: Union[Type, Callable]
+    admin_only: bool
+    # True: handler is a plain function called as handler(world, player, room, args, command),
+    # with no verb object built and no room hydration.
+    stateless: bool
+
 
 class VerbRegistry:
-    # Stores tuples: (VerbClass, is_admin_only)
-    _verbs: Dict[str, Tuple[Type, bool]] = {}
-    _aliases: Dict[str, str] = {}
+    # Alias -> VerbEntry, resolved once at registration (one dict hit per command)
+    _dispatch: Dict[str, VerbEntry] = {}
 
     @classmethod
-    def register(cls, aliases: List[str], admin_only: bool = False):
+    def register(cls, aliases: List[str], admin_only: bool = False, stateless: bool = False):
         """
         Decorator to register a verb class.
         Usage: @VerbRegistry.register(["look", "l", "examine"])
         Usage: @VerbRegistry.register(["teleport"], admin_only=True)
+        Usage: @VerbRegistry.register(["who"], stateless=True) on a
+               function(world, player, room, args, command)
         """
         def decorator(verb_class):
             if not aliases:
                 return verb_class
-            
+
             # The first alias is considered the "primary" command name
-            primary_name = aliases[0].lower()
-            
-            # Store the class AND the restriction flag
-            cls._verbs[primary_name] = (verb_class, admin_only)
-            
+            primary_name = sys.intern(aliases[0].lower())
+            entry = VerbEntry(primary_name, verb_class, admin_only, stateless)
+
             for alias in aliases:
-                cls._aliases[alias.lower()] = primary_name
-            
+                alias_name = sys.intern(alias.lower())
+                cls._dispatch[alias_name] = entry
+
             return verb_class
         return decorator
 
     @classmethod
-    def get_verb_info(cls, command_name: str) -> Optional[Tuple[Type, bool]]:
-        """
-        Returns the verb class and its admin_only flag.
-        Returns: (VerbClass, is_admin_only) or None
-        """
-        primary_name = cls._aliases.get(command_name.lower())
-        if primary_name:
-            return cls._verbs.get(primary_name)
-        return None
-
-    @classmethod
-    def get_verb_class(cls, command_name: str) -> Optional[Type]:
-        """
-        Backward compatibility: Returns just the class.
-        """
-        info = cls.get_verb_info(command_name)
-        if info:
-            return info[0]
-        return None
+    def resolve(cls, command_name: str) -> Optional[VerbEntry]:
+        """Dispatch lookup for an already lower-cased command word."""
+        return cls._dispatch.get(command_name)
 
     @classmethod
     def get_all_commands(cls) -> List[str]:
-        return list(cls._verbs.keys())
\ No newline at end of file
+        """Primary command names, in registration order."""
+        return list(dict.fromkeys(entry.primary for entry in cls._dispatch.values()))
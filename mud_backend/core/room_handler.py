@@ -6,12 +6,17 @@ from collections import deque
 from typing import Dict, Any, Optional, List, Set, TYPE_CHECKING
 from mud_backend.core.game_objects import Player, Room
 from mud_backend.core.game_loop import environment
+from mud_backend.core.game_loop.crafting import is_furnace
 from mud_backend.core.quest_handler import get_active_quest_for_npc
 from mud_backend.core.shop_system import get_or_create_shop_controller
+from mud_backend.core.log import get_logger
+from mud_backend import config
 
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
 
+logger = get_logger("rooms")
+
 def _get_time_grouping(time_of_day_str: str) -> str:
     """Categorizes the 16-step time into 5 broad groups for fallbacks."""
     if time_of_day_str in ["dawn", "noon", "dusk", "midnight"]:
@@ -148,6 +153,11 @@ def hydrate_room_objects(room: Room, world: 'World'):
                 # Ensure hydrated object has the UID
                 merged_obj["uid"] = current_uid
 
+                # Furnace state stays on the stub (shared, not copied), so
+                # verbs and the crafting step change the state room saves write
+                if is_furnace(obj_stub):
+                    merged_obj["state"] = obj_stub["state"]
+
                 # Shop Data Injection fix
                 if "pawnbroker" in merged_obj.get("keywords", []) or "merchant" in merged_obj.get("keywords", []):
                     if "shop_data" not in merged_obj and "shop_data" in obj_stub:
@@ -219,35 +229,36 @@ def show_room_to_player(player: Player, room: Room):
         if html_objects:
             player.send_message(f"\nObvious objects here: {', '.join(html_objects)}.")
     
+    viewer_name = player.name.lower()
     other_players_in_room = []
-    for sid, data in player.world.get_all_players_info():
+    for occupant_name in sorted(player.world.get_players_in_room(room.room_id)):
+        if occupant_name == viewer_name: continue
+        data = player.world.get_player_info(occupant_name)
+        if not data: continue
         player_name_in_room = data["player_name"] 
         target_player_obj = data.get("player_obj")
         
-        if player_name_in_room.lower() == player.name.lower(): continue
-        
         if target_player_obj:
             is_invis = target_player_obj.flags.get("invisible", "off") == "on"
             if is_invis:
                 if not getattr(player, "is_admin", False):
                     continue
 
-        if data["current_room_id"] == room.room_id:
-            other_players_in_room.append(
-                f'<span class="keyword" data-name="{player_name_in_room}" data-verbs="look">{player_name_in_room}</span>'
-            )
+        other_players_in_room.append(
+            f'<span class="keyword" data-name="{player_name_in_room}" data-verbs="look">{player_name_in_room}</span>'
+        )
     if other_players_in_room:
         player.send_message(f"Also here: {', '.join(other_players_in_room)}.")
 
     if getattr(room, "is_table", False) and "out" in room.exits:
         parent_room_id = room.exits["out"]
         outside_players = []
-        for sid, data in player.world.get_all_players_info():
+        for occupant_name in sorted(player.world.get_players_in_room(parent_room_id)):
+             if occupant_name == viewer_name: continue 
+             data = player.world.get_player_info(occupant_name)
+             if not data: continue
              p_name = data["player_name"]
-             if p_name.lower() == player.name.lower(): continue 
-             
-             if data["current_room_id"] == parent_room_id:
-                 outside_players.append(f'<span class="keyword" data-name="{p_name}" data-verbs="look">{p_name}</span>')
+             outside_players.append(f'<span class="keyword" data-name="{p_name}" data-verbs="look">{p_name}</span>')
         
         if outside_players:
             player.send_message(f"Outside the booth, you see: {', '.join(outside_players)}.")
@@ -259,41 +270,80 @@ def show_room_to_player(player: Player, room: Room):
         player.send_message(f"Obvious exits: {', '.join(exit_names)}")
 
 
+def _map_entry(room_id: str, name: Optional[str], data: Dict[str, Any], exits: Dict[str, str], objects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    special_exits = []
+    for obj in objects:
+        verb = None
+        target_room = obj.get("target_room")
+        if not target_room: continue
+        if "ENTER" in obj.get("verbs", []): verb = "ENTER"
+        elif "CLIMB" in obj.get("verbs", []): verb = "CLIMB"
+        elif "EXIT" in obj.get("verbs", []): verb = "EXIT"
+        if verb:
+            special_exits.append({
+                "name": obj.get("name", "door"),
+                "target_room": target_room,
+                "verb": verb
+            })
+
+    return {
+        "room_id": room_id,
+        "name": name,
+        "x": data.get("x"), 
+        "y": data.get("y"),
+        "z": data.get("z"),
+        "interior_id": data.get("interior_id"),
+        "exits": dict(exits),
+        "special_exits": special_exits
+    }
+
+def _get_map_room(world: 'World', room_id: str) -> Optional[Dict[str, Any]]:
+    """Map entry for one room: the live room if it is hydrated, else its template."""
+    room = world.room_manager.get_active_room_safe(room_id)
+    if room:
+        with room.lock:
+            return _map_entry(room.room_id, room.name, room.data, room.exits, room.objects)
+    template = world.assets.room_templates.get(room_id)
+    if template:
+        return _map_entry(template.get("room_id"), template.get("name"), template, template.get("exits", {}), template.get("objects", []))
+    return None
+
 def _get_map_data(player: Player, world: 'World') -> Dict[str, Any]:
     """
     Builds a dictionary of map data for all rooms the player has visited.
     """
     map_data = {}
     for room_id in player.visited_rooms:
-        room = world.game_rooms.get(room_id)
-        if room:
-            special_exits = []
-            for obj in room.get("objects", []):
-                verb = None
-                target_room = obj.get("target_room")
-                if not target_room: continue
-                if "ENTER" in obj.get("verbs", []): verb = "ENTER"
-                elif "CLIMB" in obj.get("verbs", []): verb = "CLIMB"
-                elif "EXIT" in obj.get("verbs", []): verb = "EXIT"
-                if verb:
-                    special_exits.append({
-                        "name": obj.get("name", "door"),
-                        "target_room": target_room,
-                        "verb": verb
-                    })
-
-            map_data[room_id] = {
-                "room_id": room.get("room_id"),
-                "name": room.get("name"),
-                "x": room.get("x"), 
-                "y": room.get("y"),
-                "z": room.get("z"),
-                "interior_id": room.get("interior_id"),
-                "exits": room.get("exits", {}),
-                "special_exits": special_exits
-            }
+        entry = _get_map_room(world, room_id)
+        if entry:
+            map_data[room_id] = entry
     return map_data
 
+def get_map_update(player: Player, world: 'World', sid: Optional[str]) -> Dict[str, Any]:
+    """
+    The map fields for a command_response.
+
+    With config.MAP_DELTA_PAYLOADS, 'map_data' only holds the rooms that are
+    new or changed since this client (sid) was last sent the map, and
+    'map_removed' the ones it should forget. 'map_full' tells the client to
+    drop what it has first: always the case for a new sid (login, reconnect).
+    """
+    map_data = _get_map_data(player, world)
+    if not config.MAP_DELTA_PAYLOADS:
+        return {"map_data": map_data, "map_full": True}
+
+    full = player._sent_map_sid != sid
+    previous = {} if full else player._sent_map
+    changed = {room_id: entry for room_id, entry in map_data.items() if previous.get(room_id) != entry}
+    removed = [room_id for room_id in previous if room_id not in map_data]
+
+    player._sent_map = map_data
+    player._sent_map_sid = sid
+    update = {"map_data": changed, "map_full": full}
+    if removed:
+        update["map_removed"] = removed
+    return update
+
 def _handle_npc_idle_dialogue(world: 'World', player_name: str, room_id: str):
     """
     Waits a random time, then checks for NPCs and sends idle quest prompts.
@@ -349,7 +399,7 @@ def _handle_npc_idle_dialogue(world: 'World', player_name: str, room_id: str):
                             return 
                         
     except Exception as e:
-        print(f"[IDLE_DIALOGUE_ERROR] Error in _handle_npc_idle_dialogue: {e}")
+        logger.exception("Error in _handle_npc_idle_dialogue: %s", e)
 
 def resolve_interaction_room(obj: Dict, verb: str) -> Optional[str]:
     """
@@ -0,0 +1,48 @@
+# mud_backend/core/room_index.py
+"""
+Interned room ids.
+
+Every room template gets a small, permanent integer. The mapping is
+append-only and persisted (db.room_index), so per-player bitmaps keyed on
+these integers (Player.visited_rooms) decode the same way after restarts
+and after new areas are added.
+"""
+from typing import Dict, Iterable, List, Optional
+
+
+class RoomIndex:
+    __slots__ = ("_ids", "_index")
+
+    def __init__(self, entries: Optional[Dict[str, int]] = None):
+        self._index: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        for room_id, index in (entries or {}).items():
+            self._set(room_id, int(index))
+
+    def _set(self, room_id: str, index: int):
+        if index >= len(self._ids):
+            self._ids.extend([None] * (index + 1 - len(self._ids)))
+        self._ids[index] = room_id
+        self._index[room_id] = index
+
+    def get(self, room_id: str) -> Optional[int]:
+        return self._index.get(room_id)
+
+    def room_id(self, index: int) -> Optional[str]:
+        if 0 <= index < len(self._ids):
+            return self._ids[index]
+        return None
+
+    def intern_all(self, room_ids: Iterable[str]) -> Dict[str, int]:
+        """Assigns indexes to any unseen ids. Returns only the new entries (to persist)."""
+        new_entries = {}
+        for room_id in room_ids:
+            if room_id in self._index:
+                continue
+            index = len(self._ids)
+            self._set(room_id, index)
+            new_entries[room_id] = index
+        return new_entries
+
+    def __len__(self) -> int:
+        return len(self._index)
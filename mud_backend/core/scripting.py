@@ -2,14 +2,17 @@
 import uuid
 import copy
 import random
-import traceback
 import time
 from typing import TYPE_CHECKING, Optional, Dict, Any
 
+from mud_backend.core.log import get_logger
+
 if TYPE_CHECKING:
     from mud_backend.core.game_state import World
     from mud_backend.core.game_objects import Player, Room
 
+logger = get_logger("script")
+
 # --- SCRIPT API ---
 # This class defines the "verbs" available inside your scripts.
 class ScriptAPI:
@@ -25,7 +28,7 @@ class ScriptAPI:
         """
         template = self.world.game_monster_templates.get(mob_template_id)
         if not template:
-            print(f"[SCRIPT ERROR] spawn_mob: Template '{mob_template_id}' not found.")
+            logger.error("spawn_mob: Template '%s' not found.", mob_template_id)
             return
 
         new_uid = uuid.uuid4().hex
@@ -73,7 +76,7 @@ class ScriptAPI:
             self.player.hp = min(self.player.hp + amt, self.player.max_hp)
             self.player.send_message(f"You feel rejuvenated. (+{amt} HP)")
         except ValueError:
-            print(f"[SCRIPT ERROR] heal: Invalid amount '{amount}'")
+            logger.error("heal: Invalid amount '%s'", amount)
 
     def teleport(self, target_room_id: str):
         """
@@ -124,7 +127,7 @@ class ScriptAPI:
         """
         item_template = self.world.game_items.get(item_id)
         if not item_template:
-            print(f"[SCRIPT ERROR] give_item: Template '{item_id}' not found.")
+            logger.error("give_item: Template '%s' not found.", item_id)
             self.player.send_message(f"Error: Item '{item_id}' does not exist.")
             return
 
@@ -229,7 +232,4 @@ def execute_script(world: 'World', player: 'Player', room: 'Room', script_string
         # We wrap the script in a try/except block for robustness
         exec(script_string, safe_scope)
     except Exception as e:
-        print(f"[SCRIPT ERROR] Error executing script in Room {room.room_id}:")
-        print(f"Script: {script_string}")
-        print(f"Error: {e}")
-        traceback.print_exc()
\ No newline at end of file
+        logger.exception("Error executing script in Room %s: %s\nScript: %s", room.room_id, e, script_string)
\ No newline at end of file
@@ -7,6 +7,9 @@ import copy
 import uuid
 from mud_backend import config
 from mud_backend.core.economy import get_item_buy_price
+from mud_backend.core.log import get_logger
+
+logger = get_logger("economy")
 
 class ShopController:
     def __init__(self, shop_filename, room, world):
@@ -37,7 +40,7 @@ class ShopController:
             with open(path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Error loading shop template {self.filename}: {e}")
+            logger.error("Error loading shop template %s: %s", self.filename, e)
             return {}
 
     def _load_or_create_state(self):
@@ -23,7 +23,7 @@ def calculate_hide_result(player, room, world) -> Tuple[bool, str, float]:
     observers = 0
     
     # Check Players
-    room_players = world.room_players.get(room.room_id, [])
+    room_players = world.get_players_in_room(room.room_id)
     for p_name in room_players:
         if p_name != player.name.lower():
             observers += 1
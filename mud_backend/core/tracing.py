@@ -0,0 +1,184 @@
+# mud_backend/core/tracing.py
+"""
+Per-command latency traces, from socket receipt to the response emit.
+
+handle_command_event() calls start_trace() when a command arrives; the trace
+rides along in the game_event_queue payload, and process_command_worker()
+activates it for the rest of the command's life. Code on the way records
+spans against whatever trace is active:
+
+    with tracing.span("hydrate"):
+        world.room_manager.get_room(room_id)
+
+With no active trace (not sampled, or config.TRACE_SAMPLE_RATE = 0) span()
+hands back a shared no-op, so an untraced command pays one ContextVar read
+per span.
+
+Finished traces feed a per-verb window of the slowest recent commands (the
+TRACES admin verb) and, when config.TRACE_FILE is set, one JSON line each
+through the "trace" logger (written off-thread by core/log.py's listener).
+Lines carry trace_id/span names/start offsets/durations in an OTLP-like
+shape so they can be converted for a collector.
+"""
+import contextvars
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from mud_backend import config
+from mud_backend.core.log import get_logger
+
+export_logger = get_logger("trace")
+
+_active: contextvars.ContextVar = contextvars.ContextVar("mud_trace", default=None)
+
+
+class Trace:
+    __slots__ = ("trace_id", "command", "verb", "player_name", "started_at", "started_ns", "spans", "total_ms")
+
+    def __init__(self, command: str, player_name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.command = command
+        # The first word until _run_verb resolves the primary verb name
+        self.verb = command.split(" ", 1)[0].lower() if command else ""
+        self.player_name = player_name
+        self.started_at = time.time()
+        self.started_ns = time.perf_counter_ns()
+        self.spans: List[List[Any]] = []
+        self.total_ms = 0.0
+
+    def add_span(self, name: str, start_ns: int, end_ns: int):
+        self.spans.append([name, (start_ns - self.started_ns) / 1e6, (end_ns - start_ns) / 1e6])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "verb": self.verb,
+            "command": self.command,
+            "player": self.player_name,
+            "start_time_unix_ms": round(self.started_at * 1000, 3),
+            "duration_ms": round(self.total_ms, 3),
+            "spans": [
+                {"name": name, "start_offset_ms": round(offset, 3), "duration_ms": round(duration, 3)}
+                for name, offset, duration in self.spans
+            ],
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start_ns")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.add_span(self.name, self.start_ns, time.perf_counter_ns())
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class SlowestCommands:
+    """For each verb, the config.TRACE_SLOWEST_PER_VERB slowest traces among the recent ones."""
+    def __init__(self, per_verb: int, max_age_seconds: float):
+        self.per_verb = per_verb
+        self.max_age_seconds = max_age_seconds
+        self.lock = threading.Lock()
+        # verb -> min-heap of (duration_ms, started_at, trace_id, trace dict)
+        self._by_verb: Dict[str, List] = {}
+
+    def add(self, trace: Trace):
+        entry = (trace.total_ms, trace.started_at, trace.trace_id, trace.to_dict())
+        with self.lock:
+            heap = self._by_verb.setdefault(trace.verb, [])
+            cutoff = time.time() - self.max_age_seconds
+            if heap and heap[0][1] < cutoff:
+                heap[:] = [item for item in heap if item[1] >= cutoff]
+                heapq.heapify(heap)
+            if len(heap) < self.per_verb:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    def slowest(self, verb: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        cutoff = time.time() - self.max_age_seconds
+        with self.lock:
+            verbs = [verb] if verb else list(self._by_verb)
+            result = {}
+            for name in verbs:
+                items = [item for item in self._by_verb.get(name, []) if item[1] >= cutoff]
+                if items:
+                    result[name] = [item[3] for item in sorted(items, reverse=True)]
+            return result
+
+    def clear(self):
+        with self.lock:
+            self._by_verb.clear()
+
+
+RECENT = SlowestCommands(config.TRACE_SLOWEST_PER_VERB, config.TRACE_WINDOW_SECONDS)
+
+
+def start_trace(command: str, player_name: str) -> Optional[Trace]:
+    """Returns a new trace if this command is sampled, else None."""
+    rate = config.TRACE_SAMPLE_RATE
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return None
+    return Trace(command, player_name)
+
+
+def activate(trace: Optional[Trace]):
+    """Makes 'trace' the one span() records against. Returns a token for deactivate()."""
+    return _active.set(trace)
+
+
+def deactivate(token):
+    _active.reset(token)
+
+
+def current() -> Optional[Trace]:
+    return _active.get()
+
+
+def span(name: str):
+    trace = _active.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name)
+
+
+def set_verb(verb: str):
+    trace = _active.get()
+    if trace is not None:
+        trace.verb = verb
+
+
+def finish(trace: Optional[Trace]):
+    if trace is None:
+        return
+    trace.total_ms = (time.perf_counter_ns() - trace.started_ns) / 1e6
+    RECENT.add(trace)
+    if export_logger.isEnabledFor(logging.INFO):
+        export_logger.info(json.dumps(trace.to_dict()))
@@ -0,0 +1,160 @@
+# mud_backend/core/tracked.py
+"""
+Containers that report their own mutations.
+
+Player keeps its stats/skills/inventory/etc. in these so cached derived
+values (max_hp, encumbrance, ...) can be dropped the moment their inputs
+change, no matter which verb or system did the mutating.
+
+Copies, deep copies and pickles come out as plain dicts/lists, so the
+callback (and the Player it points at) never leaks into saved data.
+"""
+import copy
+from typing import Any, Callable, Iterable, Optional
+
+
+class TrackedDict(dict):
+    __slots__ = ("_on_change",)
+
+    def __init__(self, data: Optional[dict] = None, on_change: Optional[Callable[[], None]] = None):
+        super().__init__(data or {})
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class TrackedList(list):
+    __slots__ = ("_on_change",)
+
+    def __init__(self, data: Optional[Iterable[Any]] = None, on_change: Optional[Callable[[], None]] = None):
+        super().__init__(data or [])
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self._changed()
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._changed()
+        return self
+
+    def append(self, value):
+        super().append(value)
+        self._changed()
+
+    def extend(self, values):
+        super().extend(values)
+        self._changed()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._changed()
+
+    def remove(self, value):
+        super().remove(value)
+        self._changed()
+
+    def pop(self, *index):
+        value = super().pop(*index)
+        self._changed()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class TrackedField:
+    """
+    Descriptor for a Player attribute held in a TrackedDict/TrackedList.
+    Assigning a new value re-wraps it; either way the owner's
+    invalidate_derived(dependency) runs.
+    """
+    def __init__(self, dependency: str, container: type):
+        self.dependency = dependency
+        self.container = container
+        self.attr = None
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.attr)
+
+    def __set__(self, obj, value):
+        dependency = self.dependency
+        setattr(obj, self.attr, self.container(value, lambda: obj.invalidate_derived(dependency)))
+        obj.invalidate_derived(dependency)
@@ -0,0 +1,157 @@
+# mud_backend/core/wire.py
+"""
+The compact wire protocol.
+
+A client that sends 'negotiate_protocol' with {"protocol": "compact"} has
+its game events (COMPACT_EVENTS) encoded by a WireSession of its own:
+
+- record keys become the short ids in FIELD_IDS (sent to the client in the
+  'protocol' reply, so both sides read the same table); keys of DATA_MAPS
+  (room ids, slots, body parts) are data and stay as they are;
+- each message line is split into a template and the keyword spans in it
+  (the args). A template seen twice gets a number and is sent once, in the
+  frame's "d" list; from then on the line travels as n, or [n, *args];
+- the frame is msgpack bytes (a binary socket.io frame) when both ends have
+  msgpack, else the same body as JSON wrapped as {"~": body}.
+
+Clients that never negotiate, and every event not in COMPACT_EVENTS, keep
+the plain JSON payloads, which stay the easiest to read in devtools.
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mud_backend import config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+PROTOCOL_JSON = "json"
+PROTOCOL_COMPACT = "compact"
+
+COMPACT_EVENTS = frozenset(("command_response", "update_vitals", "message", "message_history"))
+
+FIELD_IDS = {
+    # command_response / message / message_history
+    "messages": "m", "game_state": "g", "vitals": "v", "leave_message": "lm",
+    "map_data": "md", "map_full": "mf", "map_removed": "mr", "history_available": "ha",
+    "text": "t", "type": "ty", "done": "dn",
+    # vitals (also the update_vitals deltas)
+    "health": "h", "max_health": "mh", "mana": "mn", "max_mana": "mmn",
+    "stamina": "st", "max_stamina": "mst", "spirit": "sp", "max_spirit": "msp",
+    "current_room_id": "cr", "stance": "sn", "wounds": "w", "scars": "sc", "bandages": "b",
+    "worn_items": "wi", "slot_display": "sd", "name": "n",
+    "exp_to_next": "en", "exp_percent": "ep", "exp_label": "el",
+    "posture": "p", "status_effects": "sf", "is_hidden": "hd",
+    "rt_end_time_ms": "re", "rt_duration_ms": "rd", "rt_type": "rt",
+    # map entries
+    "room_id": "i", "interior_id": "ii", "exits": "e", "special_exits": "sx",
+    "target_room": "tr", "verb": "vb",
+}
+
+# Dicts keyed by data rather than field names
+DATA_MAPS = frozenset(("map_data", "worn_items", "exits", "wounds", "scars", "bandages"))
+
+# Keyword span attributes, in the order they follow the label in an arg
+KEYWORD_ATTRS = ("name", "id", "verbs", "command")
+
+# Frame keys of our own; never used as a short id
+DEFS_KEY = "d"
+JSON_WRAPPER_KEY = "~"
+
+# Stands in for one keyword span inside a template
+SLOT = "\x00"
+
+_KEYWORD_SPAN = re.compile(r'<span class="keyword"((?: data-(?:name|id|verbs|command)="[^"]*")*)>([^<]*)</span>')
+_KEYWORD_ATTR = re.compile(r' data-(name|id|verbs|command)="([^"]*)"')
+
+
+def split_message(text: str) -> Tuple[str, List[List[Optional[str]]]]:
+    """'You see <span class="keyword" data-name="Ann">Ann</span>.' -> ('You see \\x00.', [['Ann']])"""
+    if 'class="keyword"' not in text:
+        return text, []
+    args = []
+
+    def take(match) -> str:
+        attrs = dict(_KEYWORD_ATTR.findall(match.group(1)))
+        label = match.group(2)
+        arg = [label] + [attrs.get(attr) for attr in KEYWORD_ATTRS]
+        # The client falls back to the label when data-name is missing
+        if arg[1] == label:
+            arg[1] = None
+        while arg[-1] is None:
+            arg.pop()
+        args.append(arg)
+        return SLOT
+
+    return _KEYWORD_SPAN.sub(take, text), args
+
+
+def shorten(value: Any, data_map: bool = False) -> Any:
+    if isinstance(value, dict):
+        if data_map:
+            return {key: shorten(item) for key, item in value.items()}
+        return {FIELD_IDS.get(key, key): shorten(item, key in DATA_MAPS) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [shorten(item) for item in value]
+    return value
+
+
+class WireSession:
+    """Encoder state for one compact connection (its message templates)."""
+    def __init__(self, use_msgpack: bool):
+        self.use_msgpack = use_msgpack and msgpack is not None
+        # Encoding and numbering must not interleave between emitters
+        self.lock = threading.Lock()
+        self._templates: Dict[str, int] = {}
+        self._seen_once: Set[str] = set()
+
+    def describe(self) -> Dict[str, Any]:
+        """The 'protocol' reply: everything the client needs to decode."""
+        return {
+            "protocol": PROTOCOL_COMPACT,
+            "encoding": "msgpack" if self.use_msgpack else "json",
+            "fields": FIELD_IDS,
+            "data_maps": sorted(DATA_MAPS),
+            "keyword_attrs": list(KEYWORD_ATTRS),
+        }
+
+    def _message(self, text: Any, defs: List[List[Any]]) -> Any:
+        if not isinstance(text, str):
+            return text
+        template, args = split_message(text)
+        number = self._templates.get(template)
+        if number is None:
+            # One-off lines (chat, most combat rolls) are not worth a number
+            if template not in self._seen_once or len(self._templates) >= config.WIRE_MAX_TEMPLATES:
+                if len(self._seen_once) >= config.WIRE_MAX_TEMPLATES:
+                    self._seen_once.clear()
+                self._seen_once.add(template)
+                return text
+            self._seen_once.discard(template)
+            number = len(self._templates)
+            self._templates[template] = number
+            defs.append([number, template])
+        if args:
+            return [number, *args]
+        return number
+
+    def encode(self, payload: Any) -> Any:
+        """The frame to emit in place of 'payload'. Non-dict payloads pass through."""
+        if not isinstance(payload, dict):
+            return payload
+        defs: List[List[Any]] = []
+        with self.lock:
+            body = dict(payload)
+            if "messages" in body and body["messages"]:
+                body["messages"] = [self._message(text, defs) for text in body["messages"]]
+            if "text" in body:
+                body["text"] = self._message(body["text"], defs)
+            body = shorten(body)
+            if defs:
+                body[DEFS_KEY] = defs
+        if self.use_msgpack:
+            return msgpack.packb(body, use_bin_type=True)
+        return {JSON_WRAPPER_KEY: body}
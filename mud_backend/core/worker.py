@@ -1,75 +1,244 @@
 # mud_backend/core/worker.py
-# NEW FILE: Handles heavy CPU tasks in separate processes
+# Handles heavy CPU tasks in separate processes.
+#
+# Tasks never carry pickled callables: the main process sends a job NAME plus
+# plain-data args, encoded to bytes (msgpack when installed, compact JSON
+# otherwise). The job itself is looked up in worker_jobs.JOBS inside the
+# worker, so nothing but raw bytes crosses the process boundary.
+import json
 import multiprocessing
 import time
-from typing import Callable, Any
+import uuid
+from typing import Callable, Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from mud_backend import config
+from mud_backend.core.log import configure_subprocess, get_logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if TYPE_CHECKING:
+    from mud_backend.core.game_state import World
+
+SET_CONTEXT_JOB = "__set_context__"
+
+logger = get_logger("worker")
+
+
+def encode_payload(obj: Any) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode_payload(frame: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(frame, raw=False)
+    return json.loads(frame.decode("utf-8"))
+
 
 def _worker_process(input_queue, output_queue):
     """
     The logic running in the separate process.
-    Waits for tasks, executes them, and returns results.
+    Waits for task frames, executes the named job, and returns result frames.
     """
+    # Imported here so the job table is resolved inside the child process.
+    from mud_backend.core.worker_jobs import JOBS
+
+    configure_subprocess()
+
+    context: Dict[str, Any] = {}
+
     while True:
         try:
-            task = input_queue.get()
-            if task is None: # Sentinel to stop
+            frame = input_queue.get()
+            if frame is None: # Sentinel to stop
                 break
-                
-            task_id, func, args, kwargs = task
-            
+
+            task = decode_payload(frame)
+            task_id = task.get("id")
+            job_name = task.get("job")
+            args = task.get("args") or {}
+
+            if job_name == SET_CONTEXT_JOB:
+                context[args["key"]] = args["value"]
+                continue
+
             try:
-                # Execute the heavy function
-                result = func(*args, **kwargs)
-                output_queue.put((task_id, "success", result))
+                job = JOBS.get(job_name)
+                if not job:
+                    raise KeyError(f"Unknown job '{job_name}'")
+                result = job(args, context)
+                output_queue.put(encode_payload([task_id, "success", result]))
             except Exception as e:
-                output_queue.put((task_id, "error", str(e)))
-                
+                output_queue.put(encode_payload([task_id, "error", str(e)]))
+
         except Exception as e:
-            print(f"[WORKER ERROR] {e}")
+            logger.exception("Worker loop error: %s", e)
+
 
 class WorkerManager:
-    def __init__(self, num_workers=1):
-        self.input_queue = multiprocessing.Queue()
-        self.output_queue = multiprocessing.Queue()
+    def __init__(self, num_workers: Optional[int] = None):
+        if num_workers is None:
+            num_workers = getattr(config, "WORKER_POOL_SIZE", 1)
+        self.num_workers = max(1, int(num_workers))
+        self.input_queues: List[Any] = []
+        self.output_queue = None
         self.workers = []
-        self.num_workers = num_workers
-        self.callbacks = {} # task_id -> callback_func
+        # task_id -> (callback_func, deadline); insertion order is deadline order
+        self.callbacks: Dict[str, Tuple[Callable, float]] = {}
+        self.context_keys = set()
+        self._next_worker = 0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.workers)
+
+    def has_context(self, key: str) -> bool:
+        return key in self.context_keys
 
     def start(self):
+        if self.workers:
+            return
+        self.output_queue = multiprocessing.Queue()
         for _ in range(self.num_workers):
+            # One input queue per worker so context updates reach every process.
+            input_queue = multiprocessing.Queue()
             p = multiprocessing.Process(
-                target=_worker_process, 
-                args=(self.input_queue, self.output_queue)
+                target=_worker_process,
+                args=(input_queue, self.output_queue)
             )
             p.daemon = True
             p.start()
+            self.input_queues.append(input_queue)
             self.workers.append(p)
-        print(f"[WORKER] Started {self.num_workers} background worker processes.")
+        logger.info("Started %d background worker processes.", self.num_workers)
+
+    def set_context(self, key: str, value: Any):
+        """
+        Broadcasts a piece of read-only data to every worker (e.g. the room graph).
+        Jobs read it from their 'context' argument.
+        """
+        if not self.is_running:
+            return
+        frame = encode_payload({"id": None, "job": SET_CONTEXT_JOB, "args": {"key": key, "value": value}})
+        for input_queue in self.input_queues:
+            input_queue.put(frame)
+        self.context_keys.add(key)
 
-    def submit_task(self, task_id: str, func: Callable, callback: Callable, *args, **kwargs):
+    def submit_task(self, job_name: str, args: Dict[str, Any], callback: Optional[Callable] = None) -> Optional[str]:
         """
-        Submits a task to the worker pool.
-        func: The heavy function to run (Must be pickle-able, i.e., top-level function)
-        callback: Function to call with the result on the main thread
+        Submits a named job (see worker_jobs.JOBS) to the worker pool.
+        args: Plain data only (dict/list/str/int/float/bool/None).
+        callback: Called as callback(status, data) on the game loop thread.
+                  status is "success", "error", or "timeout" when no reply
+                  came within WORKER_TASK_TIMEOUT_SECONDS.
+        Returns the task_id, or None if the pool is not running.
         """
-        self.callbacks[task_id] = callback
-        self.input_queue.put((task_id, func, args, kwargs))
+        if not self.is_running:
+            return None
+        task_id = uuid.uuid4().hex
+        if callback:
+            self.callbacks[task_id] = (callback, time.time() + config.WORKER_TASK_TIMEOUT_SECONDS)
+        frame = encode_payload({"id": task_id, "job": job_name, "args": args})
+
+        # Round-robin dispatch
+        input_queue = self.input_queues[self._next_worker % len(self.input_queues)]
+        self._next_worker += 1
+        input_queue.put(frame)
+        return task_id
 
-    def check_results(self):
+    def check_results(self, max_results: Optional[int] = None) -> int:
         """
         Call this from the main game loop to process completed tasks.
+        Never blocks. Returns the number of results handled.
         """
-        while not self.output_queue.empty():
+        if not self.is_running:
+            return 0
+        if max_results is None:
+            max_results = getattr(config, "WORKER_RESULTS_PER_POLL", 50)
+
+        handled = 0
+        while handled < max_results and not self.output_queue.empty():
             try:
-                task_id, status, data = self.output_queue.get_nowait()
-                callback = self.callbacks.pop(task_id, None)
-                if callback:
-                    callback(status, data)
-            except:
+                frame = self.output_queue.get_nowait()
+            except Exception:
                 break
+            handled += 1
+
+            task_id, status, data = decode_payload(frame)
+            # A reply after its callback expired is dropped here
+            entry = self.callbacks.pop(task_id, None)
+            if not entry:
+                continue
+            self._run_callback(task_id, entry[0], status, data)
+
+        self._expire_callbacks()
+        return handled
+
+    def _expire_callbacks(self):
+        now = time.time()
+        while self.callbacks:
+            task_id, (callback, deadline) = next(iter(self.callbacks.items()))
+            if deadline > now:
+                break
+            del self.callbacks[task_id]
+            logger.warning("Task %s got no reply within %ss.", task_id, config.WORKER_TASK_TIMEOUT_SECONDS)
+            self._run_callback(task_id, callback, "timeout", f"No reply within {config.WORKER_TASK_TIMEOUT_SECONDS}s")
+
+    def _run_callback(self, task_id: str, callback: Callable, status: str, data: Any):
+        try:
+            callback(status, data)
+        except Exception as e:
+            logger.exception("Callback for task %s failed: %s", task_id, e)
+
+    def prime_from_world(self, world: 'World'):
+        """
+        Ships static assets to the workers after World.load_all_data():
+        room templates are compiled into the pathfinding graph by a worker
+        and then broadcast back out.
+        """
+        if not self.is_running:
+            return
+
+        room_stubs = {}
+        for room_id, template in world.room_templates.items():
+            room_stubs[room_id] = {
+                "exits": template.get("exits", {}),
+                "objects": [
+                    {
+                        "name": obj.get("name"),
+                        "verbs": obj.get("verbs", []),
+                        "keywords": obj.get("keywords", []),
+                        "target_room": obj.get("target_room"),
+                        "interactions": obj.get("interactions", {})
+                    }
+                    for obj in template.get("objects", [])
+                    if obj.get("target_room") or obj.get("interactions")
+                ]
+            }
+            # Drop the key entirely when absent so resolve logic matches the original
+            for obj_stub in room_stubs[room_id]["objects"]:
+                if obj_stub["target_room"] is None:
+                    del obj_stub["target_room"]
+
+        def _on_graph_compiled(status, data):
+            if status != "success":
+                logger.error("Room graph compilation failed: %s", data)
+                return
+            self.set_context("room_graph", data)
+            logger.info("Room graph compiled (%d rooms).", len(data))
+
+        self.submit_task("compile_room_graph", {"rooms": room_stubs}, _on_graph_compiled)
 
     def stop(self):
-        for _ in range(self.num_workers):
-            self.input_queue.put(None)
+        for input_queue in self.input_queues:
+            input_queue.put(None)
         for p in self.workers:
-            p.join()
\ No newline at end of file
+            p.join(timeout=5)
+        self.workers = []
+        self.input_queues = []
+        self.callbacks.clear()
+        self.context_keys.clear()
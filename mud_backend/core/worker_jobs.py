@@ -0,0 +1,99 @@
+# mud_backend/core/worker_jobs.py
+"""
+Built-in jobs for the background worker pool.
+
+Everything in this module runs INSIDE the worker processes, so it must only
+operate on plain data (dicts, lists, strings, numbers). Never import World,
+Player, Flask or SocketIO from here.
+
+Every job has the signature: job(args: dict, context: dict) -> Any
+'context' is the per-process cache filled by the main process through
+WorkerManager.set_context() (e.g. the compiled room graph).
+"""
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+
+def compile_room_graph(args: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, List[List[str]]]:
+    """
+    Compiles room stubs into an adjacency list for pathfinding.
+    Input:  {"rooms": {room_id: {"exits": {...}, "objects": [...]}}}
+    Output: {room_id: [[direction, target_room_id], ...]}
+    Mirrors room_handler.find_path: standard exits plus ENTER/CLIMB objects,
+    where every keyword and the object name become usable "directions".
+    """
+    graph = {}
+    for room_id, room in args.get("rooms", {}).items():
+        edges = dict(room.get("exits", {}) or {})
+
+        for obj in room.get("objects", []) or []:
+            verbs = [v.upper() for v in obj.get("verbs", []) or []]
+            target_room = None
+            if "ENTER" in verbs:
+                target_room = _resolve_interaction_room(obj, "ENTER")
+            if not target_room and "CLIMB" in verbs:
+                target_room = _resolve_interaction_room(obj, "CLIMB")
+            if not target_room:
+                continue
+
+            for keyword in obj.get("keywords", []) or []:
+                if keyword not in edges:
+                    edges[keyword] = target_room
+            obj_name = (obj.get("name") or "").lower()
+            if obj_name and obj_name not in edges:
+                edges[obj_name] = target_room
+
+        graph[room_id] = [[direction, target] for direction, target in edges.items()]
+    return graph
+
+
+def _resolve_interaction_room(obj: Dict[str, Any], verb: str) -> Optional[str]:
+    """Plain-data copy of room_handler.resolve_interaction_room."""
+    if "target_room" in obj:
+        return obj["target_room"]
+    interactions = obj.get("interactions", {}) or {}
+    for key, data in interactions.items():
+        if key.upper() == verb.upper() and data.get("type") == "move":
+            return data.get("value")
+    return None
+
+
+def find_path(args: Dict[str, Any], context: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    BFS over the compiled room graph held in context["room_graph"].
+    Input:  {"start": room_id, "end": room_id}
+    Output: list of directions, or None if unreachable.
+    """
+    graph = context.get("room_graph")
+    if graph is None:
+        raise RuntimeError("room_graph context not loaded")
+
+    start_room_id = args.get("start")
+    end_room_id = args.get("end")
+
+    queue = deque([start_room_id])
+    came_from = {start_room_id: None}
+
+    while queue:
+        current_room_id = queue.popleft()
+        if current_room_id == end_room_id:
+            path = []
+            while came_from[current_room_id] is not None:
+                prev_room_id, direction = came_from[current_room_id]
+                path.append(direction)
+                current_room_id = prev_room_id
+            path.reverse()
+            return path
+
+        for direction, next_room_id in graph.get(current_room_id, []):
+            if next_room_id not in came_from:
+                came_from[next_room_id] = (current_room_id, direction)
+                queue.append(next_room_id)
+
+    return None
+
+
+JOBS = {
+    "compile_room_graph": compile_room_graph,
+    "find_path": find_path,
+}
@@ -0,0 +1,386 @@
+# mud_backend/tools/bench.py
+"""
+Micro-benchmarks for the hot paths.
+
+Each benchmark builds its inputs once (from a World loaded out of the real
+data/ tree through the in-memory storage stand-in, so no MongoDB) and then
+times one call repeatedly, timeit-style: calls are batched until a batch
+takes ~0.2s, and the best of --repeat batches is the score.
+
+    python -m mud_backend.tools.bench                      # run everything
+    python -m mud_backend.tools.bench -k map -k path       # name filters
+    python -m mud_backend.tools.bench --save base.json     # record a baseline
+    python -m mud_backend.tools.bench --compare base.json  # diff against it
+
+Lower is better. With --compare, changes under --threshold percent are
+reported as noise. A benchmark that fails to set up (some also check an
+invariant, such as a plain command not building the cold player profile)
+makes the run exit non-zero.
+"""
+import argparse
+import copy
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from mud_backend import config
+from mud_backend.core import db
+from mud_backend.core.memory_db import MemoryDatabase
+
+# name -> setup(ctx) returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[['BenchContext'], Callable[[], Any]]] = {}
+
+TARGET_BATCH_SECONDS = 0.2
+BENCH_PLAYER_NAME = "Benchmark"
+BENCH_ROOM = "town_square"
+MARKET_ROOMS_FILE = "rooms_golden_market.json"
+MAP_VISITED_ROOMS = 500
+CROSS_ZONE_FROM = "aethels_crossing"
+FURNACE_ROOM = "armory_furnace_room"
+FURNACE_COUNT = 1000
+COMMAND_PLAYER_NAME = "Benchcommand"
+
+
+def benchmark(name: str):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+class BenchContext:
+    """The World (and a logged-in player) every benchmark shares."""
+    def __init__(self, seed: int):
+        from mud_backend.core.game_state import World
+        from mud_backend.core.game_objects import Player
+
+        random.seed(seed)
+        db.use_database(MemoryDatabase())
+        db.ensure_initial_data()
+
+        self.world = World()
+        self.world.load_all_data(db)
+
+        player_data = {
+            "name": BENCH_PLAYER_NAME,
+            "level": 20,
+            "game_state": "playing",
+            "chargen_step": 99,
+            "stats": {stat: 70 for stat in ("STR", "CON", "DEX", "AGI", "LOG", "INT", "WIS", "INF", "ZEA", "ESS", "DIS", "AUR")},
+            "appearance": {"race": "Human"},
+            "skills": {"brawling": 40, "edged_weapons": 40, "shield_use": 20, "dodging": 30},
+        }
+        self.player = Player(self.world, BENCH_PLAYER_NAME, BENCH_ROOM, player_data)
+        self.world.set_player_info(BENCH_PLAYER_NAME.lower(), {
+            "player_name": BENCH_PLAYER_NAME,
+            "player_obj": self.player,
+            "current_room_id": BENCH_ROOM,
+            "last_seen": time.time(),
+            "sid": None,
+        })
+
+    def monster(self) -> Dict[str, Any]:
+        """A live copy of the first hostile monster template, with its own uid."""
+        for monster_id, template in sorted(self.world.game_monster_templates.items()):
+            if template.get("is_monster") and template.get("stats"):
+                mob = copy.deepcopy(template)
+                mob.setdefault("monster_id", monster_id)
+                mob["uid"] = f"bench_{monster_id}"
+                return mob
+        raise RuntimeError("No monster templates with stats found in data/")
+
+
+# --- Benchmarks ---
+
+@benchmark("combat.resolve_attack.player_vs_monster")
+def bench_resolve_attack_player(ctx: BenchContext):
+    from mud_backend.core.combat_system import resolve_attack
+    mob = ctx.monster()
+    return lambda: resolve_attack(ctx.world, ctx.player, mob, ctx.world.game_items)
+
+
+@benchmark("combat.resolve_attack.monster_vs_player")
+def bench_resolve_attack_monster(ctx: BenchContext):
+    from mud_backend.core.combat_system import resolve_attack
+    mob = ctx.monster()
+
+    def run():
+        resolve_attack(ctx.world, mob, ctx.player, ctx.world.game_items)
+        ctx.player.wounds.clear()
+    return run
+
+
+@benchmark("rooms.hydrate_room_objects.golden_market")
+def bench_hydrate_market(ctx: BenchContext):
+    from mud_backend.core.game_objects import Room
+    from mud_backend.core.room_handler import hydrate_room_objects
+
+    market_ids = _zone_room_ids(MARKET_ROOMS_FILE)
+    largest = sorted(
+        (room_id for room_id in market_ids if room_id in ctx.world.assets.room_templates),
+        key=lambda room_id: -len(ctx.world.assets.room_templates[room_id].get("objects", []))
+    )[:5]
+    templates = [ctx.world.assets.room_templates[room_id] for room_id in largest]
+
+    def run():
+        for template in templates:
+            room = Room(template["room_id"], template["name"], template.get("description", ""), copy.deepcopy(template))
+            hydrate_room_objects(room, ctx.world)
+    return run
+
+
+@benchmark("rooms.get_map_data.500_visited")
+def bench_map_data(ctx: BenchContext):
+    from mud_backend.core.room_handler import _get_map_data
+    # Capped at however many rooms data/ defines
+    room_ids = sorted(ctx.world.assets.room_templates)
+    for room_id in room_ids[:MAP_VISITED_ROOMS]:
+        ctx.player.visited_rooms.add(room_id)
+    return lambda: _get_map_data(ctx.player, ctx.world)
+
+
+@benchmark("rooms.get_map_update.500_visited_steady")
+def bench_map_update(ctx: BenchContext):
+    from mud_backend.core.room_handler import get_map_update
+    room_ids = sorted(ctx.world.assets.room_templates)
+    for room_id in room_ids[:MAP_VISITED_ROOMS]:
+        ctx.player.visited_rooms.add(room_id)
+    # The client already has the map; each call is one more step's delta
+    get_map_update(ctx.player, ctx.world, "bench_sid")
+    return lambda: get_map_update(ctx.player, ctx.world, "bench_sid")
+
+
+@benchmark("rooms.find_path.cross_zone")
+def bench_find_path(ctx: BenchContext):
+    from mud_backend.core.room_handler import find_path
+    start, end = _cross_zone_route(ctx)
+    find_path(ctx.world, start, end)  # hydrate the rooms on the way once
+    return lambda: find_path(ctx.world, start, end)
+
+
+@benchmark("player.to_dict")
+def bench_player_to_dict(ctx: BenchContext):
+    return lambda: ctx.player.to_dict()
+
+
+@benchmark("player.get_vitals")
+def bench_player_get_vitals(ctx: BenchContext):
+    def run():
+        # Dirty one vital so the derived stats path is exercised, not just the cache
+        ctx.player.hp = max(1, ctx.player.hp - 1)
+        return ctx.player.get_vitals()
+    return run
+
+
+@benchmark("command.execute_command.exp")
+def bench_execute_command(ctx: BenchContext):
+    from mud_backend.core.command_executor import execute_command
+    from mud_backend.core.game_objects import Player
+    # A player of its own: other benchmarks build the shared player's profile
+    player = Player(ctx.world, COMMAND_PLAYER_NAME, BENCH_ROOM, {
+        "name": COMMAND_PLAYER_NAME,
+        "game_state": "playing",
+        "chargen_step": 99,
+        "appearance": {"race": "Human"},
+        "aliases": {"xp": "exp"},
+    })
+    ctx.world.set_player_info(COMMAND_PLAYER_NAME.lower(), {
+        "player_name": COMMAND_PLAYER_NAME,
+        "player_obj": player,
+        "current_room_id": BENCH_ROOM,
+        "last_seen": time.time(),
+        "sid": None,
+    })
+    execute_command(ctx.world, COMMAND_PLAYER_NAME, "exp", None)
+    execute_command(ctx.world, COMMAND_PLAYER_NAME, "xp", None)
+    # Alias lookup is on every command and must not build the cold profile
+    if player._profile is not None:
+        raise RuntimeError("execute_command built the player's cold profile")
+    return lambda: execute_command(ctx.world, COMMAND_PLAYER_NAME, "exp", None)
+
+
+@benchmark("store.sharded_store.contention_4_threads")
+def bench_sharded_store(ctx: BenchContext):
+    from mud_backend.core.game_state import ShardedStore
+    store = ShardedStore(num_shards=32)
+    keys = [f"combatant_{i}" for i in range(512)]
+
+    def worker(offset: int):
+        for i in range(2000):
+            key = keys[(i * 7 + offset) % len(keys)]
+            if i % 4 == 0:
+                store.set(key, {"next_action_time": i})
+            else:
+                store.get(key)
+
+    def run():
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return run
+
+
+@benchmark("loot.treasure_manager.generate_dynamic_loot")
+def bench_dynamic_loot(ctx: BenchContext):
+    mob = ctx.monster()
+    ctx.world.treasure_manager.initialize_caches()
+    return lambda: ctx.world.treasure_manager.generate_dynamic_loot(mob)
+
+
+@benchmark("crafting.process_crafting_stations.1000_furnaces")
+def bench_crafting_step(ctx: BenchContext):
+    from mud_backend.core.game_loop.crafting import process_crafting_stations
+    # One furnace per "forge", all lit, in the armory's smelting room
+    ctx.world.room_manager.get_room(FURNACE_ROOM)
+    furnaces = []
+    for n in range(FURNACE_COUNT):
+        furnace = {"uid": f"bench_furnace_{n}", "name": f"furnace {n}", "keywords": ["furnace"], "state": {"fuel": 50, "temp": 900 + n % 600, "air_flow": 50, "ore": 50}}
+        ctx.world.crafting_stations.wake(FURNACE_ROOM, furnace)
+        furnaces.append(furnace)
+
+    def run():
+        process_crafting_stations(ctx.world, lambda room_id, message, msg_type: None)
+        for furnace in furnaces:
+            furnace["state"]["fuel"] = 50
+            furnace["state"]["ore"] = 50
+    return run
+
+
+def _zone_room_ids(pattern: str) -> List[str]:
+    """Room ids defined in the data/zones files matching 'pattern'."""
+    room_ids = []
+    for file_path in sorted(glob.glob(os.path.join(config.DATA_PATH, "zones", "**", pattern), recursive=True)):
+        with open(file_path, "r") as f:
+            content = f.read()
+        if content.strip():
+            room_ids.extend(room["room_id"] for room in json.loads(content) if room.get("room_id"))
+    return room_ids
+
+
+def _cross_zone_route(ctx: BenchContext):
+    """Town square to the furthest reachable room outside Aethel's Crossing."""
+    from mud_backend.core.room_handler import find_path
+    town_rooms = set(_zone_room_ids(os.path.join(CROSS_ZONE_FROM, "*.json")))
+    best = (0, BENCH_ROOM)
+    for room_id in _zone_room_ids("rooms_*.json"):
+        if room_id in town_rooms:
+            continue
+        path = find_path(ctx.world, BENCH_ROOM, room_id)
+        if path and len(path) > best[0]:
+            best = (len(path), room_id)
+    if best[0] == 0:
+        raise RuntimeError(f"No room outside {CROSS_ZONE_FROM} is reachable from {BENCH_ROOM}")
+    return BENCH_ROOM, best[1]
+
+
+# --- Runner ---
+
+def _time_batches(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    # Calibrate: grow the batch until it takes TARGET_BATCH_SECONDS
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= TARGET_BATCH_SECONDS or number >= 1_000_000:
+            break
+        number *= 2 if elapsed < TARGET_BATCH_SECONDS / 4 else 1.5
+        number = int(number)
+
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number)
+    return {
+        "best_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "calls_per_batch": number,
+    }
+
+
+def run(filters: List[str], repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    print("[BENCH] Building world from data/ ...")
+    ctx = BenchContext(seed)
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if filters and not any(f in name for f in filters):
+            continue
+        try:
+            func = setup(ctx)
+            results[name] = _time_batches(func, repeat)
+        except Exception as e:
+            print(f"[BENCH] {name} failed: {e}")
+            continue
+        print(f"[BENCH] {name:<48} best {results[name]['best_us']:>12.2f}us  median {results[name]['median_us']:>12.2f}us")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> int:
+    """Prints the change against the baseline. Returns the number of regressions."""
+    regressions = 0
+    print(f"\n[BENCH] {'Benchmark':<48} {'baseline':>12} {'now':>12} {'change':>9}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"[BENCH] {name:<48} {'-':>12} {stats['best_us']:>12.2f} {'new':>9}")
+            continue
+        change = (stats["best_us"] - base["best_us"]) / base["best_us"] * 100.0 if base["best_us"] else 0.0
+        verdict = ""
+        if change > threshold:
+            verdict = "  SLOWER"
+            regressions += 1
+        elif change < -threshold:
+            verdict = "  faster"
+        print(f"[BENCH] {name:<48} {base['best_us']:>12.2f} {stats['best_us']:>12.2f} {change:>+8.1f}%{verdict}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the MUD's hot paths (no MongoDB needed).")
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="Write results to this JSON file (a baseline).")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Percent change treated as noise.")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit.")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    results = run(args.filters, args.repeat, args.seed)
+    selected = [name for name in BENCHMARKS if not args.filters or any(f in name for f in args.filters)]
+    failed = len(selected) - len(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"[BENCH] Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f).get("results", {})
+        if compare(results, baseline, args.threshold):
+            return 1
+    # A benchmark whose setup check fails (e.g. a cold profile built) fails the run
+    if failed:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+# mud_backend/tools/loadtest.py
+"""
+Headless load generator.
+
+Boots the real server module (app.py) against the in-memory storage stand-in
+(core/memory_db.py), logs in N simulated players through the Flask-SocketIO
+test client (so every command goes through handle_command_event and the game
+event queue), then drives game_loop_iteration() at the server's cadence while
+scripted personas play:
+
+    walker     - wanders through random exits
+    traveller  - GOTO between named destinations
+    hunter     - attacks monsters where it finds them, wanders otherwise
+    trader     - goes to shops and browses (list / inventory / balance)
+    chatter    - say / who / exp / health / stance
+
+Reports command latency percentiles (input -> command_response), game loop
+iteration time, emitted bytes per player and traced memory per player.
+Needs no network and no MongoDB:
+
+    python -m mud_backend.tools.loadtest --players 100 --duration 60
+    python -m mud_backend.tools.loadtest --mix walker=3,hunter=1 --json report.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from mud_backend.core import db
+from mud_backend.core.memory_db import MemoryDatabase
+
+PERSONAS = ("walker", "traveller", "hunter", "trader", "chatter")
+
+# Seconds between commands (uniform range) per persona
+THINK_TIME = {
+    "walker": (1.0, 3.0),
+    "traveller": (4.0, 8.0),
+    "hunter": (1.5, 3.0),
+    "trader": (2.0, 5.0),
+    "chatter": (2.0, 6.0),
+}
+
+GOTO_DESTINATIONS = ("townhall", "armory", "furrier", "apothecary", "temple", "study")
+SHOP_DESTINATIONS = ("armory", "furrier", "apothecary")
+CHATTER_LINES = (
+    "Anyone heading out to hunt?",
+    "Selling a fine pelt, ask me.",
+    "Where is the temple again?",
+    "Good morning, Aethelgard!",
+)
+LOAD_PASSWORD = "loadtest"
+LOAD_START_ROOM = "town_square"
+
+
+def _bot_name(index: int) -> str:
+    """Alphabetic character names (the login flow rejects digits)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("a") + rem) + letters
+    return ("Loadbot" + letters).capitalize()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * (pct / 100.0)
+    low = int(k)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (k - low)
+
+
+def _summarize(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(_percentile(ordered, 50) * scale, 3),
+        "p90": round(_percentile(ordered, 90) * scale, 3),
+        "p99": round(_percentile(ordered, 99) * scale, 3),
+        "max": round((ordered[-1] if ordered else 0.0) * scale, 3),
+    }
+
+
+def seed_load_players(database, count: int) -> List[str]:
+    """One account + one ready-to-play character per bot."""
+    from werkzeug.security import generate_password_hash
+
+    # Hashing is deliberately slow; every bot shares one hash
+    password_hash = generate_password_hash(LOAD_PASSWORD)
+    names = []
+    for index in range(count):
+        name = _bot_name(index)
+        username = f"load_{name.lower()}"
+        database.accounts.insert_one({"username": username, "password_hash": password_hash})
+        database.players.insert_one({
+            "name": name,
+            "account_username": username,
+            "current_room_id": LOAD_START_ROOM,
+            "level": 5, "experience": 0, "game_state": "playing", "chargen_step": 99,
+            "stats": {
+                "STR": 70, "CON": 70, "DEX": 70, "AGI": 70, "LOG": 70, "INT": 70, "WIS": 70, "INF": 70,
+                "ZEA": 70, "ESS": 70, "DIS": 70, "AUR": 70
+            },
+            "appearance": {"race": "Human"},
+        })
+        names.append(name)
+    return names
+
+
+class LoadBot:
+    def __init__(self, server, name: str, persona: str, rng: random.Random):
+        self.server = server
+        self.name = name
+        self.persona = persona
+        self.rng = rng
+        self.client = server.socketio.test_client(server.app)
+        self.sent_at: Optional[float] = None
+        self.next_action_at = 0.0
+        self.latencies: List[float] = []
+        self.bytes_received = 0
+        self.events_received = 0
+        self.errors = 0
+        self._script: List[str] = []
+
+    # --- Connection ---
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        packets = self.client.get_received()
+        for packet in packets:
+            self.events_received += 1
+            self.bytes_received += len(json.dumps(packet.get("args"), default=str))
+        return packets
+
+    def login(self) -> bool:
+        username = f"load_{self.name.lower()}"
+        for command in (username, LOAD_PASSWORD, self.name):
+            self.client.emit("command", {"command": command})
+        logged_in = any(p.get("name") == "command_response" for p in self._drain())
+        return logged_in
+
+    def disconnect(self):
+        if self.client.is_connected():
+            self.client.disconnect()
+
+    # --- Personas ---
+
+    def _player(self):
+        return self.server.world.get_player_obj(self.name.lower())
+
+    def _wander_command(self, player) -> str:
+        room = self.server.world.get_room(player.current_room_id) or {}
+        exits = list(room.get("exits", {}).keys())
+        if not exits:
+            return "look"
+        return f"go {self.rng.choice(exits)}"
+
+    def _hunt_command(self, player) -> str:
+        room = self.server.world.get_room(player.current_room_id) or {}
+        for obj in room.get("objects", []):
+            if obj.get("is_monster") and not obj.get("is_dead"):
+                keywords = obj.get("keywords") or [obj.get("name", "")]
+                return f"attack {keywords[0]}"
+        return self._wander_command(player)
+
+    def _next_command(self) -> str:
+        player = self._player()
+        if not player:
+            return "look"
+        if self._script:
+            return self._script.pop(0)
+        if self.persona == "walker":
+            return self._wander_command(player)
+        if self.persona == "traveller":
+            return f"goto {self.rng.choice(GOTO_DESTINATIONS)}"
+        if self.persona == "hunter":
+            return self._hunt_command(player)
+        if self.persona == "trader":
+            self._script = ["list", "inventory", "balance", "look"]
+            return f"goto {self.rng.choice(SHOP_DESTINATIONS)}"
+        return self.rng.choice((
+            f"say {self.rng.choice(CHATTER_LINES)}", "who", "exp", "health",
+            f"stance {self.rng.choice(('neutral', 'guarded', 'forward'))}",
+        ))
+
+    # --- Driving ---
+
+    def maybe_act(self, now: float):
+        # One outstanding command at a time, like a player waiting on the prompt
+        if self.sent_at is not None or now < self.next_action_at:
+            return
+        self.sent_at = time.perf_counter()
+        self.client.emit("command", {"command": self._next_command()})
+
+    def collect(self, now: float):
+        for packet in self._drain():
+            if packet.get("name") == "command_response" and self.sent_at is not None:
+                self.latencies.append(time.perf_counter() - self.sent_at)
+                self.sent_at = None
+                low, high = THINK_TIME[self.persona]
+                self.next_action_at = now + self.rng.uniform(low, high)
+        # Give up on a command that never answered (e.g. swallowed while frozen)
+        if self.sent_at is not None and time.perf_counter() - self.sent_at > 30.0:
+            self.errors += 1
+            self.sent_at = None
+
+
+def _parse_mix(mix: str) -> List[str]:
+    weighted = []
+    for part in mix.split(","):
+        persona, _, weight = part.partition("=")
+        persona = persona.strip()
+        if persona not in PERSONAS:
+            raise SystemExit(f"Unknown persona '{persona}'. Choose from: {', '.join(PERSONAS)}")
+        weighted.extend([persona] * max(1, int(weight or 1)))
+    return weighted
+
+
+def run(players: int, duration: float, mix: str, seed: int, tick_sleep: float) -> Dict[str, Any]:
+    rng = random.Random(seed)
+
+    print("[LOADTEST] Seeding in-memory database...")
+    db.use_database(MemoryDatabase())
+    db.ensure_initial_data()
+    names = seed_load_players(db.get_db(), players)
+
+    # Imported late: app.py builds the World and monkey-patches on import
+    from mud_backend import app as server
+    from mud_backend.core import quest_handler
+
+    print("[LOADTEST] Loading world data...")
+    server.prepare_world(server.world)
+    quest_handler.initialize_quest_listeners(server.world)
+
+    tracemalloc.start()
+    memory_before, _ = tracemalloc.get_traced_memory()
+
+    persona_pool = _parse_mix(mix)
+    bots = [LoadBot(server, name, rng.choice(persona_pool), rng) for name in names]
+    with server.app.app_context():
+        logged_in = sum(1 for bot in bots if bot.login())
+        # Let login-time work settle (room joins, courier checks)
+        server.game_loop_iteration(server.world)
+    for bot in bots:
+        bot._drain()
+        bot.bytes_received = 0
+        bot.events_received = 0
+
+    memory_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"[LOADTEST] {logged_in}/{players} players logged in. Running for {duration:.0f}s...")
+
+    iteration_times: List[float] = []
+    started = time.time()
+    with server.app.app_context():
+        while time.time() - started < duration:
+            now = time.time()
+            for bot in bots:
+                bot.maybe_act(now)
+
+            iteration_start = time.perf_counter()
+            server.game_loop_iteration(server.world)
+            iteration_times.append(time.perf_counter() - iteration_start)
+
+            now = time.time()
+            for bot in bots:
+                bot.collect(now)
+            server.socketio.sleep(tick_sleep)
+
+    for bot in bots:
+        bot.disconnect()
+
+    elapsed = time.time() - started
+    latencies = [value for bot in bots for value in bot.latencies]
+    by_persona: Dict[str, List[float]] = {}
+    for bot in bots:
+        by_persona.setdefault(bot.persona, []).extend(bot.latencies)
+    total_bytes = sum(bot.bytes_received for bot in bots)
+
+    return {
+        "players": players,
+        "logged_in": logged_in,
+        "duration_s": round(elapsed, 2),
+        "commands": len(latencies),
+        "commands_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "unanswered_commands": sum(bot.errors for bot in bots),
+        "command_latency_ms": _summarize(latencies),
+        "command_latency_ms_by_persona": {persona: _summarize(values) for persona, values in sorted(by_persona.items())},
+        "loop_iteration_ms": _summarize(iteration_times),
+        "emitted_bytes_per_player": round(total_bytes / max(1, len(bots)), 1),
+        "emitted_bytes_per_player_per_s": round(total_bytes / max(1, len(bots)) / elapsed, 1) if elapsed else 0.0,
+        "events_per_player": round(sum(bot.events_received for bot in bots) / max(1, len(bots)), 1),
+        "traced_memory_per_player_kb": round((memory_after - memory_before) / max(1, logged_in) / 1024, 1),
+    }
+
+
+def _print_report(report: Dict[str, Any]):
+    print("\n[LOADTEST] ===== Results =====")
+    print(f"  players:            {report['logged_in']}/{report['players']}")
+    print(f"  duration:           {report['duration_s']}s")
+    print(f"  commands:           {report['commands']} ({report['commands_per_s']}/s, {report['unanswered_commands']} unanswered)")
+    lat = report["command_latency_ms"]
+    print(f"  command latency ms: p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+    for persona, stats in report["command_latency_ms_by_persona"].items():
+        print(f"    {persona:<10} n={stats['count']:<6} p50={stats['p50']} p99={stats['p99']}")
+    loop = report["loop_iteration_ms"]
+    print(f"  loop iteration ms:  p50={loop['p50']} p90={loop['p90']} p99={loop['p99']} max={loop['max']}")
+    print(f"  emitted per player: {report['emitted_bytes_per_player']} bytes "
+          f"({report['emitted_bytes_per_player_per_s']} B/s, {report['events_per_player']} events)")
+    print(f"  memory per player:  {report['traced_memory_per_player_kb']} KiB (traced, at login)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless MUD load generator (no network, no MongoDB).")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of simulated play.")
+    parser.add_argument("--mix", default=",".join(PERSONAS), help="Persona weights, e.g. walker=3,hunter=1,chatter=2")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tick-sleep", type=float, default=0.05, help="Sleep between loop iterations (server uses 0.05).")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file.")
+    args = parser.parse_args(argv)
+
+    report = run(args.players, args.duration, args.mix, args.seed, args.tick_sleep)
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[LOADTEST] Report written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
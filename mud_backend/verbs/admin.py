@@ -4,6 +4,8 @@ from mud_backend.verbs.base_verb import BaseVerb
 from mud_backend.core.registry import VerbRegistry
 from mud_backend import config
 from mud_backend.core import db
+from mud_backend.core import log
+from mud_backend.core import tracing
 
 @VerbRegistry.register(["givewealth", "addmoney"], admin_only=True)
 class GiveWealth(BaseVerb):
@@ -109,6 +111,7 @@ class Wiz(BaseVerb):
         else:
             self.player.flags["invisible"] = "off"
             self.player.send_message("You reappear (Admin Invisibility OFF).")
+            self.world.entity_manager.queue_aggro_for_player(self.player.name, self.player.current_room_id)
             self.world.broadcast_to_room(self.room.room_id, f"{self.player.name} appears out of thin air.", "ambient")
 
 @VerbRegistry.register(["restore", "heal_target"], admin_only=True)
@@ -399,4 +402,102 @@ class Renew(BaseVerb):
             if target != self.player:
                 target.send_message(f"An admin renewed your {location}.")
         else:
-            self.player.send_message(f"{target.name} has no wounds or scars on {location}.")
\ No newline at end of file
+            self.player.send_message(f"{target.name} has no wounds or scars on {location}.")
+
+@VerbRegistry.register(["tickprof", "tickstats"], admin_only=True, stateless=True)
+def tickprof(world, player, room, args, command):
+    """
+    Game loop phase timings (see core/game_loop/profiler.py).
+    Usage: TICKPROF | TICKPROF SLOW [count] | TICKPROF RESET | TICKPROF ON|OFF
+    """
+    profiler = world.tick_profiler
+    sub = args[0].lower() if args else ""
+
+    if sub == "reset":
+        profiler.reset()
+        player.send_message("Tick profiler reset.")
+        return
+
+    if sub in ("on", "off"):
+        profiler.enabled = sub == "on"
+        player.send_message(f"Tick profiler {sub.upper()}.")
+        return
+
+    if sub == "slow":
+        count = int(args[1]) if len(args) > 1 and args[1].isdigit() else 3
+        slow_ticks = profiler.snapshot()["slow_ticks"][-count:]
+        if not slow_ticks:
+            player.send_message(f"No loop passes over {profiler.slow_ns / 1_000_000:.0f}ms recorded.")
+            return
+        for entry in reversed(slow_ticks):
+            when = time.strftime("%H:%M:%S", time.localtime(entry["at"]))
+            player.send_message(f"\n--- {when}: {entry['total_ms']:.1f}ms ({entry['samples']} samples) ---")
+            for name, duration_ms in entry["phases_ms"].items():
+                player.send_message(f"  {name:<22} {duration_ms:>9.2f}ms")
+            for stack in entry["stacks"][:1]:
+                player.send_message(f"  Hottest stack ({stack['count']} samples):")
+                for frame in stack["stack"]:
+                    player.send_message(f"    {frame}")
+        return
+
+    state = "ON" if profiler.enabled else "OFF"
+    player.send_message(f"\n--- Tick Profiler ({state}, budget {profiler.slow_ns / 1_000_000:.0f}ms) ---")
+    for row in profiler.format_table():
+        player.send_message(row)
+    player.send_message(f"Slow ticks logged: {len(profiler.slow_ticks)} (TICKPROF SLOW to view)")
+
+@VerbRegistry.register(["loglevel", "logs"], admin_only=True, stateless=True)
+def loglevel(world, player, room, args, command):
+    """
+    Shows or changes server log levels (see core/log.py).
+    Usage: LOGLEVEL | LOGLEVEL <subsystem|all> <DEBUG|INFO|WARNING|ERROR>
+    """
+    if len(args) < 2:
+        player.send_message("\n--- Log Levels ---")
+        for subsystem, level in log.subsystem_levels().items():
+            player.send_message(f"  {subsystem:<15} {level}")
+        player.send_message("Usage: LOGLEVEL <subsystem|all> <DEBUG|INFO|WARNING|ERROR>")
+        return
+
+    subsystem = args[0].lower()
+    try:
+        log.set_level(subsystem, args[1])
+    except ValueError as e:
+        player.send_message(str(e))
+        return
+    player.send_message(f"Log level for {subsystem} set to {args[1].upper()}.")
+
+@VerbRegistry.register(["traces", "slowcmds"], admin_only=True, stateless=True)
+def traces(world, player, room, args, command):
+    """
+    Slowest recent sampled commands per verb, with their spans (see core/tracing.py).
+    Usage: TRACES | TRACES <verb> | TRACES RESET
+    """
+    if args and args[0].lower() == "reset":
+        tracing.RECENT.clear()
+        player.send_message("Command traces cleared.")
+        return
+
+    verb = args[0].lower() if args else None
+    slowest = tracing.RECENT.slowest(verb)
+    if not slowest:
+        rate = config.TRACE_SAMPLE_RATE
+        player.send_message(f"No traced commands{' for ' + verb if verb else ''} yet (sampling {rate:.0%} of commands).")
+        return
+
+    if verb is None:
+        # Summary: each verb's worst recent command, worst first
+        player.send_message(f"\n--- Slowest Traced Commands (last {config.TRACE_WINDOW_SECONDS // 60} min) ---")
+        worst = sorted(((entries[0], name) for name, entries in slowest.items()), key=lambda pair: -pair[0]["duration_ms"])
+        for trace, name in worst:
+            spans = ", ".join(f"{s['name']} {s['duration_ms']:.1f}" for s in trace["spans"])
+            player.send_message(f"  {name:<12} {trace['duration_ms']:>8.1f}ms  {trace['player']:<12} [{spans}]")
+        player.send_message("TRACES <verb> for every kept trace of one verb.")
+        return
+
+    player.send_message(f"\n--- Slowest '{verb}' Commands ---")
+    for trace in slowest[verb]:
+        when = time.strftime("%H:%M:%S", time.localtime(trace["start_time_unix_ms"] / 1000))
+        player.send_message(f"{when} {trace['player']}: '{trace['command']}' {trace['duration_ms']:.1f}ms")
+        for span in trace["spans"]:
+            player.send_message(f"    +{span['start_offset_ms']:>8.1f}ms  {span['name']:<12} {span['duration_ms']:>8.1f}ms")
@@ -84,7 +84,7 @@ class Yell(BaseVerb):
                     
                 sid = p_info.get("sid")
                 if sid:
-                    self.world.socketio.emit("message", f"{sender_name} {self.command}s, \"{message}\"", to=sid)
+                    self.world.connection_manager.emit_to_sid("message", f"{sender_name} {self.command}s, \"{message}\"", sid)
         
         # Yelling is exhausting
         set_action_roundtime(self.player, 2.0, rt_type="soft")
@@ -231,6 +231,6 @@ class Focus(BaseVerb):
                 
             sid = p_info.get("sid")
             if sid:
-                self.world.socketio.emit("global_chat", formatted_msg, to=sid)
+                self.world.connection_manager.emit_to_sid("global_chat", formatted_msg, sid)
         
         set_action_roundtime(self.player, 1.0, rt_type="soft")
\ No newline at end of file
@@ -8,9 +8,12 @@ from mud_backend.core.item_utils import (
     find_item_in_inventory, 
     get_item_data
 )
+from mud_backend.core.log import get_logger
 import uuid
 import re
 
+logger = get_logger("verbs")
+
 @VerbRegistry.register(["drop", "discard", "throw"])
 class Drop(BaseVerb):
     def execute(self):
@@ -193,6 +196,6 @@ class Drop(BaseVerb):
             target_room_data["objects"].append(new_obj)
             
         else:
-            print(f"[ERROR] Well drop target '{target_room_id}' not found.")
+            logger.error("Well drop target '%s' not found.", target_room_id)
             
         set_action_roundtime(self.player, 1.0)
\ No newline at end of file
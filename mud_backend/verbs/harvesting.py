@@ -5,10 +5,13 @@ from mud_backend.core import loot_system
 from typing import Dict, Any
 from mud_backend.core import db 
 from mud_backend.core.utils import check_action_roundtime, set_action_roundtime
+from mud_backend.core.log import get_logger
 import time
 import math
 from mud_backend import config
 
+logger = get_logger("loot")
+
 @VerbRegistry.register(["search"]) 
 @VerbRegistry.register(["skin", "butcher"])
 
@@ -51,7 +54,7 @@ def _spill_item_into_room(world: 'World', room_objects: list, item_data_or_id) -
     if isinstance(item_data_or_id, str):
         item_data = world.game_items.get(item_data_or_id)
         if not item_data:
-            print(f"[LOOT_SYSTEM] WARNING: Could not find item_id '{item_data_or_id}' in GAME_ITEMS.")
+            logger.warning("Could not find item_id '%s' in GAME_ITEMS.", item_data_or_id)
             return None
         
         # Create instance from template
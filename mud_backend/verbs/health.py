@@ -48,112 +48,110 @@ def get_json_key(loc_str):
     # Return mapped key or fallback to original (underscored)
     return mapping.get(clean, loc_str.replace(" ", "_"))
 
-@VerbRegistry.register(["health", "hp"]) 
-class Health(BaseVerb):
+@VerbRegistry.register(["health", "hp"], stateless=True) 
+def health(world, player, room, args, command):
     """
     Shows your current health, spirit, and stamina status.
     """
-    def execute(self):
-        player = self.player
-        current_hp = player.hp
-        max_hp = player.max_hp
-        percent_hp = (current_hp / max_hp) * 100
-        
-        # Check for active wounds to adjust status message
-        has_wounds = False
-        if hasattr(player, "wounds"):
-            for r in player.wounds.values():
-                if r > 0: 
-                    has_wounds = True
-                    break
-
-        if current_hp <= 0: 
-            status = "you are dead"
-        elif percent_hp > 90: 
-            if has_wounds:
-                status = "you seem to be in excellent shape, aside from your injuries"
-            else:
-                status = "you seem to be in excellent shape"
-        elif percent_hp > 75: 
-            status = "you are in good shape"
-        elif percent_hp > 50: 
-            status = "you are looking a bit rough"
-        elif percent_hp > 25: 
-            status = "you are badly wounded"
-        elif percent_hp > 10: 
-            status = "you are barely holding it together"
-        else: 
-            status = "you are near death"
-
-        death_sting_msg = "None"
-        if hasattr(player, "death_sting_points") and player.death_sting_points > 0:
-            death_sting_msg = f"{player.death_sting_points} points (XP gain reduced)"
-
-        con_loss_msg = "None"
-        if hasattr(player, "con_lost") and player.con_lost > 0:
-            pool = getattr(player, "con_recovery_pool", 0)
-            con_loss_msg = f"{player.con_lost} points lost (Recovery pool: {pool:,})"
-            
-        self.player.send_message("--- [Health Status] ---")
-        self.player.send_message(f"HP: {current_hp}/{max_hp} - {status}.")
-        self.player.send_message(f"CON Loss: {con_loss_msg}")
-        self.player.send_message(f"Death's Sting: {death_sting_msg}")
-        
-        # Display Wounds
-        if hasattr(self.player, "wounds") and self.player.wounds:
-            # Fetch criticals table safely
-            crit_data = getattr(self.world, "game_criticals", {})
-            wound_table = crit_data.get("wounds", {})
-            
-            # Check if any wounds actually exist
-            wounds_found = False
-            for location, rank in self.player.wounds.items():
+    current_hp = player.hp
+    max_hp = player.max_hp
+    percent_hp = (current_hp / max_hp) * 100
+
+    # Check for active wounds to adjust status message
+    has_wounds = False
+    if hasattr(player, "wounds"):
+        for r in player.wounds.values():
+            if r > 0: 
+                has_wounds = True
+                break
+
+    if current_hp <= 0: 
+        status = "you are dead"
+    elif percent_hp > 90: 
+        if has_wounds:
+            status = "you seem to be in excellent shape, aside from your injuries"
+        else:
+            status = "you seem to be in excellent shape"
+    elif percent_hp > 75: 
+        status = "you are in good shape"
+    elif percent_hp > 50: 
+        status = "you are looking a bit rough"
+    elif percent_hp > 25: 
+        status = "you are badly wounded"
+    elif percent_hp > 10: 
+        status = "you are barely holding it together"
+    else: 
+        status = "you are near death"
+
+    death_sting_msg = "None"
+    if hasattr(player, "death_sting_points") and player.death_sting_points > 0:
+        death_sting_msg = f"{player.death_sting_points} points (XP gain reduced)"
+
+    con_loss_msg = "None"
+    if hasattr(player, "con_lost") and player.con_lost > 0:
+        pool = getattr(player, "con_recovery_pool", 0)
+        con_loss_msg = f"{player.con_lost} points lost (Recovery pool: {pool:,})"
+
+    player.send_message("--- [Health Status] ---")
+    player.send_message(f"HP: {current_hp}/{max_hp} - {status}.")
+    player.send_message(f"CON Loss: {con_loss_msg}")
+    player.send_message(f"Death's Sting: {death_sting_msg}")
+
+    # Display Wounds
+    if hasattr(player, "wounds") and player.wounds:
+        # Fetch criticals table safely
+        crit_data = getattr(world, "game_criticals", {})
+        wound_table = crit_data.get("wounds", {})
+
+        # Check if any wounds actually exist
+        wounds_found = False
+        for location, rank in player.wounds.items():
+            if rank > 0:
+                wounds_found = True
+                break
+
+        if wounds_found:
+            player.send_message("\n--- [Active Wounds] ---")
+
+            for location, rank in player.wounds.items():
                 if rank > 0:
-                    wounds_found = True
-                    break
-            
-            if wounds_found:
-                self.player.send_message("\n--- [Active Wounds] ---")
-                
-                for location, rank in self.player.wounds.items():
-                    if rank > 0:
-                        readable_loc = normalize_location_name(location)
-                        json_key = get_json_key(location)
-                        
-                        # Lookup description
-                        loc_data = wound_table.get(json_key, {})
-                        desc = loc_data.get(str(rank), f"rank {rank} injuries to your {readable_loc}")
-                        
-                        # Check Bandage status
-                        if hasattr(self.player, "bandages") and location in self.player.bandages:
-                            self.player.send_message(f"You have {desc} and your {readable_loc} is bandaged.")
-                        else:
-                            self.player.send_message(f"You have {desc}.")
-
-        # Display Scars
-        if hasattr(self.player, "scars") and self.player.scars:
-             crit_data = getattr(self.world, "game_criticals", {})
-             scar_table = crit_data.get("scars", {})
-             
-             # Collect valid scars to display (Filtering out those with active wounds)
-             visible_scars = []
-             for location, rank in self.player.scars.items():
-                 if rank > 0:
-                     # Check if an active wound exists on this location
-                     if hasattr(self.player, "wounds") and self.player.wounds.get(location, 0) > 0:
-                         continue
-                     visible_scars.append((location, rank))
-             
-             if visible_scars:
-                 self.player.send_message("\n--- [Permanent Scars] ---")
-                 for location, rank in visible_scars:
                     readable_loc = normalize_location_name(location)
                     json_key = get_json_key(location)
-                    
-                    loc_data = scar_table.get(json_key, {})
-                    desc = loc_data.get(str(rank), f"rank {rank} scarring on your {readable_loc}")
-                    
-                    self.player.send_message(f"You have {desc}.")
+
+                    # Lookup description
+                    loc_data = wound_table.get(json_key, {})
+                    desc = loc_data.get(str(rank), f"rank {rank} injuries to your {readable_loc}")
+
+                    # Check Bandage status
+                    if hasattr(player, "bandages") and location in player.bandages:
+                        player.send_message(f"You have {desc} and your {readable_loc} is bandaged.")
+                    else:
+                        player.send_message(f"You have {desc}.")
+
+    # Display Scars
+    if hasattr(player, "scars") and player.scars:
+         crit_data = getattr(world, "game_criticals", {})
+         scar_table = crit_data.get("scars", {})
+
+         # Collect valid scars to display (Filtering out those with active wounds)
+         visible_scars = []
+         for location, rank in player.scars.items():
+             if rank > 0:
+                 # Check if an active wound exists on this location
+                 if hasattr(player, "wounds") and player.wounds.get(location, 0) > 0:
+                     continue
+                 visible_scars.append((location, rank))
+
+         if visible_scars:
+             player.send_message("\n--- [Permanent Scars] ---")
+             for location, rank in visible_scars:
+                readable_loc = normalize_location_name(location)
+                json_key = get_json_key(location)
+
+                loc_data = scar_table.get(json_key, {})
+                desc = loc_data.get(str(rank), f"rank {rank} scarring on your {readable_loc}")
+
+                player.send_message(f"You have {desc}.")
 
 
 @VerbRegistry.register(["diagnose", "diag"])
@@ -397,6 +395,7 @@ class Tend(BaseVerb):
                 "stopper": self.player.name,
                 "applied_at": time.time()
             }
+            target.schedule_vitals()
             
             self.player.send_message("After some effort you manage to stop the bleeding.")
             if target != self.player:
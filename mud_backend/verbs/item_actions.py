@@ -13,8 +13,11 @@ from mud_backend.core.item_utils import (
 )
 from mud_backend.core.economy import get_shop_data, get_item_buy_price
 from mud_backend.core import db
+from mud_backend.core.log import get_logger
 import re
 
+logger = get_logger("verbs")
+
 @VerbRegistry.register(["turn", "crank", "push", "pull", "touch", "press"])
 class ObjectInteraction(BaseVerb):
     def execute(self):
@@ -98,7 +101,7 @@ class ObjectInteraction(BaseVerb):
                 p_info = self.world.get_player_info(self.player.name.lower())
                 p_sid = p_info.get("sid") if p_info else None
                 
-                print(f"[DEBUG INTERACTION] Action: {msg} | Room: {self.room.room_id} | Actor SID: {p_sid}")
+                logger.debug("Interaction: %s | Room: %s | Actor SID: %s", msg, self.room.room_id, p_sid)
 
                 self.world.broadcast_to_room(
                     self.room.room_id, 
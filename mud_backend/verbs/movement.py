@@ -59,7 +59,7 @@ def _handle_stalker_move(
     target_room_id: str,
     move_direction: str
 ):
-    potential_stalkers = world.room_players.get(original_room_id, [])
+    potential_stalkers = world.get_players_in_room(original_room_id)
     
     for stalker_name in potential_stalkers:
         if stalker_name == leader_player.name.lower(): continue
@@ -175,10 +175,10 @@ def _handle_group_move(
                 world.broadcast_to_room(target_room_id, arrives_message, "message", skip_sid=sid)
 
                 # Send response manually because movement is often async/secondary
-                world.socketio.emit(
+                world.connection_manager.emit_to_sid(
                     'command_response', 
                     {'messages': member_obj.messages, 'vitals': member_obj.get_vitals()}, 
-                    to=sid
+                    sid
                 )
             else:
                 if failure_message:
@@ -337,10 +337,10 @@ def _execute_goto_path(world, player_id: str, path: List[str], final_destination
             world.broadcast_to_room(target_room_id_step, arrives_message, "message", skip_sid=list(sids_to_skip_arrive))
         
         # Send update
-        world.socketio.emit(
+        world.connection_manager.emit_to_sid(
             'command_response', 
             {'messages': player_obj.messages, 'vitals': player_obj.get_vitals()}, 
-            to=sid
+            sid
         )
         
         world.socketio.sleep(3.0) 
@@ -353,10 +353,10 @@ def _execute_goto_path(world, player_id: str, path: List[str], final_destination
             world.remove_combat_state(player_id) 
             player_obj.send_message("You have arrived.")
             # Send update
-            world.socketio.emit(
+            world.connection_manager.emit_to_sid(
                 'command_response', 
                 {'messages': player_obj.messages, 'vitals': player_obj.get_vitals()}, 
-                to=sid
+                sid
             )
 
 @VerbRegistry.register(["enter"]) 
@@ -384,7 +384,7 @@ class Enter(BaseVerb):
             for table in possible_tables:
                 t_room_id = resolve_interaction_room(table, "ENTER")
                 if t_room_id:
-                    occupants = self.world.room_players.get(t_room_id, set())
+                    occupants = self.world.get_players_in_room(t_room_id)
                     if not occupants:
                         enterable_object = table
                         break
@@ -407,7 +407,7 @@ class Enter(BaseVerb):
 
         target_room_obj = self.world.get_active_room_safe(target_room_id)
         if target_room_obj and getattr(target_room_obj, "is_table", False):
-            current_occupants = [p for p in self.world.room_players.get(target_room_id, [])]
+            current_occupants = [p for p in self.world.get_players_in_room(target_room_id)]
             owner_name = getattr(target_room_obj, "owner", None)
             
             if not owner_name and current_occupants:
@@ -1108,14 +1108,6 @@ class GOTO(BaseVerb):
             
         target_room_name = target_room_data.get("name", "your destination")
         
-        path = find_path(self.world, self.player.current_room_id, target_room_id)
-        
-        if not path:
-            self.player.send_message(f"You can't seem to find a path to {target_room_name} from here.")
-            return
-            
-        self.player.send_message(f"You begin moving towards {target_room_name}...")
-        
         player_id = self.player.name.lower()
         player_info = self.world.get_player_info(player_id)
         if not player_info:
@@ -1131,6 +1123,51 @@ class GOTO(BaseVerb):
         
         goto_id = uuid.uuid4().hex
         self.player.goto_id = goto_id
+
+        # Offload the BFS to the worker pool once the room graph is compiled.
+        # The result arrives on the game loop; a newer command cancels it via goto_id.
+        worker_manager = getattr(self.world, "worker_manager", None)
+        if worker_manager and worker_manager.has_context("room_graph"):
+            start_room_id = self.player.current_room_id
+            world = self.world
+
+            def _on_path_found(status, path):
+                player_obj = world.get_player_obj(player_id)
+                if not player_obj: return
+                if not player_obj.is_goto_active or player_obj.goto_id != goto_id: return
+                if status == "timeout":
+                    player_obj.is_goto_active = False
+                    player_obj.goto_id = None
+                    world.send_message_to_player(player_id, f"You lose your bearings on the way to {target_room_name}. Try again.")
+                    return
+                if status != "success":
+                    path = find_path(world, start_room_id, target_room_id)
+                if not path:
+                    player_obj.is_goto_active = False
+                    player_obj.goto_id = None
+                    world.send_message_to_player(player_id, f"You can't seem to find a path to {target_room_name} from here.")
+                    return
+                world.send_message_to_player(player_id, f"You begin moving towards {target_room_name}...")
+                world.socketio.start_background_task(
+                    _execute_goto_path, world, player_id, path, target_room_id, sid, goto_id
+                )
+
+            worker_manager.submit_task(
+                "find_path",
+                {"start": start_room_id, "end": target_room_id},
+                _on_path_found
+            )
+            return
+
+        path = find_path(self.world, self.player.current_room_id, target_room_id)
+        
+        if not path:
+            self.player.is_goto_active = False
+            self.player.goto_id = None
+            self.player.send_message(f"You can't seem to find a path to {target_room_name} from here.")
+            return
+            
+        self.player.send_message(f"You begin moving towards {target_room_name}...")
             
         self.world.socketio.start_background_task(
             _execute_goto_path, 
@@ -1140,4 +1177,4 @@ class GOTO(BaseVerb):
             target_room_id,
             sid,
             goto_id
-        )
\ No newline at end of file
+        )
@@ -52,7 +52,7 @@ def _get_table_occupants(world, table_obj):
                 break
 
     if target_room_id:
-        player_names = world.room_players.get(target_room_id, [])
+        player_names = world.get_players_in_room(target_room_id)
         return list(player_names)
     return []
 
@@ -197,7 +197,7 @@ def _show_room_filtered(player, room, world):
         player.send_message(f"You also see {', '.join(visible_objects)}.")
 
     # Highlight Players
-    room_players = world.room_players.get(room.room_id, [])
+    room_players = world.get_players_in_room(room.room_id)
     visible_players = []
 
     for p_name in room_players:
@@ -490,7 +490,7 @@ class Investigate(BaseVerb):
         searcher_roll = random.randint(1, 100) + per_bonus + wis_bonus
 
         found_person = False
-        room_players = self.world.room_players.get(self.room.room_id, [])
+        room_players = self.world.get_players_in_room(self.room.room_id)
         for p_name in room_players:
             if p_name == self.player.name.lower():
                 continue
@@ -60,6 +60,9 @@ class Worship(BaseVerb):
 
         # Success
         self.player.deities.append(deity_key)
+        # Deity modifiers change effective faction standing
+        self.player.invalidate_faction_cache()
+        self.world.entity_manager.queue_aggro_for_player(self.player.name, self.player.current_room_id)
         self.player.send_message(f"You kneel and pledge your service to **{deity_name}**, {deity_data.get('title', '')}.")
         self.player.send_message(f"You feel a subtle protective aura settle over you.")
 
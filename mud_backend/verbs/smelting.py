@@ -186,6 +186,7 @@ class Charge(BaseVerb):
             self.player.send_message("You can't charge the furnace with that.")
             return
 
+        self.world.crafting_stations.wake(self.room.room_id, furnace)
         self.player.worn_items[slot] = None
         self.player.grant_experience(2, source="smithing")
         set_action_roundtime(self.player, 4.0)
@@ -203,6 +204,7 @@ class Bellow(BaseVerb):
         if state.get("fuel", 0) > 0:
             state["temp"] += 50
             state["fuel"] -= 2
+            self.world.crafting_stations.wake(self.room.room_id, furnace)
         else:
             self.player.send_message("The bellows wheeze, but there is no fuel to burn.")
         set_action_roundtime(self.player, 3.0)
@@ -117,7 +117,7 @@ class Invite(BaseVerb):
             
         # Check players in outside room
         target_player = None
-        players_outside_names = self.world.room_players.get(outside_room_id, set())
+        players_outside_names = self.world.get_players_in_room(outside_room_id)
         
         # Simple fuzzy match for name
         for name in players_outside_names:
@@ -61,15 +61,85 @@ const COMMON_COMMANDS = [
     "hide", "unhide", "sneak", "stalk"
 ];
 
+// --- Wire protocol ---
+// On connect the client asks for the compact protocol (mud_backend/core/wire.py):
+// short field ids, numbered message templates, msgpack frames. Add
+// ?protocol=json to the URL to keep plain, readable JSON for debugging.
+const WIRE_PROTOCOL = new URLSearchParams(window.location.search).get('protocol') === 'json' ? 'json' : 'compact';
+let wireFieldNames = {};      // short id -> field name
+let wireDataMaps = new Set(); // fields whose keys are data, not short ids
+let wireKeywordAttrs = [];
+let wireTemplates = [];
+
+function expandFields(value, dataMap = false) {
+    if (Array.isArray(value)) {
+        return value.map(item => expandFields(item));
+    }
+    if (value === null || typeof value !== 'object') {
+        return value;
+    }
+    const expanded = {};
+    for (const key in value) {
+        const name = dataMap ? key : (wireFieldNames[key] || key);
+        expanded[name] = expandFields(value[key], !dataMap && wireDataMaps.has(name));
+    }
+    return expanded;
+}
+
+function renderWireMessage(entry) {
+    if (typeof entry === 'string' || entry === null || entry === undefined) {
+        return entry;
+    }
+    if (!Array.isArray(entry)) {
+        return wireTemplates[entry];
+    }
+    // [template number, keyword args...]; each arg is [label, name, id, verbs, command]
+    const parts = wireTemplates[entry[0]].split('\u0000');
+    let html = parts[0];
+    for (let i = 1; i < parts.length; i++) {
+        const [label, ...values] = entry[i];
+        let attrs = '';
+        wireKeywordAttrs.forEach((attr, index) => {
+            if (values[index] !== undefined && values[index] !== null) {
+                attrs += ` data-${attr}="${values[index]}"`;
+            }
+        });
+        html += `<span class="keyword"${attrs}>${label}</span>${parts[i]}`;
+    }
+    return html;
+}
+
+// Turns any game event payload back into the plain JSON shape
+function decodeFrame(raw) {
+    let body;
+    if (raw instanceof ArrayBuffer) {
+        body = MessagePack.decode(new Uint8Array(raw));
+    } else if (raw && typeof raw === 'object' && raw['~'] !== undefined) {
+        body = raw['~'];
+    } else {
+        return raw;
+    }
+    (body.d || []).forEach(([number, template]) => {
+        wireTemplates[number] = template;
+    });
+    delete body.d;
+    const data = expandFields(body);
+    if (data.messages) {
+        data.messages = data.messages.map(renderWireMessage);
+    }
+    if (data.text !== undefined) {
+        data.text = renderWireMessage(data.text);
+    }
+    return data;
+}
+
 function sendCommand(command) {
     socket.emit('command', {
         command: command
     });
 }
 
-function addMessage(message, messageClass = null) {
-    if (!message) return; // Guard against empty messages
-    
+function formatMessage(message, messageClass = null) {
     let formattedMessage = message;
     // Ensure message is a string before replacing
     if (typeof formattedMessage === 'string') {
@@ -85,10 +155,93 @@ function addMessage(message, messageClass = null) {
     if (messageClass) {
         formattedMessage = `<span class="${messageClass}">${formattedMessage}</span>`;
     }
-    output.innerHTML += `\n${formattedMessage}`;
-    output.scrollTop = output.scrollHeight;
+    return formattedMessage;
+}
+
+// --- Output renderer ---
+// Lines are queued and appended once per animation frame as a single
+// fragment, so a burst of combat messages costs one parse and one layout
+// instead of re-parsing the whole scrollback per line. Only the newest
+// MAX_RENDERED_LINES stay in the DOM; older ones are kept as HTML strings
+// and rendered back in chunks when the player scrolls up to them.
+const MAX_RENDERED_LINES = 500;
+const MAX_SCROLLBACK_LINES = 5000;
+const SCROLLBACK_CHUNK = 200;
+const SCROLL_EDGE_PX = 40;
+
+let pendingLines = [];
+let flushScheduled = false;
+let archivedLines = []; // Oldest first, HTML strings no longer in the DOM
+let stickToBottom = true;
+
+function buildLines(htmlLines) {
+    const template = document.createElement('template');
+    template.innerHTML = htmlLines.map(html => `<div class="output-line">${html}</div>`).join('');
+    return template.content;
+}
+
+function trimRenderedLines() {
+    const excess = output.children.length - MAX_RENDERED_LINES;
+    if (excess <= 0) return;
+    for (let i = 0; i < excess; i++) {
+        const line = output.firstElementChild;
+        if (line.id !== 'history-anchor') {
+            archivedLines.push(line.innerHTML);
+        }
+        line.remove();
+    }
+    if (archivedLines.length > MAX_SCROLLBACK_LINES) {
+        archivedLines.splice(0, archivedLines.length - MAX_SCROLLBACK_LINES);
+    }
+}
+
+function flushOutput() {
+    flushScheduled = false;
+    if (pendingLines.length === 0) return;
+    const lines = pendingLines;
+    pendingLines = [];
+    output.appendChild(buildLines(lines));
+    if (stickToBottom) {
+        // Only trim while following the tail, so lines never vanish from under a reader
+        trimRenderedLines();
+        output.scrollTop = output.scrollHeight;
+    }
+}
+
+function addMessage(message, messageClass = null) {
+    if (!message) return; // Guard against empty messages
+    pendingLines.push(formatMessage(message, messageClass));
+    if (!flushScheduled) {
+        flushScheduled = true;
+        requestAnimationFrame(flushOutput);
+    }
+}
+
+function clearOutput() {
+    pendingLines = [];
+    archivedLines = [];
+    output.textContent = '';
+    stickToBottom = true;
 }
 
+function renderArchivedChunk() {
+    const start = Math.max(0, archivedLines.length - SCROLLBACK_CHUNK);
+    const chunk = archivedLines.splice(start);
+    const previousHeight = output.scrollHeight;
+    output.insertBefore(buildLines(chunk), output.firstChild);
+    // Keep the line the player was reading where it was
+    output.scrollTop += output.scrollHeight - previousHeight;
+}
+
+output.addEventListener('scroll', () => {
+    stickToBottom = output.scrollHeight - output.scrollTop - output.clientHeight < SCROLL_EDGE_PX;
+    if (output.scrollTop < SCROLL_EDGE_PX && archivedLines.length > 0) {
+        renderArchivedChunk();
+    } else if (stickToBottom) {
+        trimRenderedLines();
+    }
+}, { passive: true });
+
 function updateRtDisplay() {
     const now = Date.now();
     const timeLeft = rtEndTime - now;
@@ -277,35 +430,41 @@ function createMarker(x, y, rank, isScar=false, location=null, isBandaged=false)
         title.textContent = `${location.replace(/_/g, ' ')}${status}`;
         group.appendChild(title);
 
-        group.addEventListener('click', (e) => {
-            e.preventDefault();
-            e.stopPropagation();
-            
-            const readableLoc = location.replace(/_/g, ' ');
-            activeKeyword = readableLoc;
-
-            // Populate Context Menu with Tend/Diagnose
-            contextMenu.innerHTML = '';
-            
-            const actions = ['tend', 'diagnose'];
-            actions.forEach(verb => {
-                const item = document.createElement('div');
-                item.innerText = `${verb.toUpperCase()} ${readableLoc}`;
-                item.dataset.command = `${verb} my ${readableLoc}`; // Implicitly 'my'
-                item.dataset.pretty = `${verb} my ${readableLoc}`; // For display consistency
-                contextMenu.appendChild(item);
-            });
-
-            // Position Menu
-            contextMenu.style.left = `${e.pageX}px`;
-            contextMenu.style.top = `${e.pageY}px`;
-            contextMenu.style.display = 'block';
-        });
+        group.classList.add('wound-group');
+        group.dataset.location = location;
     }
     
     injurySvg.appendChild(group);
 }
 
+// Markers are rebuilt on every vitals update, so they share one delegated listener
+injurySvg.addEventListener('click', (e) => {
+    const group = e.target.closest('.wound-group');
+    if (!group) return;
+    e.preventDefault();
+    e.stopPropagation();
+    
+    const readableLoc = group.dataset.location.replace(/_/g, ' ');
+    activeKeyword = readableLoc;
+
+    // Populate Context Menu with Tend/Diagnose
+    contextMenu.innerHTML = '';
+    
+    const actions = ['tend', 'diagnose'];
+    actions.forEach(verb => {
+        const item = document.createElement('div');
+        item.innerText = `${verb.toUpperCase()} ${readableLoc}`;
+        item.dataset.command = `${verb} my ${readableLoc}`; // Implicitly 'my'
+        item.dataset.pretty = `${verb} my ${readableLoc}`; // For display consistency
+        contextMenu.appendChild(item);
+    });
+
+    // Position Menu
+    contextMenu.style.left = `${e.pageX}px`;
+    contextMenu.style.top = `${e.pageY}px`;
+    contextMenu.style.display = 'block';
+});
+
 function updateGuiPanels(vitals) {
     if (!vitals) return;
     
@@ -389,121 +548,246 @@ const ROOM_CENTER = ROOM_SIZE / 2;
 const TOTAL_CELL_SIZE = ROOM_SIZE + ROOM_GAP;
 const ARROW_LEN = 6; 
 
-function drawMap(mapData, currentRoomId) {
-    mapSvg.innerHTML = ''; 
-    mapRoomName.innerText = 'Loading...';
-    mapRoomExits.innerText = '...';
-    
-    const currentRoom = mapData[currentRoomId];
+// (exit key, label, line start relative to the room's corner, line direction)
+const MAP_EXIT_LINES = [
+    ['north',     'N',  ROOM_CENTER, 0,           0,          -ARROW_LEN],
+    ['south',     'S',  ROOM_CENTER, ROOM_SIZE,   0,          ARROW_LEN],
+    ['east',      'E',  ROOM_SIZE,   ROOM_CENTER, ARROW_LEN,  0],
+    ['west',      'W',  0,           ROOM_CENTER, -ARROW_LEN, 0],
+    ['northeast', 'NE', ROOM_SIZE,   0,           ARROW_LEN,  -ARROW_LEN],
+    ['northwest', 'NW', 0,           0,           -ARROW_LEN, -ARROW_LEN],
+    ['southeast', 'SE', ROOM_SIZE,   ROOM_SIZE,   ARROW_LEN,  ARROW_LEN],
+    ['southwest', 'SW', 0,           ROOM_SIZE,   -ARROW_LEN, ARROW_LEN]
+];
+const MAP_CULL_MARGIN = TOTAL_CELL_SIZE;
+
+// --- Map renderer ---
+// A retained scene graph: one <g> per room, keyed by room_id and drawn in
+// map coordinates inside mapLayer. Moving re-translates the layer and moves
+// the 'current' class; a room's node is only rebuilt when its entry (or a
+// room its special exits lead to) changes. Rooms off the current level or
+// outside the viewport are detached from the SVG.
+const mapRooms = new Map();          // room_id -> latest entry from the server
+const mapNodes = new Map();          // room_id -> { g, attached }
+const mapDirty = new Set();          // room_ids whose node needs rebuilding
+const mapSpecialSources = new Map(); // target room_id -> room_ids with a special exit to it
+let mapCurrentId = null;
+
+const mapLayer = document.createElementNS(svgNS, 'g');
+mapSvg.appendChild(mapLayer);
+
+function setSpecialSources(roomId, room, add) {
+    (room.special_exits || []).forEach(exit => {
+        let sources = mapSpecialSources.get(exit.target_room);
+        if (add) {
+            if (!sources) {
+                sources = new Set();
+                mapSpecialSources.set(exit.target_room, sources);
+            }
+            sources.add(roomId);
+        } else if (sources) {
+            sources.delete(roomId);
+        }
+    });
+}
+
+function markSpecialSourcesDirty(targetId) {
+    const sources = mapSpecialSources.get(targetId);
+    if (sources) {
+        sources.forEach(roomId => mapDirty.add(roomId));
+    }
+}
+
+function applyMapUpdate(mapData, full, removed) {
+    if (full) {
+        mapNodes.forEach(node => node.g.remove());
+        mapNodes.clear();
+        mapRooms.clear();
+        mapDirty.clear();
+        mapSpecialSources.clear();
+        mapCurrentId = null;
+    }
+    (removed || []).forEach(roomId => {
+        const room = mapRooms.get(roomId);
+        if (room) {
+            setSpecialSources(roomId, room, false);
+            mapRooms.delete(roomId);
+        }
+        const node = mapNodes.get(roomId);
+        if (node) {
+            node.g.remove();
+            mapNodes.delete(roomId);
+        }
+        markSpecialSourcesDirty(roomId);
+    });
+    for (const roomId in mapData) {
+        const previous = mapRooms.get(roomId);
+        if (previous) {
+            setSpecialSources(roomId, previous, false);
+        }
+        const room = mapData[roomId];
+        mapRooms.set(roomId, room);
+        setSpecialSources(roomId, room, true);
+        mapDirty.add(roomId);
+        // Their up/down/in-out marker depends on where this room is
+        markSpecialSourcesDirty(roomId);
+    }
+}
+
+function buildRoomNode(g, room) {
+    g.textContent = '';
+    const rX = room.x * TOTAL_CELL_SIZE;
+    const rY = -room.y * TOTAL_CELL_SIZE;
+    const z = room.z || 0;
+    const interior = room.interior_id || null;
+
+    const rect = document.createElementNS(svgNS, 'rect');
+    rect.setAttribute('x', rX);
+    rect.setAttribute('y', rY);
+    rect.setAttribute('width', ROOM_SIZE);
+    rect.setAttribute('height', ROOM_SIZE);
+    rect.setAttribute('rx', 3);
+    g.appendChild(rect);
+
+    const exits = room.exits || {};
+    MAP_EXIT_LINES.forEach(([key, , startX, startY, dX, dY]) => {
+        if (!exits[key]) return;
+        const x1 = rX + startX;
+        const y1 = rY + startY;
+        const path = document.createElementNS(svgNS, 'path');
+        path.setAttribute('d', `M ${x1} ${y1} L ${x1 + dX} ${y1 + dY}`);
+        path.classList.add('map-exit');
+        g.appendChild(path);
+    });
+
+    let hasUp = false, hasDown = false, hasInOut = false;
+    (room.special_exits || []).forEach(exit => {
+        const targetRoom = mapRooms.get(exit.target_room);
+        if (targetRoom && targetRoom.z !== undefined) {
+            if (targetRoom.z > z && (targetRoom.interior_id === interior || interior === null)) hasUp = true;
+            if (targetRoom.z < z && (targetRoom.interior_id === interior || interior === null)) hasDown = true;
+        }
+        if (targetRoom && (targetRoom.z || 0) === z && targetRoom.interior_id !== interior) {
+            hasInOut = true;
+        }
+    });
+
+    let symbol = '';
+    if (hasUp) symbol = '▲';
+    if (hasDown) symbol = '▼';
+    if (hasInOut && !hasUp && !hasDown) symbol = '○'; 
+
+    if (symbol) {
+        const text = document.createElementNS(svgNS, 'text');
+        text.setAttribute('x', rX + ROOM_CENTER);
+        text.setAttribute('y', rY + ROOM_CENTER + 4);
+        text.classList.add('map-special-exit');
+        if (hasUp) text.classList.add('up');
+        if (hasDown) text.classList.add('down');
+        if (hasInOut) text.classList.add('inout');
+        text.textContent = symbol;
+        g.appendChild(text);
+    }
+}
+
+function drawMap(currentRoomId) {
+    const currentRoom = mapRooms.get(currentRoomId);
     if (!currentRoom || currentRoom.x === undefined || currentRoom.y === undefined) {
+        mapLayer.style.display = 'none';
         mapRoomName.innerText = 'Unknown';
+        mapRoomExits.innerText = '...';
         return;
     }
-
+    mapLayer.style.display = '';
     mapRoomName.innerText = currentRoom.name || "Unknown";
-    
-    const svgRect = mapSvg.getBoundingClientRect();
-    const svgWidth = svgRect.width;
-    const svgHeight = svgRect.height;
-    
-    const cX = currentRoom.x || 0;
-    const cY = currentRoom.y || 0;
+
+    const svgWidth = mapSvg.clientWidth || Number(mapSvg.getAttribute('width'));
+    const svgHeight = mapSvg.clientHeight || Number(mapSvg.getAttribute('height'));
     const cZ = currentRoom.z || 0;
     const cInterior = currentRoom.interior_id || null; 
-    
-    const offsetX = (svgWidth / 2) - (cX * TOTAL_CELL_SIZE) - ROOM_CENTER;
-    const offsetY = (svgHeight / 2) - (-cY * TOTAL_CELL_SIZE) - ROOM_CENTER;
-    
-    const allExits = new Set();
-    
-    for (const roomId in mapData) {
-        const room = mapData[roomId];
-        const roomZ = room.z || 0;
-        const roomInterior = room.interior_id || null;
-        
-        if (room.x === undefined || room.y === undefined || roomZ !== cZ || roomInterior !== cInterior) {
-            continue;
-        }
-        
-        const rX = offsetX + (room.x * TOTAL_CELL_SIZE);
-        const rY = offsetY + (-room.y * TOTAL_CELL_SIZE); 
-        
-        const g = document.createElementNS(svgNS, 'g');
-        g.classList.add('map-room');
-        if (roomId === currentRoomId) {
-            g.classList.add('current');
+
+    const offsetX = (svgWidth / 2) - ((currentRoom.x || 0) * TOTAL_CELL_SIZE) - ROOM_CENTER;
+    const offsetY = (svgHeight / 2) - (-(currentRoom.y || 0) * TOTAL_CELL_SIZE) - ROOM_CENTER;
+    mapLayer.setAttribute('transform', `translate(${offsetX} ${offsetY})`);
+
+    // The viewport in map coordinates
+    const minX = -offsetX - MAP_CULL_MARGIN;
+    const maxX = -offsetX + svgWidth + MAP_CULL_MARGIN;
+    const minY = -offsetY - MAP_CULL_MARGIN;
+    const maxY = -offsetY + svgHeight + MAP_CULL_MARGIN;
+
+    mapRooms.forEach((room, roomId) => {
+        let visible = false;
+        if (room.x !== undefined && room.y !== undefined && (room.z || 0) === cZ && (room.interior_id || null) === cInterior) {
+            const rX = room.x * TOTAL_CELL_SIZE;
+            const rY = -room.y * TOTAL_CELL_SIZE;
+            visible = rX + ROOM_SIZE >= minX && rX <= maxX && rY + ROOM_SIZE >= minY && rY <= maxY;
         }
-        
-        const rect = document.createElementNS(svgNS, 'rect');
-        rect.setAttribute('x', rX);
-        rect.setAttribute('y', rY);
-        rect.setAttribute('width', ROOM_SIZE);
-        rect.setAttribute('height', ROOM_SIZE);
-        rect.setAttribute('rx', 3);
-        g.appendChild(rect);
-        
-        const exits = room.exits || {};
-        const drawExit = (dir, x1, y1, x2, y2) => {
-            const path = document.createElementNS(svgNS, 'path');
-            path.setAttribute('d', `M ${x1} ${y1} L ${x2} ${y2}`);
-            path.classList.add('map-exit');
-            g.appendChild(path);
-            if (roomId === currentRoomId) allExits.add(dir);
-        };
-        
-        if (exits.north)    drawExit('N',  rX + ROOM_CENTER, rY, rX + ROOM_CENTER, rY - ARROW_LEN);
-        if (exits.south)    drawExit('S',  rX + ROOM_CENTER, rY + ROOM_SIZE, rX + ROOM_CENTER, rY + ROOM_SIZE + ARROW_LEN);
-        if (exits.east)     drawExit('E',  rX + ROOM_SIZE, rY + ROOM_CENTER, rX + ROOM_SIZE + ARROW_LEN, rY + ROOM_CENTER);
-        if (exits.west)     drawExit('W',  rX, rY + ROOM_CENTER, rX - ARROW_LEN, rY + ROOM_CENTER);
-        if (exits.northeast) drawExit('NE', rX + ROOM_SIZE, rY, rX + ROOM_SIZE + ARROW_LEN, rY - ARROW_LEN);
-        if (exits.northwest) drawExit('NW', rX, rY, rX - ARROW_LEN, rY - ARROW_LEN);
-        if (exits.southeast) drawExit('SE', rX + ROOM_SIZE, rY + ROOM_SIZE, rX + ROOM_SIZE + ARROW_LEN, rY + ROOM_SIZE + ARROW_LEN);
-        if (exits.southwest) drawExit('SW', rX, rY + ROOM_SIZE, rX - ARROW_LEN, rY + ROOM_SIZE + ARROW_LEN);
-        
-        const specialExits = room.special_exits || [];
-        let hasUp = false, hasDown = false, hasInOut = false;
-        
-        specialExits.forEach(exit => {
-            const targetRoom = mapData[exit.target_room];
-            if (targetRoom && targetRoom.z !== undefined) {
-                if (targetRoom.z > cZ && (targetRoom.interior_id === cInterior || cInterior === null)) hasUp = true;
-                if (targetRoom.z < cZ && (targetRoom.interior_id === cInterior || cInterior === null)) hasDown = true;
-            }
-            if (targetRoom && (targetRoom.z || 0) === cZ && targetRoom.interior_id !== cInterior) {
-                hasInOut = true;
+
+        let node = mapNodes.get(roomId);
+        if (!visible) {
+            if (node && node.attached) {
+                node.g.remove();
+                node.attached = false;
             }
-            if (roomId === currentRoomId) allExits.add(exit.name.toUpperCase());
-        });
-        
-        const text = document.createElementNS(svgNS, 'text');
-        let symbol = '';
-        if (hasUp) symbol = '▲';
-        if (hasDown) symbol = '▼';
-        if (hasInOut && !hasUp && !hasDown) symbol = '○'; 
-        
-        if (symbol) {
-            text.setAttribute('x', rX + ROOM_CENTER);
-            text.setAttribute('y', rY + ROOM_CENTER + 4);
-            text.classList.add('map-special-exit');
-            if (hasUp) text.classList.add('up');
-            if (hasDown) text.classList.add('down');
-            if (hasInOut) text.classList.add('inout');
-            text.textContent = symbol;
-            g.appendChild(text);
+            return;
+        }
+        if (!node) {
+            const g = document.createElementNS(svgNS, 'g');
+            g.classList.add('map-room');
+            node = { g: g, attached: false };
+            mapNodes.set(roomId, node);
+            mapDirty.add(roomId);
         }
-        mapSvg.appendChild(g);
+        // Dirty rooms that stay off-screen are rebuilt once they scroll into view
+        if (mapDirty.has(roomId)) {
+            buildRoomNode(node.g, room);
+            mapDirty.delete(roomId);
+        }
+        if (!node.attached) {
+            mapLayer.appendChild(node.g);
+            node.attached = true;
+        }
+    });
+
+    if (mapCurrentId !== currentRoomId) {
+        const previousNode = mapNodes.get(mapCurrentId);
+        if (previousNode) {
+            previousNode.g.classList.remove('current');
+        }
+        mapCurrentId = currentRoomId;
+    }
+    const currentNode = mapNodes.get(currentRoomId);
+    if (currentNode) {
+        currentNode.g.classList.add('current');
     }
 
+    const allExits = new Set();
+    const currentExits = currentRoom.exits || {};
+    MAP_EXIT_LINES.forEach(([key, label]) => {
+        if (currentExits[key]) allExits.add(label);
+    });
+    (currentRoom.special_exits || []).forEach(exit => allExits.add(exit.name.toUpperCase()));
     mapRoomExits.innerText = Array.from(allExits).join(', ') || 'None';
 }
 
-socket.on('command_response', (data) => {
+socket.on('command_response', (raw) => {
+    const data = decodeFrame(raw);
     currentClientState = "in_game"; 
     
     if (data.game_state) {
         currentGameState = data.game_state;
     }
     
+    if (data.history_available) {
+        // Older lines stream in afterwards and are inserted above this marker
+        flushOutput();
+        const anchor = document.createElement('div');
+        anchor.id = 'history-anchor';
+        output.appendChild(anchor);
+        socket.emit('request_history');
+    }
+    
     if (data.messages) {
         data.messages.forEach(msg => addMessage(msg));
     }
@@ -512,14 +796,38 @@ socket.on('command_response', (data) => {
         updateVitals(data.vitals);
     }
     
+    if (data.map_data) {
+        // Without map_full the server only sent rooms that are new or changed
+        applyMapUpdate(data.map_data, data.map_full !== false, data.map_removed);
+    }
+    
     if (data.map_data && data.vitals && data.vitals.current_room_id) {
-        drawMap(data.map_data, data.vitals.current_room_id);
+        drawMap(data.vitals.current_room_id);
+    }
+});
+
+socket.on('message_history', (raw) => {
+    const data = decodeFrame(raw);
+    const anchor = document.getElementById('history-anchor');
+    if (!anchor) return;
+    const lines = (data.messages || [])
+        .filter(msg => msg)
+        .map(msg => formatMessage(msg));
+    flushOutput();
+    output.insertBefore(buildLines(lines), anchor);
+    if (data.done) {
+        anchor.remove();
+    }
+    if (stickToBottom) {
+        trimRenderedLines();
+        output.scrollTop = output.scrollHeight;
     }
 });
 
 // --- UPDATED MESSAGE HANDLER ---
 // Handles both legacy strings and new {text, type} objects
-socket.on('message', (data) => {
+socket.on('message', (raw) => {
+    const data = decodeFrame(raw);
     if (typeof data === 'object' && data !== null && data.text) {
         // Map types to CSS classes if necessary, or pass null
         // Currently relying on addMessage to handle simple text
@@ -545,14 +853,31 @@ socket.on('tick', () => {
     }
 });
 
-socket.on('update_vitals', (data) => {
+socket.on('update_vitals', (raw) => {
+    const data = decodeFrame(raw);
     if (data) {
-        updateVitals(data);
+        // Tick updates only carry the fields that changed
+        updateVitals({ ...currentVitals, ...data });
     }
 });
 
 socket.on('connect', () => {
     console.log("Connected to server with ID:", socket.id);
+    socket.emit('negotiate_protocol', {
+        protocol: WIRE_PROTOCOL,
+        msgpack: typeof MessagePack !== 'undefined'
+    });
+});
+socket.on('protocol', (data) => {
+    // Template numbers are per connection
+    wireTemplates = [];
+    wireFieldNames = {};
+    for (const [name, id] of Object.entries(data.fields || {})) {
+        wireFieldNames[id] = name;
+    }
+    wireDataMaps = new Set(data.data_maps || []);
+    wireKeywordAttrs = data.keyword_attrs || [];
+    console.log(`Wire protocol: ${data.protocol}${data.encoding ? ` (${data.encoding})` : ''}`);
 });
 socket.on('disconnect', () => {
     console.log("Disconnected from server.");
@@ -562,7 +887,8 @@ socket.on('disconnect', () => {
     input.disabled = true;
 });
 socket.on('prompt_username', () => {
-    output.innerHTML = "Welcome. Please enter your Username.\n(This will create a new account if one does not exist)";
+    clearOutput();
+    addMessage("Welcome. Please enter your Username.\n(This will create a new account if one does not exist)");
     currentClientState = "login_user";
     input.type = 'text';
     input.disabled = false;
@@ -664,9 +990,10 @@ input.addEventListener('keydown', async function(event) {
     }
 });
 
+// One delegated listener for every keyword span, including ones rendered later
 output.addEventListener('click', function(event) {
-    const target = event.target;
-    if (target.classList.contains('keyword')) {
+    const target = event.target.closest('.keyword');
+    if (target) {
         event.preventDefault();
         event.stopPropagation();
         const command = target.dataset.command;